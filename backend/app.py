@@ -12,11 +12,21 @@ from models import (
     Invitation,
 )
 from auth import require_auth
+from conditional import conditional_get
+from idempotency import purge_expired_keys
+from services.clerk_client import clerk_client
 from routes.availability import availability_bp
 from routes.sessions import session_bp
 from routes.matching import matching_bp
 from routes.invitations import invitations_bp
-import requests
+from routes.webhooks import webhooks_bp
+from services.clerk_sync import reconcile_roles
+from services.tasks import task_runner
+from services.tutor_stats import rebuild_tutor_stats
+from services.dashboard_rollups import rebuild_dashboard_rollups
+from services import change_tracking, outbox
+from services.scoring_profiles import init_scoring_profiles
+import click
 import os
 from datetime import datetime
 from zoneinfo import ZoneInfo
@@ -27,6 +37,7 @@ app.config.from_object(Config)
 CORS(app)
 
 db.init_app(app)
+init_scoring_profiles(app)
 
 
 # Initialize database tables on startup
@@ -44,6 +55,58 @@ app.register_blueprint(availability_bp)
 app.register_blueprint(session_bp)
 app.register_blueprint(matching_bp)
 app.register_blueprint(invitations_bp)
+app.register_blueprint(webhooks_bp)
+
+
+@app.cli.command("sync-clerk-roles")
+def sync_clerk_roles_command():
+    """Reconcile user roles with Clerk public metadata (run periodically)."""
+    changed = reconcile_roles()
+    print(f"Updated {changed} user role(s)")
+
+
+@app.cli.command("rebuild-tutor-stats")
+@click.option("--dry-run", is_flag=True, help="Report drift without rewriting the table.")
+def rebuild_tutor_stats_command(dry_run):
+    """Recompute tutor_stats from sessions, feedback and availability."""
+    drift = rebuild_tutor_stats(apply=not dry_run)
+    for entry in drift:
+        print(f"tutor {entry['tutor_id']} {entry['field']}: stored={entry['stored']} actual={entry['actual']}")
+    action = "Found" if dry_run else "Fixed"
+    print(f"{action} {len(drift)} drifted value(s)")
+
+
+@app.cli.command("rebuild-dashboard-rollups")
+def rebuild_dashboard_rollups_command():
+    """Recompute the dashboard rollup tables from sessions, notes and feedback."""
+    daily, students = rebuild_dashboard_rollups()
+    print(f"Wrote {daily} daily and {students} student rollup row(s)")
+
+
+@app.cli.command("email-worker")
+@click.option("--concurrency", type=int, default=outbox.EMAIL_WORKERS, show_default=True,
+              help="Emails sent at once.")
+@click.option("--poll-interval", type=float, default=2.0, show_default=True,
+              help="Seconds between polls while the outbox is empty.")
+def email_worker_command(concurrency, poll_interval):
+    """Send queued emails from the outbox until interrupted."""
+    print(f"Draining the email outbox with {concurrency} worker(s)")
+    outbox.run_worker(concurrency=concurrency, poll_interval=poll_interval)
+
+
+@app.cli.command("requeue-dead-emails")
+def requeue_dead_emails_command():
+    """Retry emails that exhausted EMAIL_MAX_ATTEMPTS."""
+    print(f"Requeued {outbox.requeue_dead()} dead-lettered email(s)")
+
+
+@app.cli.command("purge-idempotency-keys")
+def purge_idempotency_keys_command():
+    """Delete stored Idempotency-Key responses past IDEMPOTENCY_TTL (run periodically)."""
+    print(f"Removed {purge_expired_keys()} expired idempotency key(s)")
+
+
+CLERK_METADATA_RETRIES = 3
 
 
 def update_clerk_metadata(clerk_user_id, metadata):
@@ -52,19 +115,19 @@ def update_clerk_metadata(clerk_user_id, metadata):
         return False
 
     try:
-        url = f"https://api.clerk.dev/v1/users/{clerk_user_id}/metadata"
-        headers = {
-            "Authorization": f"Bearer {secret_key}",
-            "Content-Type": "application/json",
-        }
-        response = requests.patch(
-            url, json={"public_metadata": metadata}, headers=headers
+        return clerk_client.update_user_metadata(
+            clerk_user_id, metadata, secret_key=secret_key
         )
-        return response.status_code == 200
     except Exception:
         return False
 
 
+def push_clerk_metadata(clerk_user_id, metadata):
+    """Background form of `update_clerk_metadata`: raises so the task runner retries."""
+    if not update_clerk_metadata(clerk_user_id, metadata):
+        raise RuntimeError(f"Clerk metadata update for {clerk_user_id} was not applied")
+
+
 NY_TZ = ZoneInfo("America/New_York")
 UTC = ZoneInfo("UTC")
 
@@ -142,46 +205,30 @@ def health():
     return {"status": "ok"}
 
 
-def get_clerk_user_metadata(clerk_user_id):
-    """Fetch user metadata from Clerk API"""
-    secret_key = app.config.get("CLERK_SECRET_KEY")
-    if not secret_key:
-        return None
+@app.route("/api/tasks/failures")
+@require_auth
+def get_task_failures():
+    """Background tasks that exhausted their retries in this worker."""
+    if request.db_user.role != "professor":
+        return jsonify({"error": "Forbidden"}), 403
+    return jsonify({"success": True, "failures": task_runner.recent_failures()})
 
-    try:
-        url = f"https://api.clerk.dev/v1/users/{clerk_user_id}"
-        headers = {
-            "Authorization": f"Bearer {secret_key}",
-            "Content-Type": "application/json",
-        }
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            return response.json()
-        return None
-    except Exception:
-        return None
+
+@app.route("/api/email-outbox/stats")
+@require_auth
+def get_email_outbox_stats():
+    """Queued, sent and dead-lettered emails, plus this worker's send counters."""
+    if request.db_user.role != "professor":
+        return jsonify({"error": "Forbidden"}), 403
+    return jsonify({"success": True, **outbox.stats()})
 
 
 @app.route("/api/user")
 @require_auth
 def get_user():
+    # Roles are synced from Clerk by the webhook and `flask sync-clerk-roles`,
+    # so this endpoint only reads our database.
     db_user = request.db_user
-    clerk_user_id = request.clerk_user.get("sub")
-
-    # Sync role from Clerk metadata
-    clerk_user = get_clerk_user_metadata(clerk_user_id)
-    if clerk_user and "public_metadata" in clerk_user:
-        clerk_role = clerk_user["public_metadata"].get("role")
-        if clerk_role and clerk_role != db_user.role:
-            db_user.role = clerk_role
-            # If role changed to tutor, ensure Tutor record exists
-            if clerk_role == "tutor":
-                tutor = Tutor.query.filter_by(user_id=db_user.id).first()
-                if not tutor:
-                    tutor = Tutor(user_id=db_user.id)
-                    db.session.add(tutor)
-            db.session.commit()
-
     return jsonify(
         {"user": db_user.to_dict(), "onboarding_complete": db_user.onboarding_complete}
     )
@@ -228,10 +275,15 @@ def complete_onboarding():
         if not tutor:
             tutor = Tutor(user_id=db_user.id)
             db.session.add(tutor)
+    change_tracking.bump_after_commit(change_tracking.TUTORS)
     
     db.session.commit()
 
-    update_clerk_metadata(clerk_user_id, {"role": role})
+    # Pushed after the response; the role is already authoritative in our DB.
+    task_runner.submit(
+        push_clerk_metadata, clerk_user_id, {"role": role},
+        retries=CLERK_METADATA_RETRIES, backoff=2.0,
+    )
 
     return jsonify({"success": True, "user": db_user.to_dict()})
 
@@ -270,6 +322,7 @@ def get_tutor_by_user(user_id):
         if user.role == "tutor":
             tutor = Tutor(user_id=user_id)
             db.session.add(tutor)
+            change_tracking.bump_after_commit(change_tracking.TUTORS)
             db.session.commit()
         else:
             return jsonify({"error": "User is not a tutor"}), 400
@@ -279,6 +332,7 @@ def get_tutor_by_user(user_id):
 
 @app.route("/api/tutors")
 @require_auth
+@conditional_get("tutors", "users")
 def get_tutors():
     """Get all tutors with their user information"""
     tutors = Tutor.query.all()
@@ -1,10 +1,16 @@
 from functools import wraps
 from flask import request, jsonify
+import json
 import os
+import threading
+import time
+import jwt
 import requests
 from clerk_backend_api import Clerk
 from clerk_backend_api.security.types import AuthenticateRequestOptions
 from models import User
+from services.cache import TTLCache
+from services.clerk_client import clerk_client, ClerkUnavailable
 
 
 def _extract_email(payload):
@@ -47,39 +53,152 @@ def _extract_display_name(payload, fallback_email=""):
     return fallback_email or ""
 
 
+# Clerk profiles keyed by Clerk user id, shared by every caller of fetch_clerk_user.
+clerk_user_cache = TTLCache(
+    maxsize=int(os.environ.get("CLERK_USER_CACHE_SIZE", "2048")),
+    ttl=int(os.environ.get("CLERK_USER_CACHE_TTL", "300")),
+    negative_ttl=int(os.environ.get("CLERK_USER_CACHE_NEGATIVE_TTL", "30")),
+)
+
+
 def fetch_clerk_user(user_id):
     secret = os.environ.get("CLERK_SECRET_KEY")
     if not secret or not user_id:
         return None
-    resp = requests.get(
-        f"https://api.clerk.dev/v1/users/{user_id}",
-        headers={"Authorization": f"Bearer {secret}", "Content-Type": "application/json"},
+    try:
+        return clerk_user_cache.get_or_load(user_id, clerk_client.get_user)
+    except ClerkUnavailable:
+        # Serve the last profile we saw; with none, callers use the token claims.
+        return clerk_user_cache.get(user_id, allow_stale=True)
+
+
+class JWKSCache:
+    """Signing keys from a JWKS URL or local file, refetched after `ttl` seconds
+    or when an unknown `kid` shows up (at most once per `min_refresh_interval`)."""
+
+    def __init__(self, url, ttl=3600, min_refresh_interval=30):
+        self.url = url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys = {}
+        self._fetched_at = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self.url.startswith(("http://", "https://")):
+            headers = {}
+            secret = os.environ.get("CLERK_SECRET_KEY")
+            if secret:
+                headers["Authorization"] = f"Bearer {secret}"
+            resp = requests.get(self.url, headers=headers, timeout=5)
+            resp.raise_for_status()
+            data = resp.json()
+        else:
+            path = self.url[len("file://"):] if self.url.startswith("file://") else self.url
+            with open(path) as fh:
+                data = json.load(fh)
+        return {key.key_id: key for key in jwt.PyJWKSet.from_dict(data).keys}
+
+    def get_signing_key(self, kid):
+        with self._lock:
+            now = time.monotonic()
+            age = None if self._fetched_at is None else now - self._fetched_at
+            if age is None or age >= self.ttl or (
+                kid not in self._keys and age >= self.min_refresh_interval
+            ):
+                self._keys = self._load()
+                self._fetched_at = now
+            key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        return key
+
+
+_jwks_cache = None
+_jwks_cache_lock = threading.Lock()
+
+
+def get_jwks_cache():
+    global _jwks_cache
+    url = os.environ.get("CLERK_JWKS_URL")
+    if not url:
+        return None
+    with _jwks_cache_lock:
+        if _jwks_cache is None or _jwks_cache.url != url:
+            _jwks_cache = JWKSCache(
+                url,
+                ttl=int(os.environ.get("CLERK_JWKS_TTL", "3600")),
+                min_refresh_interval=int(os.environ.get("CLERK_JWKS_MIN_REFRESH", "30")),
+            )
+        return _jwks_cache
+
+
+def _authorized_parties():
+    value = os.environ.get("AUTHORIZED_PARTY") or ""
+    return [party.strip() for party in value.split(",") if party.strip()]
+
+
+def _session_token():
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Bearer "):
+        return header[len("Bearer "):].strip()
+    return request.cookies.get("__session")
+
+
+def verify_session_token(token, jwks_cache):
+    kid = jwt.get_unverified_header(token).get("kid")
+    signing_key = jwks_cache.get_signing_key(kid)
+    payload = jwt.decode(
+        token,
+        signing_key.key,
+        algorithms=["RS256"],
+        leeway=int(os.environ.get("CLERK_JWT_LEEWAY", "5")),
+        options={"require": ["exp", "iat", "sub"]},
     )
-    if resp.status_code == 200:
-        return resp.json()
-    return None
+    parties = _authorized_parties()
+    azp = payload.get("azp")
+    if parties and azp and azp not in parties:
+        raise jwt.InvalidTokenError(f"Unauthorized party: {azp}")
+    return payload
+
+
+def _authenticate_request():
+    """Return the session claims for the current request, or None when signed out.
+
+    With CLERK_JWKS_URL set the session JWT is verified locally against the
+    cached key set; otherwise the Clerk SDK authenticates the request."""
+    jwks_cache = get_jwks_cache()
+    if jwks_cache is not None:
+        token = _session_token()
+        if not token:
+            return None
+        return verify_session_token(token, jwks_cache)
+
+    sdk = Clerk(bearer_auth=os.environ.get("CLERK_SECRET_KEY"))
+    try:
+        request_state = sdk.authenticate_request(request)
+    except Exception:
+        authorized_party = os.environ.get("AUTHORIZED_PARTY")
+        options = AuthenticateRequestOptions(authorized_parties=[authorized_party])
+        request_state = sdk.authenticate_request(request, options)
+
+    if not request_state.is_signed_in:
+        return None
+    return request_state.payload
 
 
 def require_auth(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        sdk = Clerk(bearer_auth=os.environ.get("CLERK_SECRET_KEY"))
-
         try:
-            try:
-                request_state = sdk.authenticate_request(request)
-            except Exception:
-                authorized_party = os.environ.get("AUTHORIZED_PARTY")
-                options = AuthenticateRequestOptions(authorized_parties=[authorized_party])
-                request_state = sdk.authenticate_request(request, options)
-
-            if not request_state.is_signed_in:
+            payload = _authenticate_request()
+            if payload is None:
                 return jsonify({"error": "Unauthorized"}), 401
 
-            clerk_user_id = request_state.payload.get("sub")
+            clerk_user_id = payload.get("sub")
             clerk_user_data = fetch_clerk_user(clerk_user_id)
 
-            merged_payload = dict(request_state.payload)
+            merged_payload = dict(payload)
             if clerk_user_data:
                 for key in ["first_name", "last_name", "primary_email_address_id", "email_addresses"]:
                     merged_payload.setdefault(key, clerk_user_data.get(key))
@@ -91,7 +210,7 @@ def require_auth(f):
 
             db_user = User.get_or_create_from_clerk(clerk_user_id, name, email)
             request.db_user = db_user
-            request.clerk_user = request_state.payload
+            request.clerk_user = payload
 
             return f(*args, **kwargs)
         except Exception:
@@ -0,0 +1,19 @@
+import os
+from flask import Flask
+from config import Config
+from models import db
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def create_benchmark_app(database_path, **config):
+    """Bare app bound to a SQLite file; no blueprints, seeding or Clerk."""
+    app = Flask("benchmarks")
+    app.config.from_object(Config)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.abspath(database_path)}",
+        TASKS_EAGER=True,
+        **config,
+    )
+    db.init_app(app)
+    return app
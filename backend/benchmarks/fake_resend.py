@@ -0,0 +1,136 @@
+"""Local stand-in for the Resend API, to send outbox emails without the network.
+
+    cd backend
+    python -m benchmarks.fake_resend --port 8025      # then run the app or worker with
+    RESEND_API_URL=http://127.0.0.1:8025 flask --app app email-worker
+
+The resend SDK reads RESEND_API_URL at import. Both POST /emails and the
+batch endpoint POST /emails/batch are served. Every accepted email is logged
+and kept in `FakeResend.emails`; `fail_next` makes the next requests fail with
+a Resend-style error body, to exercise retries and dead-lettering, and
+`latency` delays each response like a real round trip."""
+
+import argparse
+import itertools
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import resend
+
+
+class FakeResend:
+    """Threaded HTTP server answering POST /emails like the Resend API."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, log=None):
+        self.emails = []
+        self.requests = 0
+        self.latency = latency
+        self._failures = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._log = log
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+        self._previous_url = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, count=1, status=500, message="Simulated failure"):
+        with self._lock:
+            self._failures.extend([(status, message)] * count)
+
+    def _accept(self, messages):
+        """Store `messages` and return (status, ids), or a queued failure for the whole request."""
+        with self._lock:
+            self.requests += 1
+            if self._failures:
+                return self._failures.pop(0)
+            ids = [f"fake_{next(self._ids)}" for _ in messages]
+            self.emails.extend(dict(params, id=email_id) for params, email_id in zip(messages, ids))
+        if self._log:
+            for params, email_id in zip(messages, ids):
+                self._log(f"{email_id}: {params.get('subject')!r} to {', '.join(params.get('to') or [])}")
+        return 200, ids
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path not in ("/emails", "/emails/batch"):
+                    return self._reply(404, {"statusCode": 404, "name": "not_found", "message": "Not found"})
+                length = int(self.headers.get("Content-Length", 0))
+                params = json.loads(self.rfile.read(length) or b"{}")
+                batch = self.path == "/emails/batch"
+                if fake.latency:
+                    time.sleep(fake.latency)
+                status, result = fake._accept(params if batch else [params])
+                if status != 200:
+                    body = {"statusCode": status, "name": "application_error", "message": result}
+                elif batch:
+                    body = {"data": [{"id": email_id} for email_id in result]}
+                else:
+                    body = {"id": result[0]}
+                self._reply(status, body)
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Serve in a background thread and point the resend SDK at this server."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, name="fake-resend", daemon=True
+        )
+        self._thread.start()
+        self._previous_url, resend.api_url = resend.api_url, self.url
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._previous_url is not None:
+            resend.api_url = self._previous_url
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to delay each response")
+    args = parser.parse_args(argv)
+
+    fake = FakeResend(args.host, args.port, latency=args.latency, log=print)
+    print(f"Fake Resend listening on {fake.url}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Deterministic synthetic rosters for benchmarks.
+
+The same (sizes, seed) always produce the same rows, so numbers from
+different commits are comparable. Rows are written with bulk Core inserts and
+explicit primary keys, which keeps a million-session build to seconds."""
+
+import itertools
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from models import db, User, Tutor, Availability, Session, Feedback
+from services.tutor_stats import rebuild_tutor_stats
+
+CLASSES = ("Chinese 101", "Chinese 201", "Chinese 301", "Chinese 401")
+STATUSES = ("booked",) * 8 + ("available", "cancelled")
+SESSION_EPOCH = datetime(2025, 1, 6)
+SESSION_DAYS = 365
+FEEDBACK_RATE = 0.3
+BATCH_SIZE = 20000
+
+
+def _bulk_insert(model, rows):
+    for i in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(insert(model), rows[i:i + BATCH_SIZE])
+
+
+def generate_population(tutors=500, students=5000, sessions=1_000_000, seed=42):
+    """Fill an empty database and return the generated student ids."""
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1)
+
+    tutor_ids = list(range(1, tutors + 1))
+    student_ids = list(range(tutors + 1, tutors + students + 1))
+    _bulk_insert(User, [
+        {"id": i, "clerk_user_id": f"bench_tutor_{i}", "name": f"Tutor {i}",
+         "email": f"tutor{i}@bench.test", "role": "tutor", "onboarding_complete": True, "created_at": now}
+        for i in tutor_ids
+    ] + [
+        {"id": i, "clerk_user_id": f"bench_student_{i}", "name": f"Student {i}",
+         "email": f"student{i}@bench.test", "role": "student", "class_name": rng.choice(CLASSES),
+         "onboarding_complete": True, "created_at": now}
+        for i in student_ids
+    ])
+
+    # Tutor profile ids mirror user ids to keep the generator simple.
+    _bulk_insert(Tutor, [{"id": i, "user_id": i, "created_at": now} for i in tutor_ids])
+
+    availability = []
+    for tutor_id in tutor_ids:
+        for _ in range(rng.randint(0, 10)):
+            day = rng.randint(0, SESSION_DAYS - 1)
+            start = SESSION_EPOCH + timedelta(days=day, hours=rng.randint(8, 16))
+            recurring = rng.random() < 0.8
+            availability.append({
+                "tutor_id": tutor_id,
+                "day_of_week": (start.weekday() + 1) % 7,
+                "start_time": start,
+                "end_time": start + timedelta(hours=rng.randint(1, 4)),
+                "session_type": rng.choice(("online", "in-person")),
+                "is_recurring": recurring,
+                "created_at": now,
+            })
+    _bulk_insert(Availability, availability)
+
+    # A few tutors carry most of the bookings, like a real roster.
+    cumulative_popularity = list(itertools.accumulate(rng.paretovariate(1.5) for _ in tutor_ids))
+    session_rows, feedback_rows = [], []
+    for session_id in range(1, sessions + 1):
+        status = rng.choice(STATUSES)
+        student_id = None if status == "available" else rng.choice(student_ids)
+        start = SESSION_EPOCH + timedelta(days=rng.randrange(SESSION_DAYS), minutes=20 * rng.randrange(8 * 3, 20 * 3))
+        session_rows.append({
+            "id": session_id,
+            "tutor_id": rng.choices(tutor_ids, cum_weights=cumulative_popularity)[0],
+            "student_id": student_id,
+            "course": rng.choice(CLASSES),
+            "session_type": "online",
+            "start_time": start,
+            "end_time": start + timedelta(minutes=20 * rng.randint(1, 3)),
+            "status": status,
+            "created_at": now,
+            "updated_at": now,
+        })
+        if student_id and rng.random() < FEEDBACK_RATE:
+            feedback_rows.append({
+                "session_id": session_id, "student_id": student_id,
+                "rating": float(rng.randint(1, 5)), "created_at": now, "updated_at": now,
+            })
+        if len(session_rows) >= BATCH_SIZE:
+            _bulk_insert(Session, session_rows)
+            session_rows = []
+    _bulk_insert(Session, session_rows)
+    _bulk_insert(Feedback, feedback_rows)
+    db.session.commit()
+
+    rebuild_tutor_stats()
+    return student_ids
@@ -0,0 +1,142 @@
+"""Stress the booking engine with concurrent bookers.
+
+    cd backend
+    python -m benchmarks.run_booking                      # 50 bookers, 10 tutors, 40 attempts each
+    python -m benchmarks.run_booking --bookers 100 --tutors 3
+
+Each booker thread repeatedly books random 30-minute slots (starting on a
+15-minute grid, so most attempts overlap someone else's) through
+services.booking.book_slot against a fresh SQLite file. The run reports
+throughput, conflicts and double-booked session pairs; the exit status is 1
+when any tutor ended up double-booked or a booker hit an unexpected error."""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func
+from sqlalchemy.orm import aliased
+from benchmarks import BENCHMARK_DIR, create_benchmark_app
+from models import db, User, Session
+from services.booking import BookingConflict, book_slot
+
+DAY = datetime(2025, 3, 3, 9, 0)
+SLOT_STARTS = 32
+SLOT_MINUTES = 30
+
+
+def double_bookings():
+    """Pairs of sessions of the same tutor whose times overlap."""
+    a, b = aliased(Session), aliased(Session)
+    return (
+        db.session.query(func.count())
+        .select_from(a)
+        .join(b, and_(a.tutor_id == b.tutor_id, a.id < b.id))
+        .filter(a.start_time < b.end_time, a.end_time > b.start_time)
+        .scalar()
+    )
+
+
+def run(bookers=50, tutors=10, attempts=40, seed=42, data_dir=None, log=print):
+    data_dir = data_dir or os.path.join(BENCHMARK_DIR, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, "booking-stress.db")
+    if os.path.exists(path):
+        os.remove(path)
+    app = create_benchmark_app(path)
+
+    with app.app_context():
+        db.create_all()
+        tutor_users = [User(clerk_user_id=f"bench_tutor_{i}", name=f"Tutor {i}",
+                            email=f"tutor{i}@bench.test", role="tutor") for i in range(tutors)]
+        student_users = [User(clerk_user_id=f"bench_student_{i}", name=f"Student {i}",
+                              email=f"student{i}@bench.test", role="student") for i in range(bookers)]
+        db.session.add_all(tutor_users + student_users)
+        db.session.commit()
+        tutor_ids = [u.id for u in tutor_users]
+        student_ids = [u.id for u in student_users]
+
+    outcomes = {"booked": 0, "conflicts": 0}
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(bookers + 1)
+
+    def booker(student_id):
+        rng = random.Random(seed * 1000 + student_id)
+        booked = conflicts = 0
+        with app.app_context():
+            barrier.wait()
+            for _ in range(attempts):
+                start = DAY + timedelta(minutes=15 * rng.randrange(SLOT_STARTS))
+                try:
+                    book_slot(student_id, rng.choice(tutor_ids), start, start + timedelta(minutes=SLOT_MINUTES),
+                              course="Chinese 101", session_type="online")
+                    booked += 1
+                except BookingConflict:
+                    conflicts += 1
+                except Exception as e:
+                    with lock:
+                        errors.append(repr(e))
+            db.session.remove()
+        with lock:
+            outcomes["booked"] += booked
+            outcomes["conflicts"] += conflicts
+
+    threads = [threading.Thread(target=booker, args=(sid,)) for sid in student_ids]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        doubles = double_bookings()
+        stored = db.session.query(func.count(Session.id)).scalar()
+        db.session.remove()
+
+    total = bookers * attempts
+    log(f"{bookers} bookers x {attempts} attempts on {tutors} tutors: "
+        f"{outcomes['booked']} booked, {outcomes['conflicts']} conflicts, {len(errors)} errors, "
+        f"{doubles} double-bookings in {elapsed:.2f}s ({total / elapsed:.0f} attempts/s)")
+    return {
+        "benchmark": "booking",
+        "created_at": datetime.utcnow().isoformat(),
+        "params": {"bookers": bookers, "tutors": tutors, "attempts": attempts, "seed": seed},
+        "booked": outcomes["booked"],
+        "conflicts": outcomes["conflicts"],
+        "stored_sessions": stored,
+        "double_bookings": doubles,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "attempts_per_s": total / elapsed,
+        "bookings_per_s": outcomes["booked"] / elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookers", type=int, default=50, help="concurrent booking threads")
+    parser.add_argument("--tutors", type=int, default=10)
+    parser.add_argument("--attempts", type=int, default=40, help="bookings tried per booker")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", help="where the SQLite file is created")
+    parser.add_argument("--output", help="optional JSON result file")
+    args = parser.parse_args(argv)
+
+    report = run(args.bookers, args.tutors, args.attempts, seed=args.seed, data_dir=args.data_dir)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    return 1 if report["double_bookings"] or report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
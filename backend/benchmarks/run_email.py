@@ -0,0 +1,102 @@
+"""Measure outbox email throughput, one request per email against batch sends.
+
+    cd backend
+    python -m benchmarks.run_email                        # 500 emails, 20ms simulated round trip
+    python -m benchmarks.run_email --emails 2000 --latency 0.05
+
+For each batch size (1 sends every email through `resend.Emails.send`), the
+emails are queued in a fresh SQLite outbox and drained by
+services.outbox.drain against benchmarks.fake_resend, a local stand-in for the
+Resend API whose responses are delayed by --latency. The run reports emails
+per second and HTTP requests made; the exit status is 1 when an email was not
+delivered exactly once."""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from benchmarks import BENCHMARK_DIR, create_benchmark_app
+from benchmarks.fake_resend import FakeResend
+from models import db, EmailOutbox
+from services import outbox
+from services.email_service import BATCH_LIMIT
+
+
+def _message(n):
+    return {
+        "from": "bench@example.com",
+        "to": [f"student{n}@bench.test"],
+        "subject": f"How was your session? #{n}",
+        "html": f"<p>Please rate session {n}.</p>",
+    }
+
+
+def run_mode(batch_size, emails, latency, data_dir, log=print):
+    path = os.path.join(data_dir, f"email-outbox-{batch_size}.db")
+    if os.path.exists(path):
+        os.remove(path)
+    app = create_benchmark_app(path, RESEND_API_KEY="re_bench", EMAIL_BATCH_SIZE=batch_size)
+
+    with app.app_context(), FakeResend(latency=latency) as fake:
+        db.create_all()
+        for n in range(emails):
+            outbox.enqueue("benchmark", _message(n))
+        db.session.commit()
+
+        started = time.perf_counter()
+        result = outbox.drain()
+        elapsed = time.perf_counter() - started
+
+        delivered = {email["subject"] for email in fake.emails}
+        pending = EmailOutbox.query.filter(EmailOutbox.status != "sent").count()
+        db.session.remove()
+
+    ok = len(fake.emails) == len(delivered) == emails and not pending
+    log(f"batch size {batch_size:>3}: {result['sent']} sent in {elapsed:.2f}s "
+        f"({emails / elapsed:.0f} emails/s, {fake.requests} request(s)){'' if ok else ' MISMATCH'}")
+    return {
+        "batch_size": batch_size,
+        "sent": result["sent"],
+        "failed": result["failed"],
+        "requests": fake.requests,
+        "elapsed_s": elapsed,
+        "emails_per_s": emails / elapsed,
+        "delivered_once": ok,
+    }
+
+
+def run(emails=500, latency=0.02, batch_sizes=(1, BATCH_LIMIT), data_dir=None, log=print):
+    data_dir = data_dir or os.path.join(BENCHMARK_DIR, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    modes = [run_mode(size, emails, latency, data_dir, log=log) for size in batch_sizes]
+    return {
+        "benchmark": "email",
+        "created_at": datetime.utcnow().isoformat(),
+        "params": {"emails": emails, "latency": latency, "batch_sizes": list(batch_sizes)},
+        "modes": modes,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated Resend round trip in seconds")
+    parser.add_argument("--batch-size", type=int, action="append", dest="batch_sizes",
+                        help=f"repeatable; default 1 and {BATCH_LIMIT}")
+    parser.add_argument("--data-dir", help="where the SQLite files are created")
+    parser.add_argument("--output", help="optional JSON result file")
+    args = parser.parse_args(argv)
+
+    report = run(args.emails, args.latency, tuple(args.batch_sizes or (1, BATCH_LIMIT)), data_dir=args.data_dir)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    return 0 if all(mode["delivered_once"] for mode in report["modes"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""Benchmark the matching service against a synthetic roster.
+
+    cd backend
+    python -m benchmarks.run_matching                      # 500 tutors, 5,000 students, 1M sessions
+    python -m benchmarks.run_matching --sessions 100000 --calls 5
+    python -m benchmarks.run_matching --compare benchmarks/results/<earlier run>.json
+
+The SQLite file for a given (sizes, seed) is built once and reused. Each
+scenario records wall time and query count for every call, plus peak Python
+memory (tracemalloc) for the first few calls, and the run is written as JSON.
+With --compare the exit status is 1 when any scenario's median wall time
+regressed by more than --threshold."""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from benchmarks import BENCHMARK_DIR, create_benchmark_app
+from benchmarks.generate import generate_population
+from models import db, User
+from services import scoring_kernel
+from services.matching_service import (
+    calculate_tutor_match_scores,
+    get_recommended_tutors,
+    iter_batch_match_scores,
+)
+
+WINDOW_START = datetime(2025, 3, 3)
+
+
+def scenarios(class_students):
+    """name -> (callable taking a student id, config overrides)."""
+    window = (WINDOW_START, WINDOW_START + timedelta(days=7))
+    return {
+        "recommend": (calculate_tutor_match_scores, {}),
+        "recommend_tutor_stats": (calculate_tutor_match_scores, {"MATCHING_USE_TUTOR_STATS": True}),
+        "recommend_top10": (lambda sid: get_recommended_tutors(sid, limit=10), {}),
+        "recommend_window": (lambda sid: calculate_tutor_match_scores(sid, window=window), {}),
+        "batch_class_top5": (lambda sid: list(iter_batch_match_scores(class_students, limit=5)), {}),
+    }
+
+
+def summarize(values):
+    ordered = sorted(values)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "max": ordered[-1],
+        "mean": statistics.fmean(ordered),
+    }
+
+
+def measure(app, fn, student_ids, memory_calls):
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    wall_ms, queries, peaks = [], [], []
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        for i, student_id in enumerate(student_ids):
+            db.session.remove()
+            statements.clear()
+            started = time.perf_counter()
+            fn(student_id)
+            wall_ms.append((time.perf_counter() - started) * 1000)
+            queries.append(len(statements))
+
+            if i < memory_calls:
+                # Separate pass: tracemalloc slows the call down too much to time it.
+                db.session.remove()
+                tracemalloc.start()
+                fn(student_id)
+                peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+                tracemalloc.stop()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+        db.session.remove()
+
+    result = {"calls": len(wall_ms), "wall_ms": summarize(wall_ms), "queries": summarize(queries)}
+    if peaks:
+        result["peak_memory_kib"] = summarize(peaks)
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=BENCHMARK_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(tutors, students, sessions, seed=42, calls=20, memory_calls=3, data_dir=None, only=None, log=print):
+    data_dir = data_dir or os.path.join(BENCHMARK_DIR, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"matching-{tutors}-{students}-{sessions}-{seed}.db")
+    app = create_benchmark_app(path)
+
+    with app.app_context():
+        if not os.path.exists(path) or not db.session.query(User.id).first():
+            log(f"Generating {tutors} tutors, {students} students, {sessions} sessions into {path}")
+            started = time.perf_counter()
+            db.create_all()
+            generate_population(tutors, students, sessions, seed)
+            log(f"Generated in {time.perf_counter() - started:.1f}s")
+
+        rng = random.Random(seed)
+        student_ids = [i for (i,) in db.session.query(User.id).filter(User.role == "student").order_by(User.id)]
+        sample = rng.sample(student_ids, min(calls, len(student_ids)))
+        class_name = db.session.get(User, sample[0]).class_name
+        class_students = [
+            i for (i,) in db.session.query(User.id).filter(User.role == "student", User.class_name == class_name)
+        ]
+
+        results = {}
+        for name, (fn, overrides) in scenarios(class_students).items():
+            if only and name not in only:
+                continue
+            previous = {key: app.config.get(key) for key in overrides}
+            app.config.update(overrides)
+            try:
+                results[name] = measure(app, fn, sample, memory_calls)
+            finally:
+                app.config.update(previous)
+            log(f"{name:<24} median {results[name]['wall_ms']['median']:9.2f} ms  "
+                f"queries {results[name]['queries']['max']:>3}")
+
+    return {
+        "benchmark": "matching",
+        "created_at": datetime.utcnow().isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": scoring_kernel.HAS_NUMPY,
+        "params": {"tutors": tutors, "students": students, "sessions": sessions, "seed": seed, "calls": calls},
+        "scenarios": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Scenario names whose median wall time grew by more than `threshold` (a ratio)."""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        ratio = result["wall_ms"]["median"] / max(before["wall_ms"]["median"], 1e-9)
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tutors", type=int, default=500)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--calls", type=int, default=20, help="recommendation calls per scenario")
+    parser.add_argument("--memory-calls", type=int, default=3, help="calls per scenario measured with tracemalloc")
+    parser.add_argument("--scenario", action="append", help="only run these scenarios")
+    parser.add_argument("--data-dir", help="where generated SQLite files are kept")
+    parser.add_argument("--output", help="result file (default benchmarks/results/matching-<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier result file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown, as a ratio")
+    args = parser.parse_args(argv)
+
+    report = run(args.tutors, args.students, args.sessions, seed=args.seed, calls=args.calls,
+                 memory_calls=args.memory_calls, data_dir=args.data_dir, only=args.scenario)
+
+    output = args.output or os.path.join(
+        BENCHMARK_DIR, "results", f"matching-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x slower than {args.compare}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
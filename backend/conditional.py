@@ -0,0 +1,49 @@
+import hashlib
+from datetime import datetime
+from functools import wraps
+from flask import current_app, request
+from services import change_tracking
+
+
+def request_etag(tables, daily=False):
+    """ETag for the current request built from table change counters alone.
+
+    Covers the endpoint, caller, query string and Accept header, so the body
+    never has to be rendered to compare it. `daily` also rolls the tag over at
+    UTC midnight, for responses bucketed relative to today."""
+    user = getattr(request, "db_user", None)
+    parts = [
+        request.endpoint,
+        user.id if user else None,
+        sorted(request.args.items(multi=True)),
+        request.headers.get("Accept", ""),
+        change_tracking.versions(*(change_tracking.table_key(t) for t in tables)),
+    ]
+    if daily:
+        parts.append(datetime.utcnow().date().isoformat())
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+
+
+def conditional_get(*tables, daily=False):
+    """Answer 304 Not Modified, before running the view, while none of `tables` changed.
+
+    Goes below `require_auth` so the tag is per user. Only 200 responses are tagged."""
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            etag = request_etag(tables, daily=daily)
+            if etag in request.if_none_match:
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            # Let browsers keep the body but always revalidate it.
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
+        return decorated
+
+    return decorator
@@ -12,7 +12,23 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     CLERK_SECRET_KEY = os.environ.get('CLERK_SECRET_KEY')
     CLERK_PUBLISHABLE_KEY = os.environ.get('CLERK_PUBLISHABLE_KEY')
+    CLERK_WEBHOOK_SECRET = os.environ.get('CLERK_WEBHOOK_SECRET')
     RESEND_API_KEY = os.environ.get('RESEND_API_KEY')
     RESEND_FROM_EMAIL = os.environ.get('RESEND_FROM_EMAIL', 'onboarding@resend.dev')
     FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:5173')
-
+    TASKS_EAGER = os.environ.get('TASKS_EAGER', '').lower() in ('1', 'true', 'yes')
+    # Read tutor ratings/availability from tutor_stats; enable after `flask rebuild-tutor-stats`.
+    MATCHING_USE_TUTOR_STATS = os.environ.get('MATCHING_USE_TUTOR_STATS', '').lower() in ('1', 'true', 'yes')
+    # Serve dashboards from the daily rollup tables; enable after `flask rebuild-dashboard-rollups`.
+    DASHBOARD_USE_ROLLUPS = os.environ.get('DASHBOARD_USE_ROLLUPS', '').lower() in ('1', 'true', 'yes')
+    # Seconds a stored Idempotency-Key response is replayed, and how long a duplicate waits for the first request.
+    IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', 86400))
+    IDEMPOTENCY_WAIT = float(os.environ.get('IDEMPOTENCY_WAIT', 10))
+    # Outbox emails are retried with exponential backoff from EMAIL_RETRY_BACKOFF seconds, then dead-lettered.
+    EMAIL_MAX_ATTEMPTS = int(os.environ.get('EMAIL_MAX_ATTEMPTS', 8))
+    EMAIL_RETRY_BACKOFF = float(os.environ.get('EMAIL_RETRY_BACKOFF', 30))
+    # Emails per Resend batch request (at most 100); 1 sends each email on its own.
+    EMAIL_BATCH_SIZE = int(os.environ.get('EMAIL_BATCH_SIZE', 100))
+    # JSON object or path to a JSON file; see services/scoring_profiles.py.
+    MATCHING_PROFILES = os.environ.get('MATCHING_PROFILES')
+    MATCHING_DEFAULT_PROFILE = os.environ.get('MATCHING_DEFAULT_PROFILE', 'default')
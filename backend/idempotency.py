@@ -0,0 +1,149 @@
+import hashlib
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import current_app, jsonify, request
+from sqlalchemy import delete, update
+from models import db, insert_ignore, IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+DEFAULT_TTL = 86400
+DEFAULT_WAIT = 10
+# A key still running after this many seconds is presumed abandoned by a crashed worker.
+STALE_AFTER = 60
+POLL_INTERVAL = 0.02
+MAX_POLL_INTERVAL = 0.5
+
+
+def request_fingerprint():
+    """Hash of the method, path and raw body, to catch a key reused for another request."""
+    digest = hashlib.sha256()
+    for part in (request.method.encode(), request.path.encode(), request.get_data()):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _claim(user_id, key, fingerprint, now):
+    ttl = current_app.config.get("IDEMPOTENCY_TTL", DEFAULT_TTL)
+    claimed = insert_ignore(
+        IdempotencyKey,
+        {
+            "user_id": user_id,
+            "key": key,
+            "request_hash": fingerprint,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=ttl),
+        },
+        index_elements=["user_id", "key"],
+    )
+    # Commit straight away so duplicates in other transactions see the claim.
+    db.session.commit()
+    return claimed
+
+
+def _release(user_id, key, created_at=None):
+    """Drop a claim so the next retry runs the view again."""
+    stmt = delete(IdempotencyKey).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+    if created_at is not None:
+        stmt = stmt.where(IdempotencyKey.created_at == created_at)
+    db.session.execute(stmt)
+    db.session.commit()
+
+
+def _store(user_id, key, response):
+    db.session.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+        .values(
+            status_code=response.status_code,
+            content_type=response.mimetype,
+            response_body=response.get_data(as_text=True),
+        )
+    )
+    db.session.commit()
+
+
+def _replay(record):
+    response = current_app.response_class(
+        record.response_body, status=record.status_code, mimetype=record.content_type
+    )
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _await_claim(user_id, key, fingerprint):
+    """Claim `key`, waiting while another request holds it.
+
+    Returns None once the key is claimed, otherwise the response to send
+    instead: the stored replay or an error."""
+    deadline = time.monotonic() + current_app.config.get("IDEMPOTENCY_WAIT", DEFAULT_WAIT)
+    delay = POLL_INTERVAL
+    while True:
+        now = datetime.utcnow()
+        if _claim(user_id, key, fingerprint, now):
+            return None
+        record = db.session.get(IdempotencyKey, (user_id, key), populate_existing=True)
+        if record is None:
+            continue
+        stale = record.status_code is None and record.created_at < now - timedelta(seconds=STALE_AFTER)
+        if record.expires_at <= now or stale:
+            _release(user_id, key, record.created_at)
+            continue
+        if record.request_hash != fingerprint:
+            return jsonify({"error": f"{HEADER} was already used for a different request"}), 422
+        if record.status_code is not None:
+            return _replay(record)
+        if time.monotonic() >= deadline:
+            return jsonify({"error": "A request with this Idempotency-Key is still in progress"}), 409
+        # End the read transaction so the next look sees the first request's commit.
+        db.session.rollback()
+        time.sleep(delay)
+        delay = min(delay * 2, MAX_POLL_INTERVAL)
+
+
+def idempotent(f):
+    """Run the view once per (user, `Idempotency-Key`) and replay its response to retries.
+
+    Goes below `require_auth`. The first request claims the key in
+    `idempotency_keys` before running the view; duplicates wait for it to
+    finish and get the stored status and body back without touching any other
+    table. 5xx responses and exceptions release the key so a retry runs again.
+    Requests without the header are unaffected."""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        user = getattr(request, "db_user", None)
+        if not key or user is None:
+            return f(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({"error": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters"}), 400
+
+        user_id = user.id
+        waited = _await_claim(user_id, key, request_fingerprint())
+        if waited is not None:
+            return waited
+
+        try:
+            response = current_app.make_response(f(*args, **kwargs))
+        except BaseException:
+            db.session.rollback()
+            _release(user_id, key)
+            raise
+        if response.status_code >= 500 or response.is_streamed:
+            _release(user_id, key)
+        else:
+            _store(user_id, key, response)
+        return response
+
+    return decorated
+
+
+def purge_expired_keys():
+    """Delete stored responses past their TTL and commit. Returns the number removed."""
+    removed = db.session.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.utcnow())
+    ).rowcount
+    db.session.commit()
+    return removed
@@ -1,9 +1,60 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
 import uuid
 
 db = SQLAlchemy()
 
+
+def insert_ignore(model, values, index_elements, connection=None):
+    """INSERT that silently skips rows conflicting on `index_elements`.
+
+    Runs on `connection` if given, else the session. Returns True when a row
+    was inserted. Does not commit."""
+    executor = connection if connection is not None else db.session
+    dialect = (connection.dialect if connection is not None else db.session.get_bind().dialect).name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(model).values(**values).on_conflict_do_nothing(
+            index_elements=index_elements
+        )
+        return executor.execute(stmt).rowcount == 1
+    try:
+        with executor.begin_nested():
+            executor.execute(insert(model).values(**values))
+        return True
+    except IntegrityError:
+        return False
+
+
+def upsert(model, rows, index_elements, connection=None):
+    """INSERT `rows`, overwriting the other columns of rows that conflict on `index_elements`.
+
+    Safe against a concurrent writer inserting the same key. Does not commit."""
+    if not rows:
+        return
+    executor = connection if connection is not None else db.session
+    dialect = (connection.dialect if connection is not None else db.session.get_bind().dialect).name
+    columns = [c for c in rows[0] if c not in index_elements]
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements, set_={c: stmt.excluded[c] for c in columns}
+        )
+        executor.execute(stmt, rows)
+        return
+    for row in rows:
+        try:
+            with executor.begin_nested():
+                executor.execute(insert(model).values(**row))
+        except IntegrityError:
+            key = [getattr(model, c) == row[c] for c in index_elements]
+            executor.execute(update(model).where(*key).values(**{c: row[c] for c in columns}))
+
+
 class User(db.Model):
     __tablename__ = 'users'
     
@@ -26,18 +77,26 @@ class User(db.Model):
     def get_or_create_from_clerk(clerk_user_id, name, email):
         user = User.query.filter_by(clerk_user_id=clerk_user_id).first()
         if not user:
-            user = User(
-                clerk_user_id=clerk_user_id,
-                name=name,
-                email=email
+            # Two first-login requests can both miss above; ON CONFLICT makes
+            # the loser reuse the winner's row instead of failing.
+            insert_ignore(
+                User,
+                {"clerk_user_id": clerk_user_id, "name": name, "email": email},
+                index_elements=["clerk_user_id"],
             )
-            db.session.add(user)
             db.session.commit()
-        else:
-            if name and (not user.name or user.name != name):
-                user.name = name
-            if email and (not user.email or user.email != email):
-                user.email = email
+            return User.query.filter_by(clerk_user_id=clerk_user_id).first()
+
+        changed = False
+        if name and user.name != name:
+            user.name = name
+            changed = True
+        if email and user.email != email:
+            user.email = email
+            changed = True
+        # Only write when the Clerk profile actually differs, so read-only
+        # requests never open a write transaction.
+        if changed:
             db.session.commit()
         return user
     
@@ -54,6 +113,7 @@ class User(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+
 class Tutor(db.Model):
     __tablename__ = 'tutors'
     
@@ -74,6 +134,7 @@ class Tutor(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+
 class Availability(db.Model):
     __tablename__ = 'availabilities'
     
@@ -98,8 +159,14 @@ class Availability(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+
 class Session(db.Model):
     __tablename__ = 'sessions'
+    # Keyset pagination seeks on (start_time, id), optionally per tutor.
+    __table_args__ = (
+        db.Index('ix_sessions_start_time_id', 'start_time', 'id'),
+        db.Index('ix_sessions_tutor_start_time', 'tutor_id', 'start_time'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     tutor_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
@@ -134,6 +201,7 @@ class Session(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+
 class SessionNote(db.Model):
     __tablename__ = 'session_notes'
     
@@ -158,6 +226,7 @@ class SessionNote(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+
 class Feedback(db.Model):
     __tablename__ = 'feedbacks'
     
@@ -180,6 +249,103 @@ class Feedback(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+
+class TutorStats(db.Model):
+    __tablename__ = 'tutor_stats'
+
+    tutor_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    rating_sum = db.Column(db.Float, nullable=False, default=0.0)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    booked_session_count = db.Column(db.Integer, nullable=False, default=0)
+    availability_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @property
+    def avg_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else None
+
+    def to_dict(self):
+        return {
+            'tutor_id': self.tutor_id,
+            'rating_sum': self.rating_sum,
+            'rating_count': self.rating_count,
+            'avg_rating': self.avg_rating,
+            'booked_session_count': self.booked_session_count,
+            'availability_count': self.availability_count,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class ChangeCounter(db.Model):
+    __tablename__ = 'change_counters'
+
+    key = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DailySessionRollup(db.Model):
+    """Booked-session totals per (day, tutor, course); course '' stands for none."""
+    __tablename__ = 'daily_session_rollups'
+
+    day = db.Column(db.Date, primary_key=True)
+    tutor_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    course = db.Column(db.String(100), primary_key=True, default='')
+    iso_week = db.Column(db.Integer, nullable=False, index=True)
+    session_count = db.Column(db.Integer, nullable=False, default=0)
+    booked_seconds = db.Column(db.Float, nullable=False, default=0.0)
+    attended_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Float, nullable=False, default=0.0)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    first_session_id = db.Column(db.Integer, nullable=False)
+
+
+class StudentSessionRollup(db.Model):
+    """Booked-session count per (student, tutor, course), for distinct-student stats."""
+    __tablename__ = 'student_session_rollups'
+
+    student_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    tutor_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    course = db.Column(db.String(100), primary_key=True, default='')
+    session_count = db.Column(db.Integer, nullable=False, default=0)
+    first_session_id = db.Column(db.Integer, nullable=False)
+
+
+class IdempotencyKey(db.Model):
+    """First response to a request sent with an `Idempotency-Key` header; see idempotency.py."""
+    __tablename__ = 'idempotency_keys'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    request_hash = db.Column(db.String(64), nullable=False)
+    # NULL while the first request is still running.
+    status_code = db.Column(db.Integer)
+    content_type = db.Column(db.String(100))
+    response_body = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+class EmailOutbox(db.Model):
+    """Email queued in the same transaction as the change it reports; see services/outbox.py."""
+    __tablename__ = 'email_outbox'
+    __table_args__ = (db.Index('ix_email_outbox_due', 'status', 'next_attempt_at'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    # Resend `Emails.send` params as JSON.
+    payload = db.Column(db.Text, nullable=False)
+    # pending -> sending -> sent, or dead once out of attempts.
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # A 'sending' row whose lease ran out belonged to a worker that died; it is claimed again.
+    locked_until = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    provider_id = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+
 class Invitation(db.Model):
     __tablename__ = 'invitations'
     
@@ -0,0 +1,81 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+
+MAX_PAGE_SIZE = 500
+
+
+class InvalidPageRequest(ValueError):
+    pass
+
+
+def encode_cursor(start_time, row_id):
+    raw = json.dumps([start_time.isoformat(), row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        start_time, row_id = json.loads(raw)
+        start_time = datetime.fromisoformat(start_time)
+    except (ValueError, TypeError) as e:
+        raise InvalidPageRequest("Invalid cursor") from e
+    if not isinstance(row_id, int):
+        raise InvalidPageRequest("Invalid cursor")
+    return start_time, row_id
+
+
+def parse_datetime_arg(value):
+    """ISO datetime from a query arg, or None when absent or unparseable."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def parse_page_args(args, max_limit=MAX_PAGE_SIZE):
+    """(limit, after) from request args; both None when the client did not ask to page."""
+    limit = None
+    if "limit" in args:
+        limit = args.get("limit", type=int)
+        if limit is None or not 1 <= limit <= max_limit:
+            raise InvalidPageRequest(f"limit must be between 1 and {max_limit}")
+    cursor = args.get("cursor")
+    after = decode_cursor(cursor) if cursor else None
+    if after and limit is None:
+        raise InvalidPageRequest("cursor requires limit")
+    return limit, after
+
+
+def apply_time_window(query, start_column, end_column, args):
+    """Optional `from`/`to` bounds: rows starting at or after `from` and ending by `to`."""
+    window_from = parse_datetime_arg(args.get("from"))
+    window_to = parse_datetime_arg(args.get("to"))
+    if window_from:
+        query = query.filter(start_column >= window_from)
+    if window_to:
+        query = query.filter(end_column <= window_to)
+    return query
+
+
+def keyset_page(query, time_column, id_column, limit=None, after=None):
+    """Rows ordered by (time, id) and the cursor of the next page.
+
+    Without a limit every row is returned and the cursor is None. Seeking with
+    a row-value comparison lets the database start from the cursor instead of
+    skipping an OFFSET worth of rows."""
+    query = query.order_by(time_column.asc(), id_column.asc())
+    if after is not None:
+        query = query.filter(tuple_(time_column, id_column) > tuple_(*after))
+    if limit is None:
+        return query.all(), None
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(getattr(last, time_column.key), getattr(last, id_column.key))
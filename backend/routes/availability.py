@@ -1,8 +1,10 @@
 from flask import Blueprint, jsonify, request
 from models import db, Availability, Tutor, User, Session
 from auth import require_auth
+from conditional import conditional_get
 from datetime import datetime
 from sqlalchemy.orm import joinedload
+from services import tutor_stats, change_tracking
 
 availability_bp = Blueprint("availability", __name__)
 
@@ -21,6 +23,7 @@ def create_availability():
         tutor = Tutor(user_id=db_user.id)
         db.session.add(tutor)
         db.session.flush()
+        change_tracking.bump_after_commit(change_tracking.TUTORS)
 
     day_of_week = data.get("day_of_week")
     start_time_str = data.get("start_time")
@@ -52,6 +55,8 @@ def create_availability():
     )
 
     db.session.add(availability)
+    tutor_stats.record_availability(db_user.id, 1)
+    change_tracking.bump_after_commit(change_tracking.AVAILABILITY)
     db.session.commit()
 
     return jsonify({"success": True, "availability": availability.to_dict()}), 201
@@ -81,6 +86,7 @@ def get_availability():
 
 @availability_bp.route("/api/availability/all", methods=["GET"])
 @require_auth
+@conditional_get("availabilities", "tutors", "users")
 def get_all_availability():
     availabilities = Availability.query.options(
         joinedload(Availability.tutor).joinedload(Tutor.user)
@@ -175,6 +181,7 @@ def update_availability(availability_id):
                         if session_date_str == old_date_str and session_time_str == old_time_str:
                             db.session.delete(session)
 
+    change_tracking.bump_after_commit(change_tracking.AVAILABILITY)
     db.session.commit()
     return jsonify({"success": True, "availability": availability.to_dict()})
 
@@ -239,6 +246,8 @@ def delete_availability(availability_id):
                         deleted_count += 1
 
     db.session.delete(availability)
+    tutor_stats.record_availability(tutor_user.id, -1)
+    change_tracking.bump_after_commit(change_tracking.AVAILABILITY)
     db.session.commit()
 
     return jsonify({"success": True, "message": "Availability deleted"})
@@ -1,17 +1,35 @@
 from flask import Blueprint, jsonify, request
 from models import db, Invitation, User, Tutor
 from auth import require_auth
-from services.email_service import send_invitation_email
+from services.email_service import invitation_email, send_emails, send_invitation_email
 import re
 
 invitations_bp = Blueprint("invitations", __name__)
 
+MAX_BATCH_INVITATIONS = 500
+
 
 def validate_email(email):
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(pattern, email) is not None
 
 
+def invitation_conflict(email):
+    """Why `email` cannot be invited, or None."""
+    existing_user = User.query.filter_by(email=email).first()
+    if existing_user:
+        return "User with this email already exists"
+    
+    pending_invitation = Invitation.query.filter_by(
+        email=email, 
+        status='pending'
+    ).first()
+    
+    if pending_invitation and pending_invitation.is_valid():
+        return "A pending invitation already exists for this email"
+    return None
+
+
 @invitations_bp.route("/api/invitations", methods=["POST"])
 @require_auth
 def send_invitation():
@@ -33,17 +51,9 @@ def send_invitation():
     if role not in ["tutor", "professor"]:
         return jsonify({"error": "role must be 'tutor' or 'professor'"}), 400
     
-    existing_user = User.query.filter_by(email=email).first()
-    if existing_user:
-        return jsonify({"error": "User with this email already exists"}), 409
-    
-    pending_invitation = Invitation.query.filter_by(
-        email=email, 
-        status='pending'
-    ).first()
-    
-    if pending_invitation and pending_invitation.is_valid():
-        return jsonify({"error": "A pending invitation already exists for this email"}), 409
+    conflict = invitation_conflict(email)
+    if conflict:
+        return jsonify({"error": conflict}), 409
     
     invitation = Invitation(
         email=email,
@@ -72,6 +82,77 @@ def send_invitation():
     }), 201
 
 
+def _batch_entry_error(email, seen):
+    """Why `email` is skipped from a batch, or None. Valid addresses are added to `seen`."""
+    if not validate_email(email):
+        return "Invalid email format"
+    if email in seen:
+        return "Duplicate email in request"
+    seen.add(email)
+    return invitation_conflict(email)
+
+
+@invitations_bp.route("/api/invitations/batch", methods=["POST"])
+@require_auth
+def send_invitations_batch():
+    """Invite a cohort at once; emails go out through Resend's batch API.
+
+    Returns one result per address, in request order."""
+    current_user: User = request.db_user
+
+    if current_user.role != "professor":
+        return jsonify({"error": "Forbidden"}), 403
+
+    data = request.get_json() or {}
+    emails = data.get("emails")
+    role = data.get("role", "").strip()
+
+    if not isinstance(emails, list) or not emails or not role:
+        return jsonify({"error": "emails and role are required"}), 400
+
+    if len(emails) > MAX_BATCH_INVITATIONS:
+        return jsonify({"error": f"At most {MAX_BATCH_INVITATIONS} emails per request"}), 400
+
+    if role not in ["tutor", "professor"]:
+        return jsonify({"error": "role must be 'tutor' or 'professor'"}), 400
+
+    results = []
+    invited = []
+    seen = set()
+    for email in emails:
+        email = email.strip() if isinstance(email, str) else ""
+        error = _batch_entry_error(email, seen)
+        if error:
+            results.append({"email": email, "error": error})
+            continue
+        invitation = Invitation(email=email, role=role, invited_by=current_user.id)
+        db.session.add(invitation)
+        results.append({"email": email})
+        invited.append((results[-1], invitation))
+    db.session.commit()
+
+    outcomes = send_emails([
+        invitation_email(
+            email=invitation.email,
+            role=role,
+            token=invitation.token,
+            invited_by_name=current_user.name
+        )
+        for _, invitation in invited
+    ])
+    for (result, invitation), outcome in zip(invited, outcomes):
+        result["invitation"] = invitation.to_dict()
+        if isinstance(outcome, Exception):
+            print(f"Error sending invitation to {invitation.email}: {outcome}")
+            result["warning"] = "Invitation created but email failed to send"
+
+    return jsonify({
+        "success": True,
+        "invited": len(invited),
+        "results": results
+    }), 201
+
+
 @invitations_bp.route("/api/invitations", methods=["GET"])
 @require_auth
 def get_invitations():
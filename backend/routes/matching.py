@@ -1,11 +1,42 @@
-from flask import Blueprint, jsonify, request
-from models import User
+from datetime import datetime, timedelta
+from flask import Blueprint, current_app, jsonify, request
+from models import db, User
 from auth import require_auth
-from services.matching_service import get_recommended_tutors
+from services.matching_service import (
+    recommendation_versions,
+    recommendation_etag,
+    get_cached_recommendations,
+    decode_cursor,
+    iter_batch_match_scores,
+)
+from services.scoring_profiles import get_scoring_profiles, UnknownProfile
+from streaming import stream_mode, stream_response
+
+MAX_RECOMMENDATION_LIMIT = 100
+MAX_WINDOW_DAYS = 31
 
 matching_bp = Blueprint("matching", __name__)
 
 
+def parse_window(start_str, end_str):
+    """(window, error) from `from`/`to` values; window is None when both are absent."""
+    if not start_str and not end_str:
+        return None, None
+    if not start_str or not end_str:
+        return None, "from and to must be given together"
+    try:
+        # Stored times are naive wall-clock values, so any offset is dropped.
+        start = datetime.fromisoformat(start_str.replace("Z", "+00:00")).replace(tzinfo=None)
+        end = datetime.fromisoformat(end_str.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None, "Invalid datetime format"
+    if end <= start:
+        return None, "to must be after from"
+    if end - start > timedelta(days=MAX_WINDOW_DAYS):
+        return None, f"window must be at most {MAX_WINDOW_DAYS} days"
+    return (start, end), None
+
+
 @matching_bp.route("/api/matching/recommend", methods=["GET"])
 @require_auth
 def recommend_tutors():
@@ -14,10 +45,110 @@ def recommend_tutors():
     if current_user.role != "student":
         return jsonify({"error": "Only students can get tutor recommendations"}), 403
     
-    recommendations = get_recommended_tutors(student_id=current_user.id)
-    
+    limit = request.args.get("limit", type=int)
+    if "limit" in request.args and (limit is None or not 1 <= limit <= MAX_RECOMMENDATION_LIMIT):
+        return jsonify({"error": f"limit must be between 1 and {MAX_RECOMMENDATION_LIMIT}"}), 400
+
+    after = None
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+
+    window, error = parse_window(request.args.get("from"), request.args.get("to"))
+    if error:
+        return jsonify({"error": error}), 400
+
+    try:
+        profile, plan = get_scoring_profiles().get(request.args.get("profile"))
+    except UnknownProfile:
+        return jsonify({"error": "Unknown scoring profile"}), 400
+
+    versions = recommendation_versions(current_user.id, slot_aware=window is not None)
+    etag = recommendation_etag(current_user.id, versions, plan)
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+    else:
+        recommendations, next_cursor = get_cached_recommendations(
+            current_user.id, versions, limit=limit, after=after, window=window, plan=plan
+        )
+        response = jsonify({
+            "success": True,
+            "profile": profile,
+            "recommendations": recommendations,
+            "next_cursor": next_cursor
+        })
+    response.set_etag(etag)
+    # Let browsers keep the body but always revalidate it.
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def batch_args_error(class_name, student_ids, limit):
+    """Why a batch request's selection or limit is invalid, or None."""
+    if not class_name and not student_ids:
+        return "class_name or student_ids is required"
+    if student_ids is not None and (
+        not isinstance(student_ids, list) or not all(isinstance(i, int) for i in student_ids)
+    ):
+        return "student_ids must be a list of integers"
+    if limit is not None and (
+        not isinstance(limit, int) or not 1 <= limit <= MAX_RECOMMENDATION_LIMIT
+    ):
+        return f"limit must be between 1 and {MAX_RECOMMENDATION_LIMIT}"
+    return None
+
+
+@matching_bp.route("/api/matching/batch", methods=["POST"])
+@require_auth
+def batch_recommend_tutors():
+    current_user: User = request.db_user
+
+    if current_user.role != "professor":
+        return jsonify({"error": "Forbidden"}), 403
+
+    data = request.get_json() or {}
+    class_name = data.get("class_name")
+    student_ids = data.get("student_ids")
+    limit = data.get("limit")
+
+    error = batch_args_error(class_name, student_ids, limit)
+    if error:
+        return jsonify({"error": error}), 400
+
+    window, error = parse_window(data.get("from"), data.get("to"))
+    if error:
+        return jsonify({"error": error}), 400
+
+    try:
+        profile, plan = get_scoring_profiles().get(data.get("profile"))
+    except UnknownProfile:
+        return jsonify({"error": "Unknown scoring profile"}), 400
+
+    if not student_ids:
+        student_ids = [
+            student_id for (student_id,) in db.session.query(User.id).filter(
+                User.role == "student", User.class_name == class_name
+            )
+        ]
+
+    results = iter_batch_match_scores(student_ids, limit=limit, window=window, plan=plan)
+
+    def result_dict(student, recommendations):
+        return dict(student, recommendations=recommendations)
+
+    mode = stream_mode()
+    if mode:
+        return stream_response(
+            (result_dict(student, recommendations) for student, recommendations in results),
+            mode, "results", {"success": True, "profile": profile},
+        )
+
     return jsonify({
         "success": True,
-        "recommendations": recommendations
+        "profile": profile,
+        "results": [result_dict(student, recommendations) for student, recommendations in results]
     })
-
@@ -1,19 +1,29 @@
 from flask import Blueprint, jsonify, request
 from models import db, Session, User, Availability, Tutor, SessionNote, Feedback
 from auth import require_auth
-from datetime import datetime, timedelta
+from conditional import conditional_get
+from idempotency import idempotent
 from sqlalchemy.orm import joinedload, subqueryload
-from services.email_service import (
-    send_booking_confirmation,
-    send_tutor_notification,
-    send_feedback_request,
+from services.email_service import feedback_request_email
+from services import tutor_stats, change_tracking, dashboard_service, outbox
+from services.booking import (
+    BookingConflict,
+    InvalidBooking,
+    apply_session_update,
+    book_slot,
+    booking_window,
+    claim_slot,
+    queue_booking_emails,
 )
+from pagination import InvalidPageRequest, apply_time_window, keyset_page, parse_page_args
+from streaming import STREAM_BATCH_SIZE, iter_batches, stream_mode, stream_response
 
 session_bp = Blueprint("session", __name__)
 
 
 @session_bp.route("/api/sessions/book", methods=["POST"])
 @require_auth
+@idempotent
 def book_session():
     data = request.get_json() or {}
 
@@ -38,83 +48,38 @@ def book_session():
         return jsonify({"error": "Availability not found"}), 404
 
     try:
-        start_time = datetime.fromisoformat(start_time_str)
-        end_time = datetime.fromisoformat(end_time_str)
-    except ValueError:
-        return jsonify({"error": "Invalid datetime format"}), 400
-
-    if end_time <= start_time:
-        return jsonify({"error": "end_time must be after start_time"}), 400
-
-    if availability.is_recurring:
-        av_start_time = availability.start_time.time()
-        av_end_time = availability.end_time.time()
-        req_start_time = start_time.time()
-        req_end_time = end_time.time()
-
-        if not (av_start_time <= req_start_time and req_end_time <= av_end_time):
-            return jsonify({"error": "Requested time outside availability window"}), 409
-    else:
-        if not (
-            availability.start_time <= start_time and end_time <= availability.end_time
-        ):
-            return jsonify({"error": "Requested time outside availability window"}), 409
+        start_time, end_time = booking_window(availability, start_time_str, end_time_str)
+    except InvalidBooking as e:
+        return jsonify({"error": str(e)}), e.status
 
     # Find the tutor's user_id from Availability -> Tutor -> User
     tutor_profile: Tutor = availability.tutor
     if not tutor_profile or not tutor_profile.user_id:
         return jsonify({"error": "Tutor profile misconfigured"}), 500
     tutor_user_id = tutor_profile.user_id
-
-    # Ensure no overlapping session exists for the tutor in that window
-    overlap = Session.query.filter(
-        Session.tutor_id == tutor_user_id,
-        Session.start_time < end_time,
-        Session.end_time > start_time,
-    ).first()
-    if overlap:
-        return jsonify({"error": "Tutor already has a session at this time"}), 409
-
-    # Create the session (only created when a student books)
-    new_session = Session(
-        tutor_id=tutor_user_id,
-        student_id=current_user.id,
-        course=course,
-        session_type=availability.session_type,
-        start_time=start_time,
-        end_time=end_time,
-        status="booked",
-    )
-    db.session.add(new_session)
-
-    db.session.commit()
-
     tutor_user = User.query.get(tutor_user_id)
-    session_data = new_session.to_dict()
 
+    # Overlap check and insert run under a per-tutor lock (services/booking.py)
     try:
-        send_booking_confirmation(
-            student_email=current_user.email,
-            student_name=current_user.name,
-            tutor_name=tutor_user.name if tutor_user else "Tutor",
-            session_data=session_data,
+        new_session = book_slot(
+            student_id=current_user.id,
+            tutor_id=tutor_user_id,
+            start_time=start_time,
+            end_time=end_time,
+            course=course,
+            session_type=availability.session_type,
+            on_booked=lambda new_session: queue_booking_emails(current_user, tutor_user, new_session),
         )
+    except BookingConflict as e:
+        return jsonify({"error": str(e)}), 409
 
-        if tutor_user:
-            send_tutor_notification(
-                tutor_email=tutor_user.email,
-                tutor_name=tutor_user.name,
-                student_name=current_user.name,
-                session_data=session_data,
-            )
-    except Exception as e:
-        print(f"Error sending booking emails: {e}")
-
+    outbox.kick()
     return jsonify({"session": new_session.to_dict()}), 201
 
 
 @session_bp.route("/api/tutor/sessions", methods=["GET"])
 @require_auth
+@conditional_get("sessions", "users")
 def tutor_list_sessions():
     current_user: User = request.db_user
     tutor_id = request.args.get("tutor_id")
@@ -130,37 +95,28 @@ def tutor_list_sessions():
     else:
         return jsonify({"error": "tutor_id is required for non-tutor users"}), 400
 
+    try:
+        limit, after = parse_page_args(request.args)
+    except InvalidPageRequest as e:
+        return jsonify({"error": str(e)}), 400
+
     statuses = request.args.get("status")
-    dt_from = request.args.get("from")
-    dt_to = request.args.get("to")
 
     if statuses:
         allowed = [s.strip() for s in statuses.split(",") if s.strip()]
         if allowed:
             q = q.filter(Session.status.in_(allowed))
 
-    def parse_dt(s):
-        if not s:
-            return None
-        try:
-            return datetime.fromisoformat(s)
-        except ValueError:
-            return None
-
-    p_from = parse_dt(dt_from)
-    p_to = parse_dt(dt_to)
-    if p_from:
-        q = q.filter(Session.start_time >= p_from)
-    if p_to:
-        q = q.filter(Session.end_time <= p_to)
-
-    sessions = q.order_by(Session.start_time.asc()).all()
+    q = apply_time_window(q, Session.start_time, Session.end_time, request.args)
+
+    sessions, next_cursor = keyset_page(q, Session.start_time, Session.id, limit, after)
     result = [s.to_dict() for s in sessions]
-    return jsonify({"sessions": result})
+    return jsonify({"sessions": result, "next_cursor": next_cursor})
 
 
 @session_bp.route("/api/student/sessions", methods=["GET"])
 @require_auth
+@conditional_get("sessions", "feedbacks", "users")
 def student_my_sessions():
     current_user: User = request.db_user
     if current_user.role != "student":
@@ -201,35 +157,64 @@ def get_sessions():
     tutor_id = request.args.get("tutor_id")
     student_id = request.args.get("student_id")
 
+    try:
+        limit, after = parse_page_args(request.args)
+    except InvalidPageRequest as e:
+        return jsonify({"error": str(e)}), 400
+
     query = Session.query.options(joinedload(Session.student_user))
 
     if tutor_id:
         query = query.filter_by(tutor_id=tutor_id)
     if student_id:
         query = query.filter_by(student_id=student_id)
+    query = apply_time_window(query, Session.start_time, Session.end_time, request.args)
 
-    sessions = query.all()
+    sessions, next_cursor = keyset_page(query, Session.start_time, Session.id, limit, after)
 
-    return jsonify({"success": True, "sessions": [s.to_dict() for s in sessions]})
+    return jsonify({
+        "success": True,
+        "sessions": [s.to_dict() for s in sessions],
+        "next_cursor": next_cursor,
+    })
 
 
 @session_bp.route("/api/sessions/all", methods=["GET"])
 @require_auth
+@conditional_get("sessions", "users")
 def get_all_sessions():
-    sessions = Session.query.options(
+    try:
+        limit, after = parse_page_args(request.args)
+    except InvalidPageRequest as e:
+        return jsonify({"error": str(e)}), 400
+
+    mode = stream_mode()
+    if mode and limit is not None:
+        return jsonify({"error": "limit and cursor cannot be combined with streaming"}), 400
+
+    query = Session.query.options(
         joinedload(Session.student_user),
         joinedload(Session.tutor_user)
-    ).all()
-    
-    result = []
-    for s in sessions:
+    )
+    query = apply_time_window(query, Session.start_time, Session.end_time, request.args)
+
+    def session_dict(s):
         s_dict = s.to_dict()
         if s.tutor_user:
             s_dict['tutor_name'] = s.tutor_user.name
             s_dict['tutor_email'] = s.tutor_user.email
-        result.append(s_dict)
+        return s_dict
+
+    if mode:
+        rows = query.order_by(Session.start_time.asc(), Session.id.asc()).yield_per(STREAM_BATCH_SIZE)
+        return stream_response(
+            (session_dict(s) for s in rows), mode, "sessions", {"success": True, "next_cursor": None}
+        )
+
+    sessions, next_cursor = keyset_page(query, Session.start_time, Session.id, limit, after)
+    result = [session_dict(s) for s in sessions]
     
-    return jsonify({"success": True, "sessions": result})
+    return jsonify({"success": True, "sessions": result, "next_cursor": next_cursor})
 
 
 @session_bp.route("/api/sessions/<int:session_id>", methods=["GET"])
@@ -249,42 +234,14 @@ def update_session(session_id):
     if not session:
         return jsonify({"error": "Session not found"}), 404
 
-    data = request.get_json()
-
-    if "tutor_id" in data:
-        tutor = User.query.get(data["tutor_id"])
-        if not tutor:
-            return jsonify({"error": "Tutor not found"}), 404
-        session.tutor_id = data["tutor_id"]
-
-    if "student_id" in data:
-        if data["student_id"]:
-            student = User.query.get(data["student_id"])
-            if not student:
-                return jsonify({"error": "Student not found"}), 404
-        session.student_id = data["student_id"]
-
-    if "course" in data:
-        session.course = data["course"]
-
-    if "session_type" in data:
-        session.session_type = data["session_type"]
-
-    if "start_time" in data:
-        try:
-            session.start_time = datetime.fromisoformat(data["start_time"])
-        except ValueError:
-            return jsonify({"error": "Invalid datetime format for start_time"}), 400
-
-    if "end_time" in data:
-        try:
-            session.end_time = datetime.fromisoformat(data["end_time"])
-        except ValueError:
-            return jsonify({"error": "Invalid datetime format for end_time"}), 400
-
-    if "status" in data:
-        session.status = data["status"]
-
+    try:
+        apply_session_update(session, request.get_json())
+    except BookingConflict as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 409
+    except InvalidBooking as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), e.status
     db.session.commit()
 
     return jsonify({"success": True, "session": session.to_dict()})
@@ -297,7 +254,13 @@ def delete_session(session_id):
     if not session:
         return jsonify({"error": "Session not found"}), 404
 
+    tutor_stats.record_session_change(tutor_stats.session_totals(session), None)
     db.session.delete(session)
+    change_tracking.bump_after_commit(
+        change_tracking.student_key(session.student_id) if session.student_id else None,
+        change_tracking.RATINGS,
+        change_tracking.BOOKINGS,
+    )
     db.session.commit()
 
     return jsonify({"success": True, "message": "Session deleted"})
@@ -310,22 +273,25 @@ def book_existing_session(session_id):
     if current_user.role != "student":
         return jsonify({"error": "Forbidden"}), 403
 
-    session = Session.query.get(session_id)
-    if not session:
-        return jsonify({"error": "Session not found"}), 404
-
-    if session.status == "booked":
-        return jsonify({"error": "Session already booked"}), 409
-
-    session.status = "booked"
-    session.student_id = current_user.id
+    try:
+        claim_slot(session_id, current_user.id)
+    except BookingConflict:
+        db.session.rollback()
+        session = Session.query.get(session_id)
+        if not session:
+            return jsonify({"error": "Session not found"}), 404
+        if session.status == "booked":
+            return jsonify({"error": "Session already booked"}), 409
+        return jsonify({"error": "Session is not available"}), 409
     db.session.commit()
 
+    session = Session.query.get(session_id)
     return jsonify({"success": True, "session": session.to_dict()})
 
 
 @session_bp.route("/api/session-notes", methods=["POST"])
 @require_auth
+@idempotent
 def create_session_note():
     current_user: User = request.db_user
     if current_user.role != "tutor":
@@ -362,20 +328,22 @@ def create_session_note():
         student_feedback=student_feedback,
     )
     db.session.add(new_note)
-    db.session.commit()
 
     if attendance_status in ["present", "attended", "late"]:
         student = User.query.get(session.student_id)
         if student:
             try:
-                send_feedback_request(
+                outbox.enqueue("feedback_request", feedback_request_email(
                     student_email=student.email,
                     student_name=student.name,
                     tutor_name=current_user.name,
                     session_data=session.to_dict(),
-                )
+                ))
             except Exception as e:
-                print(f"Error sending feedback request email: {e}")
+                print(f"Error queueing feedback request email: {e}")
+
+    db.session.commit()
+    outbox.kick()
 
     return jsonify({"success": True, "note": new_note.to_dict()}), 201
 
@@ -427,6 +395,7 @@ def get_session_note(session_id):
 
 @session_bp.route("/api/feedback", methods=["POST"])
 @require_auth
+@idempotent
 def submit_feedback():
     current_user: User = request.db_user
     data = request.get_json()
@@ -452,6 +421,8 @@ def submit_feedback():
     ).first()
 
     if existing_feedback:
+        tutor_stats.record_feedback(session.tutor_id, existing_feedback.rating, rating)
+        change_tracking.bump_after_commit(change_tracking.RATINGS)
         existing_feedback.rating = rating
         existing_feedback.comment = comment
         db.session.commit()
@@ -464,6 +435,8 @@ def submit_feedback():
         comment=comment,
     )
     db.session.add(new_feedback)
+    tutor_stats.record_feedback(session.tutor_id, None, rating)
+    change_tracking.bump_after_commit(change_tracking.RATINGS)
     db.session.commit()
 
     return jsonify({"success": True, "feedback": new_feedback.to_dict()}), 201
@@ -491,14 +464,28 @@ def professor_get_all_sessions():
     if not current_user or current_user.role != "professor":
         return jsonify({"error": "Forbidden"}), 403
 
-    sessions = (
+    query = (
         Session.query.options(
             joinedload(Session.tutor_user), joinedload(Session.student_user)
         )
         .order_by(Session.start_time.desc())
-        .all()
     )
 
+    mode = stream_mode()
+    if mode:
+        # Notes and feedback are looked up per batch so memory stays bounded.
+        def rows():
+            for batch in iter_batches(query.yield_per(STREAM_BATCH_SIZE)):
+                yield from _professor_session_dicts(batch)
+
+        return stream_response(rows(), mode, "sessions", {"success": True})
+
+    sessions_data = list(_professor_session_dicts(query.all()))
+
+    return jsonify({"success": True, "sessions": sessions_data})
+
+
+def _professor_session_dicts(sessions):
     session_ids = [s.id for s in sessions]
     notes = (
         SessionNote.query.filter(SessionNote.session_id.in_(session_ids)).all()
@@ -513,7 +500,6 @@ def professor_get_all_sessions():
     )
     feedback_map = {f.session_id: f for f in feedbacks}
 
-    sessions_data = []
     for session in sessions:
         session_dict = session.to_dict()
 
@@ -529,13 +515,12 @@ def professor_get_all_sessions():
         feedback = feedback_map.get(session.id)
         session_dict["feedback"] = feedback.to_dict() if feedback else None
 
-        sessions_data.append(session_dict)
-
-    return jsonify({"success": True, "sessions": sessions_data})
+        yield session_dict
 
 
 @session_bp.route("/api/professor/dashboard", methods=["GET"])
 @require_auth
+@conditional_get("sessions", "session_notes", "feedbacks", "users", daily=True)
 def professor_get_dashboard():
     current_user: User = getattr(request, "db_user", None)
     if not current_user or current_user.role != "professor":
@@ -544,338 +529,29 @@ def professor_get_dashboard():
     class_filter = request.args.get("class")
     tutor_filter = request.args.get("tutor")
 
-    query = Session.query.options(
-        joinedload(Session.student_user), joinedload(Session.tutor_user)
-    ).filter(Session.status == "booked")
-
-    if class_filter:
-        query = query.filter(Session.course == class_filter)
-    if tutor_filter:
-        query = query.filter(Session.tutor_id == int(tutor_filter))
-
-    sessions = query.all()
-
-    session_ids = [s.id for s in sessions]
-    feedbacks = (
-        Feedback.query.filter(Feedback.session_id.in_(session_ids)).all()
-        if session_ids
-        else []
+    metrics = dashboard_service.dashboard_metrics(
+        course=class_filter,
+        tutor_id=int(tutor_filter) if tutor_filter else None,
     )
-    feedback_map = {f.session_id: f for f in feedbacks}
-    notes = (
-        SessionNote.query.filter(SessionNote.session_id.in_(session_ids)).all()
-        if session_ids
-        else []
-    )
-    notes_map = {n.session_id: n for n in notes}
-
-    total_sessions = len(sessions)
-
-    total_hours = 0
-    for session in sessions:
-        if session.start_time and session.end_time:
-            duration = (session.end_time - session.start_time).total_seconds() / 3600
-            total_hours += duration
-
-    unique_students = set()
-    for session in sessions:
-        if session.student_id:
-            unique_students.add(session.student_id)
-    active_students = len(unique_students)
-
-    ratings = []
-    for session in sessions:
-        feedback = feedback_map.get(session.id)
-        if feedback and feedback.rating:
-            ratings.append(feedback.rating)
-
-    avg_rating = round(sum(ratings) / len(ratings), 1) if ratings else None
-
-    def get_week_number(date):
-        return date.isocalendar()[1]
-
-    def get_week_start_date(date):
-        """Get the first day (Monday) of the week for a given date"""
-        days_since_monday = date.weekday()
-        return date - timedelta(days=days_since_monday)
-
-    now = datetime.utcnow()
-
-    weekly_data = []
-    weekly_ratings = []
-    for i in range(5, -1, -1):
-        week_date = now - timedelta(days=i * 7)
-        week_num = get_week_number(week_date)
-        week_start = get_week_start_date(week_date)
-
-        week_sessions = [
-            s
-            for s in sessions
-            if s.start_time and get_week_number(s.start_time) == week_num
-        ]
-        week_hours = sum(
-            [
-                (s.end_time - s.start_time).total_seconds() / 3600
-                for s in week_sessions
-                if s.start_time and s.end_time
-            ]
-        )
-
-        weekly_data.append(
-            {
-                "week": week_start.strftime("%m/%d/%Y"),
-                "sessions": len(week_sessions),
-                "hours": round(week_hours, 1),
-            }
-        )
-
-        # Calculate average rating for this week
-        week_ratings = []
-        for s in week_sessions:
-            feedback = feedback_map.get(s.id)
-            if feedback and feedback.rating:
-                week_ratings.append(feedback.rating)
-        week_avg_rating = (
-            round(sum(week_ratings) / len(week_ratings), 1) if week_ratings else None
-        )
-        weekly_ratings.append(
-            {"week": week_start.strftime("%m/%d/%Y"), "rating": week_avg_rating}
-        )
-
-    monthly_attendance = []
-    for i in range(5, -1, -1):
-        month_date = datetime(now.year, now.month, 1) - timedelta(days=i * 30)
-        month = month_date.month
-        year = month_date.year
-        month_label = month_date.strftime("%b")
-
-        month_sessions = [
-            s
-            for s in sessions
-            if s.start_time
-            and s.start_time.month == month
-            and s.start_time.year == year
-        ]
-
-        if len(month_sessions) == 0:
-            attendance_rate = 0
-        else:
-            attended = 0
-            for s in month_sessions:
-                note = notes_map.get(s.id)
-                if note and note.attendance_status in ["present", "attended"]:
-                    attended += 1
-            attendance_rate = round((attended / len(month_sessions)) * 100)
-
-        monthly_attendance.append({"month": month_label, "rate": attendance_rate})
-
-    course_distribution = {}
-    for session in sessions:
-        if session.course:
-            course_distribution[session.course] = (
-                course_distribution.get(session.course, 0) + 1
-            )
-
-    student_counts = {}
-    for session in sessions:
-        if session.student_user and session.student_user.name:
-            name = session.student_user.name
-            student_counts[name] = student_counts.get(name, 0) + 1
-
-    top_students = [
-        {"name": name, "count": count}
-        for name, count in sorted(
-            student_counts.items(), key=lambda x: x[1], reverse=True
-        )[:5]
-    ]
-
-    all_sessions = (
-        Session.query.options(joinedload(Session.tutor_user))
-        .filter(Session.status == "booked")
-        .all()
-    )
-
-    unique_classes = set()
-    for s in all_sessions:
-        if s.course:
-            unique_classes.add(s.course)
-
-    unique_tutors = {}
-    for s in all_sessions:
-        if s.tutor_id and s.tutor_user:
-            unique_tutors[s.tutor_id] = s.tutor_user.name
 
     return jsonify(
         {
             "success": True,
-            "stats": {
-                "total_sessions": total_sessions,
-                "total_hours": round(total_hours, 1),
-                "active_students": active_students,
-                "avg_rating": avg_rating,
-            },
-            "weekly_data": weekly_data,
-            "weekly_ratings": weekly_ratings,
-            "monthly_attendance": monthly_attendance,
-            "course_distribution": course_distribution,
-            "top_students": top_students,
-            "filters": {
-                "classes": sorted(list(unique_classes)),
-                "tutors": [
-                    {"id": tid, "name": name}
-                    for tid, name in sorted(unique_tutors.items(), key=lambda x: x[1])
-                ],
-            },
+            **metrics,
+            "filters": dashboard_service.dashboard_filters(),
         }
     )
 
 
 @session_bp.route("/api/tutor/dashboard", methods=["GET"])
 @require_auth
+@conditional_get("sessions", "session_notes", "feedbacks", "users", daily=True)
 def tutor_get_dashboard():
     current_user: User = getattr(request, "db_user", None)
     if not current_user or current_user.role != "tutor":
         return jsonify({"error": "Forbidden"}), 403
 
-    sessions = (
-        Session.query.options(joinedload(Session.student_user))
-        .filter(Session.tutor_id == current_user.id, Session.status == "booked")
-        .all()
-    )
-
-    session_ids = [s.id for s in sessions]
+    metrics = dashboard_service.dashboard_metrics(tutor_id=current_user.id)
+    metrics.pop("weekly_ratings")
 
-    feedbacks = (
-        Feedback.query.filter(Feedback.session_id.in_(session_ids)).all()
-        if session_ids
-        else []
-    )
-    feedback_map = {f.session_id: f for f in feedbacks}
-    notes = (
-        SessionNote.query.filter(SessionNote.session_id.in_(session_ids)).all()
-        if session_ids
-        else []
-    )
-    notes_map = {n.session_id: n for n in notes}
-
-    total_sessions = len(sessions)
-
-    total_hours = 0
-    for session in sessions:
-        if session.start_time and session.end_time:
-            duration = (session.end_time - session.start_time).total_seconds() / 3600
-            total_hours += duration
-
-    unique_students = set()
-    for session in sessions:
-        if session.student_id:
-            unique_students.add(session.student_id)
-    active_students = len(unique_students)
-
-    ratings = []
-    for session in sessions:
-        feedback = feedback_map.get(session.id)
-        if feedback and feedback.rating:
-            ratings.append(feedback.rating)
-
-    avg_rating = round(sum(ratings) / len(ratings), 1) if ratings else None
-
-    def get_week_number(date):
-        return date.isocalendar()[1]
-
-    def get_week_start_date(date):
-        """Get the first day (Monday) of the week for a given date"""
-        days_since_monday = date.weekday()
-        return date - timedelta(days=days_since_monday)
-
-    now = datetime.utcnow()
-
-    weekly_data = []
-    for i in range(5, -1, -1):
-        week_date = now - timedelta(days=i * 7)
-        week_num = get_week_number(week_date)
-        week_start = get_week_start_date(week_date)
-
-        week_sessions = [
-            s
-            for s in sessions
-            if s.start_time and get_week_number(s.start_time) == week_num
-        ]
-        week_hours = sum(
-            [
-                (s.end_time - s.start_time).total_seconds() / 3600
-                for s in week_sessions
-                if s.start_time and s.end_time
-            ]
-        )
-
-        weekly_data.append(
-            {
-                "week": week_start.strftime("%m/%d/%Y"),
-                "sessions": len(week_sessions),
-                "hours": round(week_hours, 1),
-            }
-        )
-
-    monthly_attendance = []
-    for i in range(5, -1, -1):
-        month_date = datetime(now.year, now.month, 1) - timedelta(days=i * 30)
-        month = month_date.month
-        year = month_date.year
-        month_label = month_date.strftime("%b")
-
-        month_sessions = [
-            s
-            for s in sessions
-            if s.start_time
-            and s.start_time.month == month
-            and s.start_time.year == year
-        ]
-
-        if len(month_sessions) == 0:
-            attendance_rate = 0
-        else:
-            attended = 0
-            for s in month_sessions:
-                note = notes_map.get(s.id)
-                if note and note.attendance_status in ["present", "attended"]:
-                    attended += 1
-            attendance_rate = round((attended / len(month_sessions)) * 100)
-
-        monthly_attendance.append({"month": month_label, "rate": attendance_rate})
-
-    course_distribution = {}
-    for session in sessions:
-        if session.course:
-            course_distribution[session.course] = (
-                course_distribution.get(session.course, 0) + 1
-            )
-
-    student_counts = {}
-    for session in sessions:
-        if session.student_user and session.student_user.name:
-            name = session.student_user.name
-            student_counts[name] = student_counts.get(name, 0) + 1
-
-    top_students = [
-        {"name": name, "count": count}
-        for name, count in sorted(
-            student_counts.items(), key=lambda x: x[1], reverse=True
-        )[:5]
-    ]
-
-    return jsonify(
-        {
-            "success": True,
-            "stats": {
-                "total_sessions": total_sessions,
-                "total_hours": round(total_hours, 1),
-                "active_students": active_students,
-                "avg_rating": avg_rating,
-            },
-            "weekly_data": weekly_data,
-            "monthly_attendance": monthly_attendance,
-            "course_distribution": course_distribution,
-            "top_students": top_students,
-        }
-    )
+    return jsonify({"success": True, **metrics})
@@ -0,0 +1,59 @@
+from flask import Blueprint, current_app, jsonify, request
+from services.clerk_sync import apply_user_event
+from services.tasks import task_runner
+import base64
+import hashlib
+import hmac
+import time
+
+webhooks_bp = Blueprint("webhooks", __name__)
+
+SIGNATURE_TOLERANCE_SECONDS = 300
+
+
+class WebhookVerificationError(Exception):
+    pass
+
+
+def verify_webhook_signature(secret, headers, body):
+    """Check a Svix-style signature (Clerk webhooks) over the raw request body."""
+    msg_id = headers.get("svix-id")
+    timestamp = headers.get("svix-timestamp")
+    signatures = headers.get("svix-signature")
+    if not msg_id or not timestamp or not signatures:
+        raise WebhookVerificationError("Missing signature headers")
+
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        raise WebhookVerificationError("Invalid timestamp")
+    if abs(time.time() - sent_at) > SIGNATURE_TOLERANCE_SECONDS:
+        raise WebhookVerificationError("Timestamp outside tolerance")
+
+    key = base64.b64decode(secret[len("whsec_"):] if secret.startswith("whsec_") else secret)
+    signed = f"{msg_id}.{timestamp}.".encode() + body
+    expected = base64.b64encode(hmac.new(key, signed, hashlib.sha256).digest()).decode()
+
+    for part in signatures.split():
+        version, _, signature = part.partition(",")
+        if version == "v1" and hmac.compare_digest(signature, expected):
+            return
+    raise WebhookVerificationError("No matching signature")
+
+
+@webhooks_bp.route("/api/webhooks/clerk", methods=["POST"])
+def clerk_webhook():
+    secret = current_app.config.get("CLERK_WEBHOOK_SECRET")
+    if not secret:
+        return jsonify({"error": "Webhook secret not configured"}), 503
+
+    body = request.get_data()
+    try:
+        verify_webhook_signature(secret, request.headers, body)
+    except WebhookVerificationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    event = request.get_json(silent=True) or {}
+    task_runner.submit(apply_user_event, event)
+
+    return jsonify({"success": True}), 202
@@ -0,0 +1,230 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import select, text, update
+from sqlalchemy.orm.util import identity_key
+from models import db, Session, User
+from services import tutor_stats, change_tracking, dashboard_rollups, outbox
+from services.email_service import booking_confirmation_email, tutor_notification_email
+
+# First key of pg_advisory_xact_lock(namespace, tutor_id), so booking locks
+# cannot collide with advisory locks taken elsewhere.
+ADVISORY_LOCK_NAMESPACE = 7001
+LOCK_STRIPES = 64
+
+_process_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+
+# Fields a PUT /api/sessions/<id> may set, in the order they are checked.
+UPDATABLE_FIELDS = ("tutor_id", "student_id", "course", "session_type", "start_time", "end_time", "status")
+
+
+class BookingConflict(Exception):
+    pass
+
+
+class InvalidBooking(ValueError):
+    """A booking or session update to reject with HTTP `status`."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+@contextmanager
+def tutor_lock(tutor_id):
+    """Serialize bookings for `tutor_id` until the enclosing transaction ends.
+
+    PostgreSQL takes a transaction-scoped advisory lock. SQLite has no row
+    locks: a striped per-process lock orders this process's bookers, and the
+    transaction is opened with a write so SQLite's database-wide write lock
+    covers bookers in other processes. Elsewhere the tutor's users row is
+    locked FOR UPDATE. Commit or roll back before leaving the block."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.session.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, :tutor_id)"),
+            {"namespace": ADVISORY_LOCK_NAMESPACE, "tutor_id": tutor_id},
+        )
+        yield
+    elif dialect == "sqlite":
+        with _process_locks[tutor_id % LOCK_STRIPES]:
+            users = User.__table__
+            db.session.execute(update(users).where(users.c.id == tutor_id).values(id=users.c.id))
+            yield
+    else:
+        db.session.query(User.id).filter(User.id == tutor_id).with_for_update().one_or_none()
+        yield
+
+
+def book_slot(student_id, tutor_id, start_time, end_time, course=None, session_type=None, on_booked=None):
+    """Insert a booked session unless the tutor already has one overlapping it.
+
+    The overlap check and the insert run under `tutor_lock`, so of two racing
+    bookers exactly one wins. `on_booked` is called with the flushed session
+    before the commit, for rows that must commit with it such as queued
+    emails. Commits and returns the new Session; otherwise rolls back and
+    raises BookingConflict."""
+    with tutor_lock(tutor_id):
+        try:
+            overlap = (
+                db.session.query(Session.id)
+                .filter(
+                    Session.tutor_id == tutor_id,
+                    Session.start_time < end_time,
+                    Session.end_time > start_time,
+                )
+                .first()
+            )
+            if overlap:
+                raise BookingConflict("Tutor already has a session at this time")
+
+            session = Session(
+                tutor_id=tutor_id,
+                student_id=student_id,
+                course=course,
+                session_type=session_type,
+                start_time=start_time,
+                end_time=end_time,
+                status="booked",
+            )
+            db.session.add(session)
+            tutor_stats.record_booking(tutor_id)
+            # Written after the commit, so bookings for different tutors never queue on a counter row.
+            change_tracking.bump_after_commit(change_tracking.student_key(student_id), change_tracking.BOOKINGS)
+            if on_booked:
+                db.session.flush()
+                on_booked(session)
+            db.session.commit()
+        except BaseException:
+            db.session.rollback()
+            raise
+    return session
+
+
+def claim_slot(session_id, student_id):
+    """Move an available session to booked for `student_id` in one statement.
+
+    The UPDATE only matches while `status = 'available'`, so of any number of
+    concurrent claims exactly one wins and the rest raise BookingConflict, with
+    no lock or retry. Returns the tutor's user id. Does not commit."""
+    sessions = Session.__table__
+    claim = (
+        update(sessions)
+        .where(sessions.c.id == session_id, sessions.c.status == "available")
+        .values(status="booked", student_id=student_id, updated_at=datetime.utcnow())
+    )
+    if db.session.get_bind().dialect.update_returning:
+        row = db.session.execute(claim.returning(sessions.c.tutor_id, sessions.c.start_time)).first()
+    elif db.session.execute(claim).rowcount == 1:
+        row = db.session.execute(
+            select(sessions.c.tutor_id, sessions.c.start_time).where(sessions.c.id == session_id)
+        ).first()
+    else:
+        row = None
+    if row is None:
+        raise BookingConflict("Session is no longer available")
+
+    # The UPDATE bypassed the ORM: refresh any loaded copy and do the flush-time bookkeeping here.
+    loaded = db.session.identity_map.get(identity_key(Session, session_id))
+    if loaded is not None:
+        db.session.expire(loaded, ["status", "student_id", "updated_at"])
+    tutor_id, start_time = row
+    tutor_stats.record_booking(tutor_id)
+    change_tracking.bump_after_commit(
+        change_tracking.student_key(student_id) if student_id else None,
+        change_tracking.BOOKINGS,
+        change_tracking.table_key("sessions"),
+    )
+    dashboard_rollups.refresh(
+        db.session.connection(),
+        day_keys=[(tutor_id, start_time.date())],
+        student_keys=[(student_id, tutor_id)] if student_id else [],
+    )
+    return tutor_id
+
+
+def booking_window(availability, start_time_str, end_time_str):
+    """(start_time, end_time) parsed from ISO strings and checked against `availability`.
+
+    Recurring availability is compared by time of day only. Raises InvalidBooking."""
+    try:
+        start_time = datetime.fromisoformat(start_time_str)
+        end_time = datetime.fromisoformat(end_time_str)
+    except ValueError:
+        raise InvalidBooking("Invalid datetime format")
+
+    if end_time <= start_time:
+        raise InvalidBooking("end_time must be after start_time")
+
+    if availability.is_recurring:
+        inside = availability.start_time.time() <= start_time.time() and end_time.time() <= availability.end_time.time()
+    else:
+        inside = availability.start_time <= start_time and end_time <= availability.end_time
+    if not inside:
+        raise InvalidBooking("Requested time outside availability window", 409)
+    return start_time, end_time
+
+
+def queue_booking_emails(student, tutor_user, session):
+    """Queue the student's confirmation and the tutor's notice for `session`.
+
+    Called inside the booking transaction; the outbox workers send them. A
+    failure is logged and does not undo the booking."""
+    session_data = session.to_dict()
+    try:
+        outbox.enqueue("booking_confirmation", booking_confirmation_email(
+            student_email=student.email,
+            student_name=student.name,
+            tutor_name=tutor_user.name if tutor_user else "Tutor",
+            session_data=session_data,
+        ))
+
+        if tutor_user:
+            outbox.enqueue("tutor_notification", tutor_notification_email(
+                tutor_email=tutor_user.email,
+                tutor_name=tutor_user.name,
+                student_name=student.name,
+                session_data=session_data,
+            ))
+    except Exception as e:
+        print(f"Error queueing booking emails: {e}")
+
+
+def _session_changes(data):
+    """The UPDATABLE_FIELDS in `data`, validated and with times parsed."""
+    changes = {field: data[field] for field in UPDATABLE_FIELDS if field in data}
+    if "tutor_id" in changes and not db.session.get(User, changes["tutor_id"]):
+        raise InvalidBooking("Tutor not found", 404)
+    if changes.get("student_id") and not db.session.get(User, changes["student_id"]):
+        raise InvalidBooking("Student not found", 404)
+    for field in ("start_time", "end_time"):
+        if field in changes:
+            try:
+                changes[field] = datetime.fromisoformat(changes[field])
+            except ValueError:
+                raise InvalidBooking(f"Invalid datetime format for {field}")
+    return changes
+
+
+def apply_session_update(session, data):
+    """Apply a session update request to `session` and record its bookkeeping.
+
+    Booking an open slot goes through `claim_slot`, like students booking it.
+    Does not commit; raises BookingConflict or InvalidBooking."""
+    previous_student_id = session.student_id
+    if data.get("status") == "booked" and session.status == "available":
+        claim_slot(session.id, data.get("student_id", session.student_id))
+    # Taken after the claim, which records its own booking.
+    stats_before = tutor_stats.session_totals(session)
+
+    for field, value in _session_changes(data).items():
+        setattr(session, field, value)
+
+    tutor_stats.record_session_change(stats_before, tutor_stats.session_totals(session))
+    change_tracking.bump_after_commit(
+        change_tracking.student_key(previous_student_id) if previous_student_id else None,
+        change_tracking.student_key(session.student_id) if session.student_id else None,
+        change_tracking.RATINGS,
+        change_tracking.BOOKINGS,
+    )
@@ -0,0 +1,100 @@
+from itertools import chain
+from models import db, insert_ignore, ChangeCounter
+from sqlalchemy import event, update
+
+RATINGS = "ratings"
+AVAILABILITY = "availability"
+TUTORS = "tutors"
+BOOKINGS = "bookings"
+
+
+# Tables whose committed ORM writes bump a `table:<name>` counter, for conditional GETs.
+TRACKED_TABLES = ("users", "tutors", "availabilities", "sessions", "session_notes", "feedbacks")
+
+
+def student_key(student_id):
+    return f"student:{student_id}"
+
+
+def table_key(table_name):
+    return f"table:{table_name}"
+
+
+_PENDING = "change_tracking.pending"
+
+
+def _bump_keys(keys, connection=None):
+    executor = connection if connection is not None else db.session
+    # Sorted, so transactions bumping overlapping keys lock the rows in the same order.
+    for key in sorted({k for k in keys if k}):
+        insert_ignore(ChangeCounter, {"key": key, "version": 0}, index_elements=["key"], connection=connection)
+        executor.execute(
+            update(ChangeCounter)
+            .where(ChangeCounter.key == key)
+            .values(version=ChangeCounter.version + 1)
+        )
+
+
+def bump(*keys):
+    """Increment the version of each key in the caller's transaction.
+
+    Request paths use `bump_after_commit`, which keeps the rows unlocked."""
+    _bump_keys(keys)
+
+
+def bump_after_commit(*keys):
+    """Increment the version of each key once the caller's transaction commits.
+
+    The counters are written in a short transaction of their own, so hot keys
+    are not held locked for the length of the caller's; nothing is bumped if
+    it rolls back."""
+    session = db.session()
+    if not session.in_transaction():
+        # Tie the keys to a transaction, so a rollback before any SQL still drops them.
+        session.begin()
+    _queue(session, keys)
+
+
+def _queue(session, keys):
+    session.info.setdefault(_PENDING, set()).update(k for k in keys if k)
+
+
+@event.listens_for(db.session, "after_commit")
+def _bump_pending(session):
+    if session.in_nested_transaction():
+        return
+    keys = session.info.pop(_PENDING, None)
+    if not keys:
+        return
+    try:
+        with session.get_bind().begin() as conn:
+            _bump_keys(keys, connection=conn)
+    except Exception as e:
+        # The data is committed; a missed bump only delays cache invalidation.
+        print(f"Error bumping change counters: {e}")
+
+
+@event.listens_for(db.session, "after_transaction_end")
+def _discard_pending(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+
+def versions(*keys):
+    """Current version per key, in argument order; unknown keys are 0."""
+    rows = dict(
+        db.session.query(ChangeCounter.key, ChangeCounter.version)
+        .filter(ChangeCounter.key.in_(keys))
+        .all()
+    )
+    return tuple(rows.get(key, 0) for key in keys)
+
+
+@event.listens_for(db.session, "after_flush")
+def _bump_tables(session, flush_context):
+    # Queued for after the commit: every write transaction would otherwise hold these rows to its end.
+    modified = (obj for obj in session.dirty if session.is_modified(obj, include_collections=False))
+    tables = {
+        getattr(obj, "__tablename__", None) for obj in chain(session.new, modified, session.deleted)
+    }
+    _queue(session, (table_key(name) for name in TRACKED_TABLES if name in tables))
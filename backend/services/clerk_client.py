@@ -0,0 +1,147 @@
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ClerkUnavailable(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures; after `reset_timeout`
+    seconds a single trial call is let through to probe the upstream."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class ClerkClient:
+    def __init__(
+        self,
+        base_url=None,
+        connect_timeout=None,
+        read_timeout=None,
+        retries=None,
+        backoff=None,
+        pool_size=None,
+        breaker=None,
+    ):
+        env = os.environ.get
+        self.base_url = (base_url or env("CLERK_API_URL", "https://api.clerk.dev/v1")).rstrip("/")
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else float(env("CLERK_CONNECT_TIMEOUT", "2")),
+            read_timeout if read_timeout is not None else float(env("CLERK_READ_TIMEOUT", "5")),
+        )
+        self.retries = retries if retries is not None else int(env("CLERK_RETRIES", "2"))
+        self.backoff = backoff if backoff is not None else float(env("CLERK_RETRY_BACKOFF", "0.1"))
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=int(env("CLERK_BREAKER_THRESHOLD", "5")),
+            reset_timeout=float(env("CLERK_BREAKER_RESET", "30")),
+        )
+
+        pool_size = pool_size if pool_size is not None else int(env("CLERK_POOL_SIZE", "10"))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _headers(self, secret_key):
+        return {
+            "Authorization": f"Bearer {secret_key or os.environ.get('CLERK_SECRET_KEY')}",
+            "Content-Type": "application/json",
+        }
+
+    def _request(self, method, path, secret_key=None, idempotent=True, **kwargs):
+        if not self.breaker.allow():
+            raise ClerkUnavailable("Clerk circuit breaker is open")
+
+        attempts = 1 + (self.retries if idempotent else 0)
+        error = None
+        for attempt in range(attempts):
+            if attempt:
+                # Full jitter keeps retrying workers from synchronising.
+                time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+            try:
+                resp = getattr(self.session, method)(
+                    f"{self.base_url}{path}",
+                    headers=self._headers(secret_key),
+                    timeout=self.timeout,
+                    **kwargs,
+                )
+            except requests.RequestException as e:
+                error = e
+                continue
+            if resp.status_code >= 500 or resp.status_code == 429:
+                error = ClerkUnavailable(f"Clerk responded {resp.status_code}")
+                continue
+            self.breaker.record_success()
+            return resp
+
+        self.breaker.record_failure()
+        raise ClerkUnavailable(str(error)) from error
+
+    def get_user(self, user_id, secret_key=None):
+        resp = self._request("get", f"/users/{user_id}", secret_key=secret_key)
+        if resp.status_code == 200:
+            return resp.json()
+        return None
+
+    def list_users(self, limit=100, offset=0, secret_key=None):
+        resp = self._request(
+            "get", "/users", secret_key=secret_key, params={"limit": limit, "offset": offset}
+        )
+        if resp.status_code == 200:
+            return resp.json()
+        return []
+
+    def update_user_metadata(self, user_id, metadata, secret_key=None):
+        resp = self._request(
+            "patch",
+            f"/users/{user_id}/metadata",
+            secret_key=secret_key,
+            # Re-applying the same public_metadata merge is harmless, so retry it.
+            idempotent=True,
+            json={"public_metadata": metadata},
+        )
+        return resp.status_code == 200
+
+
+clerk_client = ClerkClient()
@@ -0,0 +1,68 @@
+from models import db, User, Tutor
+from auth import clerk_user_cache, _extract_email, _extract_display_name
+from services.clerk_client import clerk_client
+from services import change_tracking
+
+USER_EVENTS = ("user.created", "user.updated")
+
+
+def apply_role(user, role):
+    """Set `user.role` from Clerk metadata, creating the Tutor profile if needed.
+
+    Returns True when something changed. Does not commit."""
+    if not role or role == user.role:
+        return False
+    user.role = role
+    if role == "tutor" and not Tutor.query.filter_by(user_id=user.id).first():
+        db.session.add(Tutor(user_id=user.id))
+    change_tracking.bump_after_commit(change_tracking.TUTORS)
+    return True
+
+
+def apply_user_event(event):
+    """Apply a Clerk webhook event; returns True when a role changed.
+
+    Other event types and unchanged roles are ignored. Raises ValueError for a
+    user event without a user id."""
+    if event.get("type") not in USER_EVENTS:
+        return False
+    data = event.get("data") or {}
+    clerk_user_id = data.get("id")
+    if not clerk_user_id:
+        raise ValueError(f"{event['type']} event without a user id")
+
+    clerk_user_cache.set(clerk_user_id, data)
+
+    user = User.query.filter_by(clerk_user_id=clerk_user_id).first()
+    if not user:
+        email = _extract_email(data)
+        user = User.get_or_create_from_clerk(
+            clerk_user_id, _extract_display_name(data, email), email
+        )
+    role = (data.get("public_metadata") or {}).get("role")
+    if apply_role(user, role):
+        db.session.commit()
+        return True
+    return False
+
+
+def reconcile_roles(page_size=100):
+    """Page through every Clerk user and sync roles that drifted; returns the count."""
+    changed = 0
+    offset = 0
+    while True:
+        page = clerk_client.list_users(limit=page_size, offset=offset)
+        roles = {
+            u["id"]: (u.get("public_metadata") or {}).get("role")
+            for u in page
+            if u.get("id")
+        }
+        if roles:
+            users = User.query.filter(User.clerk_user_id.in_(list(roles))).all()
+            for user in users:
+                if apply_role(user, roles[user.clerk_user_id]):
+                    changed += 1
+            db.session.commit()
+        if len(page) < page_size:
+            return changed
+        offset += page_size
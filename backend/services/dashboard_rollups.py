@@ -0,0 +1,185 @@
+from datetime import date, datetime, time, timedelta
+from itertools import chain
+from sqlalchemy import Integer, case, cast, delete, event, func, inspect, insert, select
+from models import db, upsert, Session, SessionNote, Feedback, DailySessionRollup, StudentSessionRollup
+
+ATTENDED_STATUSES = ("present", "attended")
+BACKFILL_BATCH_SIZE = 1000
+
+# Columns whose changes can move a session between rollup rows.
+_TRACKED = {
+    Session: ("tutor_id", "student_id", "course", "status", "start_time", "end_time"),
+    SessionNote: ("session_id", "attendance_status"),
+    Feedback: ("session_id", "rating"),
+}
+_PENDING = "dashboard_rollup_keys"
+
+
+def duration_seconds(dialect_name):
+    if dialect_name == "sqlite":
+        seconds = lambda col: cast(func.strftime("%s", col), Integer)  # noqa: E731
+        return seconds(Session.end_time) - seconds(Session.start_time)
+    return func.extract("epoch", Session.end_time - Session.start_time)
+
+
+def latest_row_id(model):
+    """Id of the newest `model` row per session; older duplicates are ignored."""
+    return (
+        select(func.max(model.id))
+        .where(model.session_id == Session.id)
+        .correlate(Session)
+        .scalar_subquery()
+    )
+
+
+def as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def daily_rows(conn, *filters):
+    """Booked-session aggregates per (day, tutor, course), as rollup rows."""
+    day = func.date(Session.start_time)
+    course = func.coalesce(Session.course, "")
+    rating = case((Feedback.rating > 0, Feedback.rating))
+    attended = case((SessionNote.attendance_status.in_(ATTENDED_STATUSES), 1), else_=0)
+    stmt = (
+        select(
+            day,
+            Session.tutor_id,
+            course,
+            func.count(Session.id),
+            func.sum(duration_seconds(conn.dialect.name)),
+            func.sum(attended),
+            func.sum(rating),
+            func.count(rating),
+            func.min(Session.id),
+        )
+        .select_from(Session)
+        .outerjoin(Feedback, Feedback.id == latest_row_id(Feedback))
+        .outerjoin(SessionNote, SessionNote.id == latest_row_id(SessionNote))
+        .where(Session.status == "booked", *filters)
+        .group_by(day, Session.tutor_id, course)
+    )
+    for row in conn.execute(stmt):
+        day_value, tutor_id, course_value, sessions, seconds, attended_count, rating_sum, rating_count, first_id = row
+        day_value = as_date(day_value)
+        yield {
+            "day": day_value,
+            "tutor_id": tutor_id,
+            "course": course_value,
+            "iso_week": day_value.isocalendar()[1],
+            "session_count": sessions,
+            "booked_seconds": float(seconds or 0),
+            "attended_count": int(attended_count or 0),
+            "rating_sum": float(rating_sum or 0),
+            "rating_count": rating_count,
+            "first_session_id": first_id,
+        }
+
+
+def student_rows(conn, *filters):
+    """Booked-session counts per (student, tutor, course), as rollup rows."""
+    course = func.coalesce(Session.course, "")
+    stmt = (
+        select(Session.student_id, Session.tutor_id, course, func.count(Session.id), func.min(Session.id))
+        .where(Session.status == "booked", Session.student_id.isnot(None), *filters)
+        .group_by(Session.student_id, Session.tutor_id, course)
+    )
+    for student_id, tutor_id, course_value, sessions, first_id in conn.execute(stmt):
+        yield {
+            "student_id": student_id,
+            "tutor_id": tutor_id,
+            "course": course_value,
+            "session_count": sessions,
+            "first_session_id": first_id,
+        }
+
+
+def refresh(conn, day_keys=(), student_keys=()):
+    """Recompute the rollup rows for (tutor_id, day) and (student_id, tutor_id) keys.
+
+    Current rows are upserted and only courses that no longer have sessions are
+    deleted, so concurrent refreshes of the same key never collide on insert."""
+    for tutor_id, day in day_keys:
+        start = datetime.combine(day, time.min)
+        rows = list(daily_rows(
+            conn,
+            Session.tutor_id == tutor_id,
+            Session.start_time >= start,
+            Session.start_time < start + timedelta(days=1),
+        ))
+        conn.execute(
+            delete(DailySessionRollup).where(
+                DailySessionRollup.tutor_id == tutor_id,
+                DailySessionRollup.day == day,
+                DailySessionRollup.course.notin_([row["course"] for row in rows]),
+            )
+        )
+        upsert(DailySessionRollup, rows, ["day", "tutor_id", "course"], connection=conn)
+
+    for student_id, tutor_id in student_keys:
+        rows = list(student_rows(conn, Session.student_id == student_id, Session.tutor_id == tutor_id))
+        conn.execute(
+            delete(StudentSessionRollup).where(
+                StudentSessionRollup.student_id == student_id,
+                StudentSessionRollup.tutor_id == tutor_id,
+                StudentSessionRollup.course.notin_([row["course"] for row in rows]),
+            )
+        )
+        upsert(StudentSessionRollup, rows, ["student_id", "tutor_id", "course"], connection=conn)
+
+
+def rebuild_dashboard_rollups():
+    """Rebuild both rollup tables from sessions, notes and feedback and commit.
+
+    Returns the number of daily and student rows written."""
+    conn = db.session.connection()
+    conn.execute(delete(DailySessionRollup))
+    conn.execute(delete(StudentSessionRollup))
+    counts = []
+    for model, rows in ((DailySessionRollup, daily_rows(conn)), (StudentSessionRollup, student_rows(conn))):
+        # Materialise first: SQLite cannot insert while the source cursor is open.
+        rows = list(rows)
+        for i in range(0, len(rows), BACKFILL_BATCH_SIZE):
+            conn.execute(insert(model), rows[i:i + BACKFILL_BATCH_SIZE])
+        counts.append(len(rows))
+    db.session.commit()
+    return tuple(counts)
+
+
+def _values(obj, attr):
+    """Current and, for pending changes, previous values of `attr`."""
+    history = inspect(obj).attrs[attr].history
+    return {value for value in chain([getattr(obj, attr)], history.deleted) if value is not None}
+
+
+def _changed(obj, attrs):
+    state = inspect(obj)
+    return any(state.attrs[attr].history.has_changes() for attr in attrs)
+
+
+# The listeners run whether or not DASHBOARD_USE_ROLLUPS is set, so the tables
+# are already current when the flag is turned on; no backfill is needed then.
+@event.listens_for(db.session, "before_flush")
+def _collect_keys(session, flush_context, instances):
+    day_keys, student_keys = session.info.setdefault(_PENDING, (set(), set()))
+    dirty = (obj for obj in session.dirty if type(obj) in _TRACKED and _changed(obj, _TRACKED[type(obj)]))
+    for obj in chain(session.new, dirty, session.deleted):
+        if isinstance(obj, Session):
+            tutors, starts = _values(obj, "tutor_id"), _values(obj, "start_time")
+            day_keys.update((t, s.date()) for t in tutors for s in starts)
+            student_keys.update((s, t) for s in _values(obj, "student_id") for t in tutors)
+        elif isinstance(obj, (SessionNote, Feedback)):
+            targets = {session.get(Session, sid) for sid in _values(obj, "session_id")}
+            targets.add(obj.session)
+            for target in targets - {None}:
+                day_keys.update(
+                    (t, s.date()) for t in _values(target, "tutor_id") for s in _values(target, "start_time")
+                )
+
+
+@event.listens_for(db.session, "after_flush")
+def _apply_keys(session, flush_context):
+    day_keys, student_keys = session.info.pop(_PENDING, (set(), set()))
+    if day_keys or student_keys:
+        refresh(session.connection(), day_keys, student_keys)
@@ -0,0 +1,292 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from models import db, Session, SessionNote, Feedback, User, DailySessionRollup, StudentSessionRollup
+from sqlalchemy import case, func
+from services.dashboard_rollups import ATTENDED_STATUSES, as_date, duration_seconds, latest_row_id
+
+TOP_STUDENTS = 5
+WEEKS = 6
+MONTHS = 6
+
+
+def _booked_filters(course=None, tutor_id=None):
+    filters = [Session.status == "booked"]
+    if course:
+        filters.append(Session.course == course)
+    if tutor_id is not None:
+        filters.append(Session.tutor_id == tutor_id)
+    return filters
+
+
+def _rollup_filters(model, course=None, tutor_id=None):
+    filters = []
+    if course:
+        filters.append(model.course == course)
+    if tutor_id is not None:
+        filters.append(model.tutor_id == tutor_id)
+    return filters
+
+
+def daily_totals(course=None, tutor_id=None):
+    """Per-day session count, seconds booked, rating sum/count and attended count."""
+    day = func.date(Session.start_time)
+    rating = case((Feedback.rating > 0, Feedback.rating))
+    attended = case((SessionNote.attendance_status.in_(ATTENDED_STATUSES), 1), else_=0)
+    rows = (
+        db.session.query(
+            day,
+            func.count(Session.id),
+            func.sum(duration_seconds(db.session.get_bind().dialect.name)),
+            func.sum(rating),
+            func.count(rating),
+            func.sum(attended),
+        )
+        .select_from(Session)
+        .outerjoin(Feedback, Feedback.id == latest_row_id(Feedback))
+        .outerjoin(SessionNote, SessionNote.id == latest_row_id(SessionNote))
+        .filter(*_booked_filters(course, tutor_id))
+        .group_by(day)
+    )
+    return [
+        {
+            "day": as_date(day_value),
+            "sessions": sessions,
+            "seconds": float(seconds or 0),
+            "rating_sum": float(rating_sum or 0),
+            "rating_count": rating_count,
+            "attended": int(attended_count or 0),
+        }
+        for day_value, sessions, seconds, rating_sum, rating_count, attended_count in rows
+    ]
+
+
+def _average(rating_sum, rating_count):
+    return round(rating_sum / rating_count, 1) if rating_count else None
+
+
+def _hours(seconds, sessions):
+    # An empty bucket stays the integer 0 the dashboards have always returned.
+    return round(seconds / 3600, 1) if sessions else 0
+
+
+def _week_start(value):
+    return value - timedelta(days=value.weekday())
+
+
+def _by_week(days):
+    weeks = {}
+    for d in days:
+        week = weeks.setdefault(
+            d["day"].isocalendar()[1], {"sessions": 0, "seconds": 0.0, "rating_sum": 0.0, "rating_count": 0}
+        )
+        for field in week:
+            week[field] += d[field]
+    return weeks
+
+
+def _week_dates(now):
+    return [now - timedelta(days=i * 7) for i in range(WEEKS - 1, -1, -1)]
+
+
+def weekly_buckets(weeks, now):
+    """Six weekly rows ending at `now` from totals keyed by ISO week number."""
+    data, ratings = [], []
+    empty = {"sessions": 0, "seconds": 0.0, "rating_sum": 0.0, "rating_count": 0}
+    for week_date in _week_dates(now):
+        label = _week_start(week_date).strftime("%m/%d/%Y")
+        week = weeks.get(week_date.isocalendar()[1], empty)
+        data.append({
+            "week": label,
+            "sessions": week["sessions"],
+            "hours": _hours(week["seconds"], week["sessions"]),
+        })
+        ratings.append({"week": label, "rating": _average(week["rating_sum"], week["rating_count"])})
+    return data, ratings
+
+
+def _month_dates(now):
+    return [datetime(now.year, now.month, 1) - timedelta(days=i * 30) for i in range(MONTHS - 1, -1, -1)]
+
+
+def monthly_attendance(days, now):
+    result = []
+    for month_date in _month_dates(now):
+        month = [d for d in days if (d["day"].year, d["day"].month) == (month_date.year, month_date.month)]
+        sessions = sum(d["sessions"] for d in month)
+        rate = round(sum(d["attended"] for d in month) / sessions * 100) if sessions else 0
+        result.append({"month": month_date.strftime("%b"), "rate": rate})
+    return result
+
+
+def course_distribution(course=None, tutor_id=None):
+    rows = (
+        db.session.query(Session.course, func.count(Session.id))
+        .filter(*_booked_filters(course, tutor_id), Session.course.isnot(None), Session.course != "")
+        .group_by(Session.course)
+    )
+    return {name: count for name, count in rows}
+
+
+def top_students(course=None, tutor_id=None, limit=TOP_STUDENTS):
+    count = func.count(Session.id)
+    rows = (
+        db.session.query(User.name, count)
+        .join(User, User.id == Session.student_id)
+        .filter(*_booked_filters(course, tutor_id), User.name.isnot(None), User.name != "")
+        .group_by(User.name)
+        .order_by(count.desc(), func.min(Session.id))
+        .limit(limit)
+    )
+    return [{"name": name, "count": n} for name, n in rows]
+
+
+def active_students(course=None, tutor_id=None):
+    return (
+        db.session.query(func.count(func.distinct(Session.student_id)))
+        .filter(*_booked_filters(course, tutor_id))
+        .scalar()
+    )
+
+
+def _filter_lists(classes, tutors):
+    return {
+        "classes": sorted(course for course, in classes),
+        "tutors": [
+            {"id": tid, "name": name}
+            for tid, name in sorted(tutors, key=lambda row: row[1] or "")
+        ],
+    }
+
+
+def dashboard_filters():
+    """Classes and tutors that have booked sessions, for the professor filter menus."""
+    if current_app.config.get("DASHBOARD_USE_ROLLUPS"):
+        return rollup_filters()
+    classes = (
+        db.session.query(Session.course)
+        .filter(Session.status == "booked", Session.course.isnot(None), Session.course != "")
+        .distinct()
+    )
+    tutors = (
+        db.session.query(User.id, User.name)
+        .join(Session, Session.tutor_id == User.id)
+        .filter(Session.status == "booked")
+        .group_by(User.id, User.name)
+        .order_by(func.min(Session.id))
+    )
+    return _filter_lists(classes, tutors)
+
+
+def dashboard_metrics(course=None, tutor_id=None, now=None):
+    """Dashboard stats for booked sessions, computed with grouped SQL aggregates."""
+    now = now or datetime.utcnow()
+    if current_app.config.get("DASHBOARD_USE_ROLLUPS"):
+        return rollup_metrics(course, tutor_id, now)
+    days = daily_totals(course, tutor_id)
+    weekly_data, weekly_ratings = weekly_buckets(_by_week(days), now)
+    sessions = sum(d["sessions"] for d in days)
+    return {
+        "stats": {
+            "total_sessions": sessions,
+            "total_hours": _hours(sum(d["seconds"] for d in days), sessions),
+            "active_students": active_students(course, tutor_id),
+            "avg_rating": _average(sum(d["rating_sum"] for d in days), sum(d["rating_count"] for d in days)),
+        },
+        "weekly_data": weekly_data,
+        "weekly_ratings": weekly_ratings,
+        "monthly_attendance": monthly_attendance(days, now),
+        "course_distribution": course_distribution(course, tutor_id),
+        "top_students": top_students(course, tutor_id),
+    }
+
+
+def rollup_metrics(course=None, tutor_id=None, now=None):
+    """`dashboard_metrics` read from the rollup tables.
+
+    Apart from the all-time totals, which the database sums, this reads one
+    row per week and per day of the monthly window, so the cost does not grow
+    with the length of the session history."""
+    now = now or datetime.utcnow()
+    r = DailySessionRollup
+    filters = _rollup_filters(r, course, tutor_id)
+
+    sessions, seconds, rating_sum, rating_count = (
+        db.session.query(
+            func.coalesce(func.sum(r.session_count), 0),
+            func.coalesce(func.sum(r.booked_seconds), 0),
+            func.coalesce(func.sum(r.rating_sum), 0),
+            func.coalesce(func.sum(r.rating_count), 0),
+        )
+        .filter(*filters)
+        .one()
+    )
+
+    week_numbers = {week_date.isocalendar()[1] for week_date in _week_dates(now)}
+    weeks = {
+        iso_week: {"sessions": n, "seconds": float(s), "rating_sum": float(rs), "rating_count": rc}
+        for iso_week, n, s, rs, rc in db.session.query(
+            r.iso_week, func.sum(r.session_count), func.sum(r.booked_seconds),
+            func.sum(r.rating_sum), func.sum(r.rating_count),
+        )
+        .filter(*filters, r.iso_week.in_(week_numbers))
+        .group_by(r.iso_week)
+    }
+    weekly_data, weekly_ratings = weekly_buckets(weeks, now)
+
+    months = _month_dates(now)
+    # The month dates are 30-day steps back, so the oldest can fall mid-month.
+    month_start = months[0].replace(day=1)
+    month_end = (months[-1] + timedelta(days=32)).replace(day=1)
+    days = [
+        {"day": as_date(day), "sessions": n, "attended": int(attended)}
+        for day, n, attended in db.session.query(r.day, func.sum(r.session_count), func.sum(r.attended_count))
+        .filter(*filters, r.day >= month_start.date(), r.day < month_end.date())
+        .group_by(r.day)
+    ]
+
+    distribution = {
+        name: int(count)
+        for name, count in db.session.query(r.course, func.sum(r.session_count))
+        .filter(*filters, r.course != "")
+        .group_by(r.course)
+    }
+
+    s = StudentSessionRollup
+    student_filters = _rollup_filters(s, course, tutor_id)
+    count = func.sum(s.session_count)
+    students = (
+        db.session.query(User.name, count)
+        .join(User, User.id == s.student_id)
+        .filter(*student_filters, User.name.isnot(None), User.name != "")
+        .group_by(User.name)
+        .order_by(count.desc(), func.min(s.first_session_id))
+        .limit(TOP_STUDENTS)
+    )
+
+    return {
+        "stats": {
+            "total_sessions": int(sessions),
+            "total_hours": _hours(float(seconds), sessions),
+            "active_students": db.session.query(func.count(func.distinct(s.student_id)))
+            .filter(*student_filters)
+            .scalar(),
+            "avg_rating": _average(float(rating_sum), rating_count),
+        },
+        "weekly_data": weekly_data,
+        "weekly_ratings": weekly_ratings,
+        "monthly_attendance": monthly_attendance(days, now),
+        "course_distribution": distribution,
+        "top_students": [{"name": name, "count": int(n)} for name, n in students],
+    }
+
+
+def rollup_filters():
+    r = DailySessionRollup
+    classes = db.session.query(r.course).filter(r.course != "").distinct()
+    tutors = (
+        db.session.query(User.id, User.name)
+        .join(r, r.tutor_id == User.id)
+        .group_by(User.id, User.name)
+        .order_by(func.min(r.first_session_id))
+    )
+    return _filter_lists(classes, tutors)
@@ -5,6 +5,7 @@ from icalendar import Calendar, Event
 from flask import current_app
 import base64
 
+
 def format_session_type(session_type):
     if session_type == 'in-person':
         return 'In-Person'
@@ -12,42 +13,38 @@ def format_session_type(session_type):
         return 'Online'
     return session_type.title() if session_type else 'Online'
 
+
 def generate_ics_event(session_data, tutor_name, student_name):
     cal = Calendar()
     cal.add('prodid', '-//Chinese Tutoring System//EN')
     cal.add('version', '2.0')
     cal.add('method', 'REQUEST')
-    
+
     session_type_display = format_session_type(session_data.get('session_type', 'online'))
-    
+
     event = Event()
     event.add('summary', f'Tutoring Session - {session_data.get("course", "Chinese")}')
     event.add('dtstart', datetime.fromisoformat(session_data['start_time'].replace('Z', '+00:00')) if isinstance(session_data['start_time'], str) else session_data['start_time'])
     event.add('dtend', datetime.fromisoformat(session_data['end_time'].replace('Z', '+00:00')) if isinstance(session_data['end_time'], str) else session_data['end_time'])
     event.add('description', f'Chinese tutoring session with {tutor_name}\nStudent: {student_name}\nType: {session_type_display}')
     event.add('uid', f'session-{session_data["id"]}@chinesetutoring.com')
-    
+
     cal.add_component(event)
     return cal.to_ical()
 
-def send_booking_confirmation(student_email, student_name, tutor_name, session_data):
-    api_key = current_app.config.get('RESEND_API_KEY')
+
+def booking_confirmation_email(student_email, student_name, tutor_name, session_data):
+    """Resend params for the student's booking confirmation, with a calendar invite."""
     from_email = current_app.config.get('RESEND_FROM_EMAIL')
-    
-    if not api_key:
-        print("Resend API key not configured, skipping email")
-        return False
-    
-    resend.api_key = api_key
-    
+
     start_time = session_data['start_time']
     if isinstance(start_time, str):
         start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-    
+
     formatted_date = start_time.strftime('%B %d, %Y')
     formatted_time = start_time.strftime('%I:%M %p')
     session_type_display = format_session_type(session_data.get('session_type', 'online'))
-    
+
     html_content = f"""
     <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
         <h2 style="color: #2563eb;">Session Booked Successfully!</h2>
@@ -64,50 +61,37 @@ def send_booking_confirmation(student_email, student_name, tutor_name, session_d
         <p>Best regards,<br>Chinese Tutoring System</p>
     </div>
     """
-    
+
     ics_content = generate_ics_event(session_data, tutor_name, student_name)
     encoded_ics = base64.b64encode(ics_content).decode()
-    
-    try:
-        params = {
-            "from": from_email,
-            "to": [student_email],
-            "subject": f'Session Confirmed - {formatted_date} at {formatted_time}',
-            "html": html_content,
-            "attachments": [
-                {
-                    "filename": "session.ics",
-                    "content": encoded_ics,
-                    "content_type": "text/calendar"
-                }
-            ]
-        }
-        
-        response = resend.Emails.send(params)
-        print(f"Booking confirmation sent to {student_email}, id: {response.get('id')}")
-        return True
-    except Exception as e:
-        print(f"Error sending booking confirmation: {e}")
-        return False
 
-def send_tutor_notification(tutor_email, tutor_name, student_name, session_data):
-    api_key = current_app.config.get('RESEND_API_KEY')
+    return {
+        "from": from_email,
+        "to": [student_email],
+        "subject": f'Session Confirmed - {formatted_date} at {formatted_time}',
+        "html": html_content,
+        "attachments": [
+            {
+                "filename": "session.ics",
+                "content": encoded_ics,
+                "content_type": "text/calendar"
+            }
+        ]
+    }
+
+
+def tutor_notification_email(tutor_email, tutor_name, student_name, session_data):
+    """Resend params telling the tutor about a new booking, with a calendar invite."""
     from_email = current_app.config.get('RESEND_FROM_EMAIL')
-    
-    if not api_key:
-        print("Resend API key not configured, skipping email")
-        return False
-    
-    resend.api_key = api_key
-    
+
     start_time = session_data['start_time']
     if isinstance(start_time, str):
         start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-    
+
     formatted_date = start_time.strftime('%B %d, %Y')
     formatted_time = start_time.strftime('%I:%M %p')
     session_type_display = format_session_type(session_data.get('session_type', 'online'))
-    
+
     html_content = f"""
     <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
         <h2 style="color: #2563eb;">New Session Booked!</h2>
@@ -124,52 +108,39 @@ def send_tutor_notification(tutor_email, tutor_name, student_name, session_data)
         <p>Best regards,<br>Chinese Tutoring System</p>
     </div>
     """
-    
+
     ics_content = generate_ics_event(session_data, tutor_name, student_name)
     encoded_ics = base64.b64encode(ics_content).decode()
-    
-    try:
-        params = {
-            "from": from_email,
-            "to": [tutor_email],
-            "subject": f'New Booking - {student_name} on {formatted_date}',
-            "html": html_content,
-            "attachments": [
-                {
-                    "filename": "session.ics",
-                    "content": encoded_ics,
-                    "content_type": "text/calendar"
-                }
-            ]
-        }
-        
-        response = resend.Emails.send(params)
-        print(f"Tutor notification sent to {tutor_email}, id: {response.get('id')}")
-        return True
-    except Exception as e:
-        print(f"Error sending tutor notification: {e}")
-        return False
 
-def send_feedback_request(student_email, student_name, tutor_name, session_data):
-    api_key = current_app.config.get('RESEND_API_KEY')
+    return {
+        "from": from_email,
+        "to": [tutor_email],
+        "subject": f'New Booking - {student_name} on {formatted_date}',
+        "html": html_content,
+        "attachments": [
+            {
+                "filename": "session.ics",
+                "content": encoded_ics,
+                "content_type": "text/calendar"
+            }
+        ]
+    }
+
+
+def feedback_request_email(student_email, student_name, tutor_name, session_data):
+    """Resend params asking the student to rate a session."""
     from_email = current_app.config.get('RESEND_FROM_EMAIL')
     frontend_url = current_app.config.get('FRONTEND_URL', 'http://localhost:5173')
-    
-    if not api_key:
-        print("Resend API key not configured, skipping email")
-        return False
-    
-    resend.api_key = api_key
-    
+
     session_id = session_data['id']
     feedback_url = f"{frontend_url}/feedback/{session_id}"
-    
+
     start_time = session_data['start_time']
     if isinstance(start_time, str):
         start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-    
+
     formatted_date = start_time.strftime('%B %d, %Y')
-    
+
     html_content = f"""
     <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
         <h2 style="color: #2563eb;">How was your session?</h2>
@@ -185,36 +156,23 @@ def send_feedback_request(student_email, student_name, tutor_name, session_data)
         <p>Thank you!<br>Chinese Tutoring System</p>
     </div>
     """
-    
-    try:
-        params = {
-            "from": from_email,
-            "to": [student_email],
-            "subject": f'How was your session with {tutor_name}?',
-            "html": html_content
-        }
-        
-        response = resend.Emails.send(params)
-        print(f"Feedback request sent to {student_email}, id: {response.get('id')}")
-        return True
-    except Exception as e:
-        print(f"Error sending feedback request: {e}")
-        return False
 
-def send_invitation_email(email, role, token, invited_by_name):
-    api_key = current_app.config.get('RESEND_API_KEY')
+    return {
+        "from": from_email,
+        "to": [student_email],
+        "subject": f'How was your session with {tutor_name}?',
+        "html": html_content
+    }
+
+
+def invitation_email(email, role, token, invited_by_name):
+    """Resend params inviting `email` to sign up as a tutor or professor."""
     from_email = current_app.config.get('RESEND_FROM_EMAIL')
     frontend_url = current_app.config.get('FRONTEND_URL', 'http://localhost:5173')
-    
-    if not api_key:
-        print("Resend API key not configured, skipping email")
-        return False
-    
-    resend.api_key = api_key
-    
+
     signup_url = f"{frontend_url}?invitation={token}"
     role_display = "Professor" if role == "professor" else "Tutor"
-    
+
     html_content = f"""
     <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
         <h2 style="color: #2563eb;">You're Invited to Join the Chinese Tutoring System!</h2>
@@ -231,18 +189,106 @@ def send_invitation_email(email, role, token, invited_by_name):
         <p>Best regards,<br>Chinese Tutoring System</p>
     </div>
     """
-    
+
+    return {
+        "from": from_email,
+        "to": [email],
+        "subject": f'Invitation to Join as {role_display}',
+        "html": html_content
+    }
+
+
+def send_invitation_email(email, role, token, invited_by_name):
+    api_key = current_app.config.get('RESEND_API_KEY')
+
+    if not api_key:
+        print("Resend API key not configured, skipping email")
+        return False
+
+    resend.api_key = api_key
+    params = invitation_email(email, role, token, invited_by_name)
+
     try:
-        params = {
-            "from": from_email,
-            "to": [email],
-            "subject": f'Invitation to Join as {role_display}',
-            "html": html_content
-        }
-        
         response = resend.Emails.send(params)
         print(f"Invitation sent to {email}, id: {response.get('id')}")
         return True
     except Exception as e:
         print(f"Error sending invitation: {e}")
         return False
+
+
+# Resend takes at most this many emails per batch request, and none with attachments.
+BATCH_LIMIT = 100
+
+
+def _send_one(params):
+    try:
+        return (resend.Emails.send(params) or {}).get('id')
+    except Exception as e:
+        return e
+
+
+class EmailBatch:
+    """Collects Resend params and sends them through `resend.Batch.send` in chunks.
+
+    `add` returns the message's position; `flush` returns one result per added
+    message in that order: its Resend id, or the exception that stopped it.
+    Emails with attachments, which the batch API rejects, are sent one by one.
+    Set `resend.api_key` before flushing."""
+
+    def __init__(self, chunk_size=BATCH_LIMIT):
+        self.chunk_size = max(1, min(chunk_size, BATCH_LIMIT))
+        self._messages = []
+
+    def __len__(self):
+        return len(self._messages)
+
+    def add(self, params):
+        self._messages.append(params)
+        return len(self._messages) - 1
+
+    def flush(self):
+        messages, self._messages = self._messages, []
+        results = [None] * len(messages)
+        batchable = []
+        for i, params in enumerate(messages):
+            if params.get('attachments'):
+                results[i] = _send_one(params)
+            else:
+                batchable.append(i)
+
+        for start in range(0, len(batchable), self.chunk_size):
+            chunk = batchable[start:start + self.chunk_size]
+            if len(chunk) == 1:
+                results[chunk[0]] = _send_one(messages[chunk[0]])
+                continue
+            try:
+                data = (resend.Batch.send([messages[i] for i in chunk]) or {}).get('data') or []
+                if len(data) != len(chunk):
+                    raise ValueError(f"Resend batch returned {len(data)} result(s) for {len(chunk)} email(s)")
+            except Exception as e:
+                # The batch API accepts or rejects a request as a whole.
+                for i in chunk:
+                    results[i] = e
+                continue
+            for i, email in zip(chunk, data):
+                results[i] = email.get('id')
+        return results
+
+
+def send_emails(messages, chunk_size=BATCH_LIMIT):
+    """Send many Resend params in as few requests as possible; results as `EmailBatch.flush`."""
+    api_key = current_app.config.get('RESEND_API_KEY')
+
+    if not api_key:
+        print("Resend API key not configured, skipping email")
+        return [RuntimeError("Resend API key not configured") for _ in messages]
+
+    resend.api_key = api_key
+    batch = EmailBatch(chunk_size)
+    for params in messages:
+        batch.add(params)
+    results = batch.flush()
+    sent = sum(not isinstance(result, Exception) for result in results)
+    print(f"Sent {sent} of {len(results)} email(s) in batches of up to {batch.chunk_size}")
+    return results
@@ -1,102 +1,359 @@
-from models import db, User, Tutor, Availability, Session, Feedback
+import base64
+import hashlib
+import heapq
+import json
+import os
+from collections import namedtuple
+from flask import current_app
+from models import db, User, Tutor, Availability, Session, Feedback, TutorStats
 from sqlalchemy import func
+from services import change_tracking, scoring_kernel
+from services.slot_index import load_open_time
+from services.cache import TTLCache
 
+TutorColumns = namedtuple('TutorColumns', 'ids names emails rating availability extras')
 
-def calculate_tutor_match_scores(student_id):
-    student = User.query.get(student_id)
+# Entries are validated against change counters on every read, the same
+# versions the ETag is built from; the TTL only bounds memory.
+recommendation_cache = TTLCache(
+    maxsize=int(os.environ.get("RECOMMENDATION_CACHE_SIZE", "1024")),
+    ttl=int(os.environ.get("RECOMMENDATION_CACHE_TTL", "600")),
+)
+
+
+def calculate_tutor_match_scores(student_id, window=None, plan=scoring_kernel.DEFAULT_PLAN):
+    """Score every tutor for `student_id` using a fixed number of grouped queries.
+
+    With a (start, end) `window` the availability component scores the tutor's
+    actual open time in that window instead of counting availability rows.
+    `plan` holds the weights and caps, see services.scoring_profiles."""
+    rows = iter_tutor_scores(student_id, window, plan)
+    return [score_dict(row) for row in sorted(rows, key=rank_key)]
+
+
+def iter_tutor_scores(student_id, window=None, plan=scoring_kernel.DEFAULT_PLAN):
+    """Yield (total, tutor id, name, email, previous, rating, availability, extras) per tutor."""
+    student = db.session.get(User, student_id)
     if not student:
-        return []
-
-    tutors = User.query.filter(User.role == 'tutor').all()
-    
-    tutor_scores = []
-    
-    for tutor in tutors:
-        tutor_profile = Tutor.query.filter_by(user_id=tutor.id).first()
-        if not tutor_profile:
-            continue
-        
-        score = 0.0
-        score_breakdown = {}
-        
-        previous_session_score = calculate_previous_session_score(student_id, tutor.id)
-        score += previous_session_score
-        score_breakdown['previous_sessions'] = previous_session_score
-        
-        rating_score = calculate_rating_score(tutor.id)
-        score += rating_score
-        score_breakdown['rating'] = rating_score
-        
-        availability_score = calculate_availability_score(tutor_profile.id)
-        score += availability_score
-        score_breakdown['availability'] = availability_score
-        
-        tutor_scores.append({
-            'tutor_id': tutor.id,
-            'tutor_name': tutor.name,
-            'tutor_email': tutor.email,
-            'total_score': round(score, 2),
-            'score_breakdown': score_breakdown
-        })
-    
-    tutor_scores.sort(key=lambda x: x['total_score'], reverse=True)
-    
-    return tutor_scores
+        return
 
+    tutors = load_tutor_points(window, plan)
+    previous_counts = load_previous_session_counts(student_id)
+    yield from score_rows(tutors, previous_counts, plan)
+
+
+def load_tutor_points(window=None, plan=scoring_kernel.DEFAULT_PLAN):
+    """Tutor identity and rating/availability point columns, in tutor id order."""
+    if current_app.config.get('MATCHING_USE_TUTOR_STATS'):
+        avg_ratings, availability_counts = load_tutor_stats()
+    else:
+        avg_ratings, availability_counts = load_tutor_aggregates()
+    rows = load_tutor_rows()
+    ids = [row[0] for row in rows]
+
+    if window is None:
+        availability = scoring_kernel.availability_column(
+            [availability_counts.get(i, 0) for i in ids], plan=plan
+        )
+        extras = [None] * len(ids)
+    else:
+        window_start, window_end = window
+        open_time = load_open_time(window_start, window_end)
+        availability, extras = [], []
+        for tutor_id in ids:
+            minutes, earliest = open_time.get(tutor_id, (0, None))
+            availability.append(open_time_points(minutes, earliest, window_start, window_end, plan))
+            extras.append({
+                'open_minutes': minutes,
+                'earliest_open_slot': earliest.isoformat() if earliest else None,
+            })
+
+    return TutorColumns(
+        ids=ids,
+        names=[row[1] for row in rows],
+        emails=[row[2] for row in rows],
+        rating=scoring_kernel.rating_column([avg_ratings.get(i) for i in ids], plan=plan),
+        availability=availability,
+        extras=extras,
+    )
+
+
+def score_rows(tutors, previous_counts, plan=scoring_kernel.DEFAULT_PLAN):
+    previous = scoring_kernel.previous_session_column(
+        [previous_counts.get(i, 0) for i in tutors.ids], plan=plan
+    )
+    totals = scoring_kernel.total_column(previous, tutors.rating, tutors.availability)
+    return zip(
+        totals, tutors.ids, tutors.names, tutors.emails,
+        scoring_kernel.to_list(previous),
+        scoring_kernel.to_list(tutors.rating),
+        scoring_kernel.to_list(tutors.availability),
+        tutors.extras,
+    )
+
+
+def iter_batch_match_scores(student_ids, limit=None, window=None, plan=scoring_kernel.DEFAULT_PLAN):
+    """Yield (student, recommendations) for each student account in `student_ids`.
+
+    Other ids are skipped. Tutor aggregates and the student x tutor booking matrix are loaded once up
+    front, so the query count does not grow with the number of students."""
+    students = (
+        db.session.query(User.id, User.name)
+        .filter(User.id.in_(student_ids), User.role == "student")
+        .order_by(User.id)
+        .all()
+    )
+    if not students:
+        return
+    tutors = load_tutor_points(window, plan)
+    matrix = load_previous_session_matrix([student_id for student_id, _ in students])
+
+    for student_id, name in students:
+        rows = score_rows(tutors, matrix.get(student_id, {}), plan)
+        if limit is None:
+            selected = sorted(rows, key=rank_key)
+        else:
+            selected = heapq.nsmallest(limit, rows, key=rank_key)
+        yield (
+            {'student_id': student_id, 'student_name': name},
+            [score_dict(row) for row in selected],
+        )
+
+
+def rank_key(row):
+    """Highest score first; ties keep tutor id order."""
+    return (-row[0], row[1])
+
+
+def score_dict(row):
+    total, tutor_id, name, email, previous_session_score, rating_score, availability_score, extras = row
+    result = {
+        'tutor_id': tutor_id,
+        'tutor_name': name,
+        'tutor_email': email,
+        'total_score': total,
+        'score_breakdown': {
+            'previous_sessions': previous_session_score,
+            'rating': rating_score,
+            'availability': availability_score,
+        }
+    }
+    if extras:
+        result.update(extras)
+    return result
+
+
+def load_tutor_rows():
+    """(user id, name, email, tutor profile id) for tutors that have a profile."""
+    return (
+        db.session.query(User.id, User.name, User.email, Tutor.id)
+        .join(Tutor, Tutor.user_id == User.id)
+        .filter(User.role == 'tutor')
+        .order_by(User.id)
+        .all()
+    )
+
+
+def load_previous_session_counts(student_id):
+    """Booked session count per tutor user id for one student."""
+    return dict(
+        db.session.query(Session.tutor_id, func.count(Session.id))
+        .filter(Session.student_id == student_id, Session.status == 'booked')
+        .group_by(Session.tutor_id)
+        .all()
+    )
+
+
+def load_previous_session_matrix(student_ids):
+    """{student id: {tutor user id: booked session count}} for the given students."""
+    matrix = {}
+    rows = (
+        db.session.query(Session.student_id, Session.tutor_id, func.count(Session.id))
+        .filter(Session.student_id.in_(student_ids), Session.status == 'booked')
+        .group_by(Session.student_id, Session.tutor_id)
+    )
+    for student_id, tutor_id, count in rows:
+        matrix.setdefault(student_id, {})[tutor_id] = count
+    return matrix
+
+
+def load_tutor_aggregates():
+    """Average feedback rating and availability count per tutor user id."""
+    avg_ratings = dict(
+        db.session.query(Session.tutor_id, func.avg(Feedback.rating))
+        .join(Feedback, Feedback.session_id == Session.id)
+        .group_by(Session.tutor_id)
+        .all()
+    )
+    availability_counts = dict(
+        db.session.query(Tutor.user_id, func.count(Availability.id))
+        .join(Availability, Availability.tutor_id == Tutor.id)
+        .group_by(Tutor.user_id)
+        .all()
+    )
+    return avg_ratings, availability_counts
+
+
+def load_tutor_stats():
+    """Same shape as `load_tutor_aggregates`, read from the denormalized tutor_stats table."""
+    avg_ratings = {}
+    availability_counts = {}
+    for stats in TutorStats.query.all():
+        if stats.rating_count:
+            avg_ratings[stats.tutor_id] = stats.avg_rating
+        availability_counts[stats.tutor_id] = stats.availability_count
+    return avg_ratings, availability_counts
+
+
+def previous_session_points(previous_sessions, plan=scoring_kernel.DEFAULT_PLAN):
+    WEIGHT = plan.previous_session_weight
+    MAX_SESSIONS_FOR_FULL_SCORE = plan.max_sessions_for_full_score
 
-def calculate_previous_session_score(student_id, tutor_id):
-    WEIGHT = 50.0
-    MAX_SESSIONS_FOR_FULL_SCORE = 5
-    
-    previous_sessions = Session.query.filter(
-        Session.student_id == student_id,
-        Session.tutor_id == tutor_id,
-        Session.status == 'booked'
-    ).count()
-    
     if previous_sessions == 0:
         return 0.0
-    
+
     session_factor = min(previous_sessions / MAX_SESSIONS_FOR_FULL_SCORE, 1.0)
-    
+
     return WEIGHT * session_factor
 
 
-def calculate_rating_score(tutor_id):
-    WEIGHT = 35.0
-    
-    tutor_sessions = Session.query.filter(Session.tutor_id == tutor_id).all()
-    session_ids = [s.id for s in tutor_sessions]
-    
-    if not session_ids:
-        return WEIGHT * 0.5
-    
-    avg_rating = db.session.query(func.avg(Feedback.rating)).filter(
-        Feedback.session_id.in_(session_ids)
-    ).scalar()
-    
+def rating_points(avg_rating, plan=scoring_kernel.DEFAULT_PLAN):
+    WEIGHT = plan.rating_weight
+
     if avg_rating is None:
         return WEIGHT * 0.5
-    
-    normalized_rating = avg_rating / 5.0
-    
+
+    normalized_rating = avg_rating / plan.max_rating
+
     return WEIGHT * normalized_rating
 
 
-def calculate_availability_score(tutor_profile_id):
-    WEIGHT = 15.0
-    
-    availability_count = Availability.query.filter_by(tutor_id=tutor_profile_id).count()
-    
+def availability_points(availability_count, plan=scoring_kernel.DEFAULT_PLAN):
+    WEIGHT = plan.availability_weight
+
     if availability_count == 0:
         return 0.0
-    
-    score_factor = min(availability_count / 5.0, 1.0)
-    
+
+    score_factor = min(availability_count / plan.max_availability_for_full_score, 1.0)
+
     return WEIGHT * score_factor
 
 
-def get_recommended_tutors(student_id):
-    scores = calculate_tutor_match_scores(student_id)
-    return scores
+def open_time_points(open_minutes, earliest, window_start, window_end, plan=scoring_kernel.DEFAULT_PLAN):
+    if not open_minutes or earliest is None:
+        return 0.0
+
+    minutes_factor = min(open_minutes / plan.max_open_minutes_for_full_score, 1.0)
+    wait_factor = (earliest - window_start) / (window_end - window_start)
+
+    return (plan.open_minutes_weight * minutes_factor
+            + plan.earliest_slot_weight * (1.0 - wait_factor))
+
+
+def calculate_previous_session_score(student_id, tutor_id):
+    previous_sessions = Session.query.filter(
+        Session.student_id == student_id,
+        Session.tutor_id == tutor_id,
+        Session.status == 'booked'
+    ).count()
+
+    return previous_session_points(previous_sessions)
+
+
+def calculate_rating_score(tutor_id):
+    avg_rating = db.session.query(func.avg(Feedback.rating)).join(
+        Session, Feedback.session_id == Session.id
+    ).filter(Session.tutor_id == tutor_id).scalar()
+
+    return rating_points(avg_rating)
+
+
+def calculate_availability_score(tutor_profile_id):
+    availability_count = Availability.query.filter_by(tutor_id=tutor_profile_id).count()
+
+    return availability_points(availability_count)
+
+
+def get_recommended_tutors(student_id, limit=None, after=None, window=None,
+                           plan=scoring_kernel.DEFAULT_PLAN):
+    """Ranked recommendations, optionally the `limit` best ranked after `after`.
+
+    `after` is a (total_score, tutor_id) position from `decode_cursor`. With a
+    limit only a bounded heap of candidates is kept instead of sorting every
+    tutor."""
+    if limit is None and after is None:
+        return calculate_tutor_match_scores(student_id, window, plan)
+
+    rows = iter_tutor_scores(student_id, window, plan)
+    if after is not None:
+        position = (-after[0], after[1])
+        rows = (row for row in rows if rank_key(row) > position)
+    if limit is None:
+        selected = sorted(rows, key=rank_key)
+    else:
+        selected = heapq.nsmallest(limit, rows, key=rank_key)
+    return [score_dict(row) for row in selected]
+
+
+def encode_cursor(recommendation):
+    position = [recommendation['total_score'], recommendation['tutor_id']]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverse of `encode_cursor`; raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        score, tutor_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if not isinstance(score, (int, float)) or not isinstance(tutor_id, int):
+        raise ValueError('Invalid cursor')
+    return float(score), tutor_id
+
+
+def get_recommendation_page(student_id, limit, after=None, window=None, plan=scoring_kernel.DEFAULT_PLAN):
+    """One page of recommendations plus the cursor of the next page (or None)."""
+    rows = get_recommended_tutors(student_id, limit=limit + 1, after=after, window=window, plan=plan)
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def recommendation_versions(student_id, slot_aware=False):
+    keys = [
+        change_tracking.student_key(student_id),
+        change_tracking.RATINGS,
+        change_tracking.AVAILABILITY,
+        change_tracking.TUTORS,
+        # Tutor names and emails are part of each recommendation.
+        change_tracking.table_key("users"),
+    ]
+    if slot_aware:
+        # Open time also shrinks when any other student books a tutor.
+        keys.append(change_tracking.BOOKINGS)
+    return change_tracking.versions(*keys)
+
+
+def recommendation_etag(student_id, versions, plan=scoring_kernel.DEFAULT_PLAN):
+    use_stats = bool(current_app.config.get('MATCHING_USE_TUTOR_STATS'))
+    fingerprint = scoring_kernel.plan_fingerprint(plan)
+    raw = f"{student_id}:{use_stats}:{fingerprint}:{':'.join(map(str, versions))}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+
+def get_cached_recommendations(student_id, versions, limit=None, after=None, window=None,
+                               plan=scoring_kernel.DEFAULT_PLAN):
+    """Rankings for `student_id`, recomputed only when `versions` moved on.
 
+    Returns (recommendations, next_cursor); next_cursor is None without a limit.
+    The plan itself is part of the key, so editing a profile misses the cache."""
+    key = (student_id, limit, after, window, plan)
+    cached = recommendation_cache.get(key)
+    if cached is not None and cached[0] == versions:
+        return cached[1]
+    if limit is None:
+        result = get_recommended_tutors(student_id, after=after, window=window, plan=plan), None
+    else:
+        result = get_recommendation_page(student_id, limit, after=after, window=window, plan=plan)
+    recommendation_cache.set(key, (versions, result))
+    return result
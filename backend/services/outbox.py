@@ -0,0 +1,246 @@
+import json
+import os
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+import resend
+from flask import current_app
+from sqlalchemy import and_, func, or_, select, update
+from models import db, EmailOutbox
+from services.tasks import task_runner
+from services.email_service import BATCH_LIMIT, EmailBatch
+
+# One claim fills one Resend batch request.
+CLAIM_BATCH_SIZE = BATCH_LIMIT
+# Seconds a claimed email may take before another worker may send it again.
+LEASE_SECONDS = 120
+MAX_BACKOFF_SECONDS = 3600
+DEAD_LETTER_LIMIT = 20
+
+# Drains running at once in this process, each with one Resend request in flight.
+EMAIL_WORKERS = int(os.environ.get("EMAIL_WORKERS", "2"))
+
+_drain_slots = threading.BoundedSemaphore(EMAIL_WORKERS)
+
+
+class OutboxMetrics:
+    """Per-process counters of what the drains did, for the stats endpoint."""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self._counts[name] += n
+
+    def snapshot(self):
+        with self._lock:
+            return {name: self._counts[name] for name in ("claimed", "sent", "retried", "dead")}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+metrics = OutboxMetrics()
+
+
+def enqueue(kind, params):
+    """Queue an email in the current transaction; nothing is sent unless it commits.
+
+    Call `kick` after the commit to send it without waiting for a worker poll."""
+    row = EmailOutbox(kind=kind, payload=json.dumps(params), status="pending", next_attempt_at=datetime.utcnow())
+    db.session.add(row)
+    return row
+
+
+def kick():
+    """Drain due emails on the task pool, unless EMAIL_WORKERS drains already run here."""
+    if _drain_slots.acquire(blocking=False):
+        task_runner.submit(_drain_in_slot)
+
+
+def _drain_in_slot():
+    while True:
+        try:
+            drain()
+        except Exception:
+            # Eager drains share the request's session; leave it usable.
+            db.session.rollback()
+            raise
+        finally:
+            _drain_slots.release()
+        # An email committed while the last claim ran would otherwise wait for the next kick.
+        if not due_count() or not _drain_slots.acquire(blocking=False):
+            return
+
+
+def _due(now):
+    return or_(
+        and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+        and_(EmailOutbox.status == "sending", EmailOutbox.locked_until < now),
+    )
+
+
+def due_count():
+    return db.session.query(func.count(EmailOutbox.id)).filter(_due(datetime.utcnow())).scalar()
+
+
+def claim(batch_size=CLAIM_BATCH_SIZE):
+    """Mark up to `batch_size` due emails as sending under a lease and commit.
+
+    Each row is taken with a conditional UPDATE, so concurrent workers never
+    claim the same email. Returns the claimed rows, oldest first."""
+    now = datetime.utcnow()
+    candidates = db.session.execute(
+        select(EmailOutbox.id)
+        .where(_due(now))
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+    ).scalars().all()
+    claimed = [
+        outbox_id
+        for outbox_id in candidates
+        if db.session.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == outbox_id, _due(now))
+            .values(
+                status="sending",
+                attempts=EmailOutbox.attempts + 1,
+                locked_until=now + timedelta(seconds=LEASE_SECONDS),
+            )
+        ).rowcount == 1
+    ]
+    db.session.commit()
+    metrics.incr("claimed", len(claimed))
+    if not claimed:
+        return []
+    return EmailOutbox.query.filter(EmailOutbox.id.in_(claimed)).order_by(EmailOutbox.id).all()
+
+
+def _backoff(attempts):
+    base = current_app.config.get("EMAIL_RETRY_BACKOFF", 30)
+    return min(MAX_BACKOFF_SECONDS, random.uniform(0.5, 1.0) * base * (2 ** (attempts - 1)))
+
+
+def _record_failure(row, error):
+    row.last_error = error
+    row.locked_until = None
+    if row.attempts >= current_app.config.get("EMAIL_MAX_ATTEMPTS", 8):
+        row.status = "dead"
+        metrics.incr("dead")
+        print(f"Email {row.id} ({row.kind}) dead-lettered after {row.attempts} attempt(s): {error}")
+    else:
+        row.status = "pending"
+        row.next_attempt_at = datetime.utcnow() + timedelta(seconds=_backoff(row.attempts))
+        metrics.incr("retried")
+
+
+def _record_sent(row, provider_id):
+    row.status = "sent"
+    row.provider_id = provider_id
+    row.sent_at = datetime.utcnow()
+    row.locked_until = None
+    row.last_error = None
+    metrics.incr("sent")
+
+
+def drain(batch_size=CLAIM_BATCH_SIZE):
+    """Send due emails until none are left. Returns the number sent and failed.
+
+    Each claimed set goes out through `EmailBatch`, in chunks of
+    EMAIL_BATCH_SIZE (1 sends them one by one), and its outcomes are
+    committed together."""
+    api_key = current_app.config.get("RESEND_API_KEY")
+    if not api_key:
+        print("Resend API key not configured, leaving queued emails unsent")
+        return {"sent": 0, "failed": 0}
+    resend.api_key = api_key
+    chunk_size = current_app.config.get("EMAIL_BATCH_SIZE", BATCH_LIMIT)
+
+    sent = failed = 0
+    while True:
+        rows = claim(batch_size)
+        if not rows:
+            return {"sent": sent, "failed": failed}
+        batch = EmailBatch(chunk_size)
+        for row in rows:
+            batch.add(json.loads(row.payload))
+        for row, result in zip(rows, batch.flush()):
+            if isinstance(result, Exception):
+                _record_failure(row, str(result))
+                failed += 1
+            else:
+                _record_sent(row, result)
+                sent += 1
+        db.session.commit()
+
+
+def _worker_loop(app, stop, poll_interval):
+    with app.app_context():
+        while not stop.is_set():
+            try:
+                result = drain()
+            except Exception as e:
+                print(f"Error draining email outbox: {e}")
+                db.session.rollback()
+                result = None
+            if not result or not any(result.values()):
+                stop.wait(poll_interval)
+
+
+def run_worker(concurrency=EMAIL_WORKERS, poll_interval=2.0, stop=None):
+    """Drain the outbox from `concurrency` threads, polling while it is empty, until `stop` is set."""
+    app = current_app._get_current_object()
+    stop = stop or threading.Event()
+    threads = [
+        threading.Thread(target=_worker_loop, args=(app, stop, poll_interval), name=f"email-worker-{i}", daemon=True)
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=1.0)
+    except KeyboardInterrupt:
+        stop.set()
+
+
+def requeue_dead():
+    """Give dead-lettered emails a fresh set of attempts and commit. Returns how many."""
+    count = db.session.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.status == "dead")
+        .values(status="pending", attempts=0, next_attempt_at=datetime.utcnow())
+    ).rowcount
+    db.session.commit()
+    return count
+
+
+def stats():
+    """Row counts per status, age of the oldest due email, recent dead letters and process counters."""
+    counts = dict(db.session.query(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status))
+    oldest = (
+        db.session.query(func.min(EmailOutbox.next_attempt_at))
+        .filter(EmailOutbox.status.in_(("pending", "sending")))
+        .scalar()
+    )
+    dead = (
+        EmailOutbox.query.filter_by(status="dead")
+        .order_by(EmailOutbox.id.desc())
+        .limit(DEAD_LETTER_LIMIT)
+    )
+    return {
+        "counts": {status: counts.get(status, 0) for status in ("pending", "sending", "sent", "dead")},
+        "oldest_pending_seconds": (
+            max(0.0, (datetime.utcnow() - oldest).total_seconds()) if oldest else None
+        ),
+        "dead_letters": [
+            {"id": row.id, "kind": row.kind, "attempts": row.attempts, "last_error": row.last_error}
+            for row in dead
+        ],
+        "process": metrics.snapshot(),
+    }
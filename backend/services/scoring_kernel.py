@@ -0,0 +1,119 @@
+"""Column-wise tutor scoring.
+
+Takes per-tutor aggregates as parallel sequences and returns score columns.
+Uses numpy when it is installed and falls back to plain Python otherwise; both
+paths perform the same float operations in the same order, so results are
+identical to the scalar helpers in matching_service."""
+
+import hashlib
+import json
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+PREVIOUS_SESSION_WEIGHT = 50.0
+MAX_SESSIONS_FOR_FULL_SCORE = 5
+RATING_WEIGHT = 35.0
+MAX_RATING = 5.0
+AVAILABILITY_WEIGHT = 15.0
+MAX_AVAILABILITY_FOR_FULL_SCORE = 5.0
+# Slot-aware mode splits the availability weight between open time and how
+# soon the first open slot is.
+OPEN_MINUTES_WEIGHT = 10.0
+MAX_OPEN_MINUTES_FOR_FULL_SCORE = 300.0
+EARLIEST_SLOT_WEIGHT = AVAILABILITY_WEIGHT - OPEN_MINUTES_WEIGHT
+
+ScoringPlan = namedtuple(
+    'ScoringPlan',
+    [
+        'previous_session_weight',
+        'max_sessions_for_full_score',
+        'rating_weight',
+        'max_rating',
+        'availability_weight',
+        'max_availability_for_full_score',
+        'open_minutes_weight',
+        'max_open_minutes_for_full_score',
+        'earliest_slot_weight',
+    ],
+    defaults=[
+        PREVIOUS_SESSION_WEIGHT,
+        MAX_SESSIONS_FOR_FULL_SCORE,
+        RATING_WEIGHT,
+        MAX_RATING,
+        AVAILABILITY_WEIGHT,
+        MAX_AVAILABILITY_FOR_FULL_SCORE,
+        OPEN_MINUTES_WEIGHT,
+        MAX_OPEN_MINUTES_FOR_FULL_SCORE,
+        EARLIEST_SLOT_WEIGHT,
+    ],
+)
+
+DEFAULT_PLAN = ScoringPlan()
+
+
+def plan_fingerprint(plan):
+    raw = json.dumps(plan._asdict(), sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+HAS_NUMPY = np is not None
+
+
+def _use_numpy(use_numpy):
+    if use_numpy is None:
+        return HAS_NUMPY
+    if use_numpy and not HAS_NUMPY:
+        raise RuntimeError("numpy is not installed")
+    return use_numpy
+
+
+def previous_session_column(counts, use_numpy=None, plan=DEFAULT_PLAN):
+    weight, cap = plan.previous_session_weight, plan.max_sessions_for_full_score
+    if _use_numpy(use_numpy):
+        counts = np.asarray(counts, dtype=float)
+        return weight * np.minimum(counts / cap, 1.0)
+    return [0.0 if count == 0 else weight * min(count / cap, 1.0) for count in counts]
+
+
+def rating_column(avg_ratings, use_numpy=None, plan=DEFAULT_PLAN):
+    """`avg_ratings` may contain None for tutors without feedback."""
+    weight, max_rating = plan.rating_weight, plan.max_rating
+    if _use_numpy(use_numpy):
+        # None becomes NaN when building a float array.
+        ratings = np.array(avg_ratings, dtype=float)
+        return np.where(np.isnan(ratings), weight * 0.5, weight * (ratings / max_rating))
+    return [weight * 0.5 if rating is None else weight * (rating / max_rating) for rating in avg_ratings]
+
+
+def availability_column(counts, use_numpy=None, plan=DEFAULT_PLAN):
+    weight, cap = plan.availability_weight, plan.max_availability_for_full_score
+    if _use_numpy(use_numpy):
+        counts = np.asarray(counts, dtype=float)
+        return weight * np.minimum(counts / cap, 1.0)
+    return [0.0 if count == 0 else weight * min(count / cap, 1.0) for count in counts]
+
+
+def total_column(previous, rating, availability, use_numpy=None):
+    """Sum of the three columns rounded to 2 places exactly like Python's `round`."""
+    if not _use_numpy(use_numpy):
+        return [round(0.0 + p + r + a, 2) for p, r, a in zip(previous, rating, availability)]
+
+    totals = 0.0 + np.asarray(previous, dtype=float) + np.asarray(rating, dtype=float) \
+        + np.asarray(availability, dtype=float)
+    rounded = np.round(totals, 2)
+    # np.round scales by 100 first, which can land on the wrong side of a
+    # half-way case; redo those few with Python's correctly rounded `round`.
+    scaled = totals * 100
+    ambiguous = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    result = rounded.tolist()
+    for i in ambiguous.tolist():
+        result[i] = round(float(totals[i]), 2)
+    return result
+
+
+def to_list(column):
+    return column.tolist() if hasattr(column, "tolist") else list(column)
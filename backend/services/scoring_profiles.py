@@ -0,0 +1,117 @@
+"""Named matching policies.
+
+`MATCHING_PROFILES` is a JSON object (inline, or a path to a JSON file) mapping
+profile names to overrides of the default weights, e.g.
+``{"availability_first": {"availability_weight": 40, "previous_session_weight": 25}}``.
+Each profile is validated and compiled into a `ScoringPlan` once; a file source
+is re-read only when its modification time changes. Unless a profile sets both
+slot weights, they split its `availability_weight` like the defaults do."""
+
+import json
+import os
+import threading
+import time
+from flask import current_app
+from services.scoring_kernel import ScoringPlan, DEFAULT_PLAN, AVAILABILITY_WEIGHT, OPEN_MINUTES_WEIGHT
+
+DEFAULT_PROFILE = "default"
+
+
+class UnknownProfile(KeyError):
+    pass
+
+
+def compile_profiles(spec):
+    """{name: ScoringPlan} from a {name: {field: number}} mapping; raises ValueError."""
+    if not isinstance(spec, dict):
+        raise ValueError("scoring profiles must be a JSON object")
+    plans = {DEFAULT_PROFILE: DEFAULT_PLAN}
+    for name, overrides in spec.items():
+        if not isinstance(overrides, dict):
+            raise ValueError(f"profile {name!r} must be an object")
+        unknown = set(overrides) - set(ScoringPlan._fields)
+        if unknown:
+            raise ValueError(f"profile {name!r} has unknown fields: {', '.join(sorted(unknown))}")
+        for field, value in overrides.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"profile {name!r}: {field} must be a non-negative number")
+            if field.startswith("max_") and value == 0:
+                raise ValueError(f"profile {name!r}: {field} must be positive")
+        slot_weights = {"open_minutes_weight", "earliest_slot_weight"} & set(overrides)
+        if len(slot_weights) == 1:
+            raise ValueError(f"profile {name!r}: set both open_minutes_weight and earliest_slot_weight, or neither")
+        if not slot_weights and "availability_weight" in overrides:
+            weight = overrides["availability_weight"]
+            open_minutes = weight * OPEN_MINUTES_WEIGHT / AVAILABILITY_WEIGHT
+            overrides = dict(overrides, open_minutes_weight=open_minutes, earliest_slot_weight=weight - open_minutes)
+        plans[name] = DEFAULT_PLAN._replace(**overrides)
+    return plans
+
+
+class ScoringProfiles:
+    def __init__(self, source=None, default=DEFAULT_PROFILE, reload_interval=2.0):
+        self.source = source
+        self.default = default
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self._plans = self._load()
+        if default not in self._plans:
+            raise ValueError(f"default scoring profile {default!r} is not defined")
+
+    def _is_file(self):
+        return bool(self.source) and not self.source.lstrip().startswith("{")
+
+    def _load(self):
+        if not self.source:
+            return compile_profiles({})
+        if not self._is_file():
+            return compile_profiles(json.loads(self.source))
+        self._mtime = os.stat(self.source).st_mtime
+        with open(self.source) as f:
+            return compile_profiles(json.load(f))
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if not self._is_file() or now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                if os.stat(self.source).st_mtime == self._mtime:
+                    return
+                self._plans = self._load()
+            except (OSError, ValueError) as e:
+                # Keep serving the last good profiles.
+                print(f"Error reloading scoring profiles: {e}")
+
+    def names(self):
+        self._maybe_reload()
+        return sorted(self._plans)
+
+    def get(self, name=None):
+        """(name, plan) for `name` or the default profile; raises UnknownProfile."""
+        self._maybe_reload()
+        name = name or self.default
+        try:
+            return name, self._plans[name]
+        except KeyError:
+            raise UnknownProfile(name) from None
+
+
+def init_scoring_profiles(app):
+    """Compile the app's profiles, failing fast on a bad configuration."""
+    profiles = ScoringProfiles(
+        source=app.config.get("MATCHING_PROFILES"),
+        default=app.config.get("MATCHING_DEFAULT_PROFILE") or DEFAULT_PROFILE,
+    )
+    app.extensions["scoring_profiles"] = profiles
+    return profiles
+
+
+def get_scoring_profiles():
+    profiles = current_app.extensions.get("scoring_profiles")
+    if profiles is None:
+        profiles = init_scoring_profiles(current_app)
+    return profiles
@@ -0,0 +1,131 @@
+"""Open time per tutor inside a date window.
+
+Recurring availability is expanded onto every matching weekday in the window
+(day_of_week uses the JS convention, 0 = Sunday) and, as in the frontend
+calendar, skipped on dates where the tutor has one-time availability. Booked
+sessions are subtracted through an `IntervalIndex` so each availability
+interval only touches the bookings that overlap it."""
+
+from bisect import bisect_right
+from datetime import datetime, time, timedelta
+from models import db, Availability, Session, Tutor
+
+# Fragments shorter than one bookable slot do not count as open time.
+SLOT_MINUTES = 20
+
+
+class IntervalIndex:
+    """Sorted, merged [start, end) intervals supporting bisect lookups."""
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(i for i in intervals if i[0] < i[1]):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def overlapping(self, start, end):
+        """Merged intervals overlapping [start, end), found in O(log n + k)."""
+        i = bisect_right(self.ends, start)
+        while i < len(self.starts) and self.starts[i] < end:
+            yield self.starts[i], self.ends[i]
+            i += 1
+
+    def subtract_from(self, start, end):
+        """Parts of [start, end) not covered by any indexed interval."""
+        free = []
+        cursor = start
+        for busy_start, busy_end in self.overlapping(start, end):
+            if busy_start > cursor:
+                free.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if cursor < end:
+            free.append((cursor, end))
+        return free
+
+
+def expand_availability(availabilities, window_start, window_end):
+    """Concrete [start, end) intervals of one tutor's availability inside the window."""
+    one_time_dates = set()
+    intervals = []
+    for av in availabilities:
+        if not av.is_recurring:
+            one_time_dates.add(av.start_time.date())
+            intervals.append((max(av.start_time, window_start), min(av.end_time, window_end)))
+
+    recurring = [av for av in availabilities if av.is_recurring]
+    day = window_start.date()
+    while recurring and datetime.combine(day, time.min) < window_end:
+        if day not in one_time_dates:
+            js_weekday = (day.weekday() + 1) % 7
+            for av in recurring:
+                if av.day_of_week == js_weekday:
+                    start = datetime.combine(day, av.start_time.time())
+                    end = datetime.combine(day, av.end_time.time())
+                    intervals.append((max(start, window_start), min(end, window_end)))
+        day += timedelta(days=1)
+
+    return IntervalIndex(intervals)
+
+
+def open_intervals(availability_index, booked_index):
+    slot = timedelta(minutes=SLOT_MINUTES)
+    return [
+        (start, end)
+        for av_start, av_end in availability_index
+        for start, end in booked_index.subtract_from(av_start, av_end)
+        if end - start >= slot
+    ]
+
+
+def load_open_time(window_start, window_end):
+    """{tutor user id: (open minutes, earliest open datetime or None)} for the window.
+
+    Two queries regardless of roster size: availability that can touch the
+    window and booked sessions inside it."""
+    availability_rows = (
+        db.session.query(Tutor.user_id, Availability)
+        .join(Availability, Availability.tutor_id == Tutor.id)
+        .filter(
+            db.or_(
+                Availability.is_recurring.is_(True),
+                db.and_(Availability.start_time < window_end, Availability.end_time > window_start),
+            )
+        )
+        .all()
+    )
+    booked_rows = (
+        db.session.query(Session.tutor_id, Session.start_time, Session.end_time)
+        .filter(
+            Session.status == 'booked',
+            Session.start_time < window_end,
+            Session.end_time > window_start,
+        )
+        .all()
+    )
+
+    availability_by_tutor = {}
+    for tutor_id, av in availability_rows:
+        availability_by_tutor.setdefault(tutor_id, []).append(av)
+    booked_by_tutor = {}
+    for tutor_id, start, end in booked_rows:
+        booked_by_tutor.setdefault(tutor_id, []).append((start, end))
+
+    open_time = {}
+    for tutor_id, availabilities in availability_by_tutor.items():
+        free = open_intervals(
+            expand_availability(availabilities, window_start, window_end),
+            IntervalIndex(booked_by_tutor.get(tutor_id, ())),
+        )
+        minutes = sum((end - start).total_seconds() for start, end in free) / 60
+        open_time[tutor_id] = (minutes, free[0][0] if free else None)
+    return open_time
@@ -0,0 +1,74 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import current_app
+
+
+class TaskRunner:
+    """Runs callables on a bounded thread pool inside an app context.
+
+    A task fails only when it raises; failed tasks are retried with jittered
+    exponential backoff and, once out of attempts, recorded in `failures` by
+    name and error. Arguments are left out of the log since they can carry
+    user data. With TASKS_EAGER set (tests), tasks run inline in the caller."""
+
+    def __init__(self, max_workers=4, failure_log_size=100):
+        self.max_workers = max_workers
+        self.failures = deque(maxlen=failure_log_size)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created lazily so gunicorn workers each start their own threads after fork.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="task"
+                )
+            return self._executor
+
+    def submit(self, fn, *args, retries=0, backoff=1.0, **kwargs):
+        app = current_app._get_current_object()
+        if app.config.get("TASKS_EAGER"):
+            self._call(fn, args, kwargs, retries, backoff)
+            return None
+        return self._get_executor().submit(self._run, app, fn, args, kwargs, retries, backoff)
+
+    def _run(self, app, fn, args, kwargs, retries, backoff):
+        with app.app_context():
+            return self._call(fn, args, kwargs, retries, backoff)
+
+    def _call(self, fn, args, kwargs, retries, backoff):
+        error = None
+        for attempt in range(retries + 1):
+            if attempt:
+                time.sleep(random.uniform(0.5, 1.0) * backoff * (2 ** (attempt - 1)))
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                error = str(e)
+
+        print(f"Background task {fn.__name__} failed after {retries + 1} attempt(s): {error}")
+        self.failures.append({
+            "task": fn.__name__,
+            "error": error,
+            "attempts": retries + 1,
+            "failed_at": datetime.utcnow().isoformat(),
+        })
+        return None
+
+    def recent_failures(self):
+        return list(self.failures)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+
+task_runner = TaskRunner(max_workers=int(os.environ.get("TASK_WORKERS", "4")))
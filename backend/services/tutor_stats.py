@@ -0,0 +1,143 @@
+from datetime import datetime
+from models import db, insert_ignore, TutorStats, Tutor, Availability, Session, Feedback
+from sqlalchemy import func, update
+from services import change_tracking
+
+STAT_FIELDS = ("rating_sum", "rating_count", "booked_session_count", "availability_count")
+
+
+def _apply_deltas(tutor_id, **deltas):
+    """Add `deltas` to the tutor's stats row in the caller's transaction."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not tutor_id or not deltas:
+        return
+    insert_ignore(TutorStats, {"tutor_id": tutor_id}, index_elements=["tutor_id"])
+    values = {field: getattr(TutorStats, field) + delta for field, delta in deltas.items()}
+    values["updated_at"] = datetime.utcnow()
+    db.session.execute(
+        update(TutorStats).where(TutorStats.tutor_id == tutor_id).values(**values)
+    )
+
+
+def record_feedback(tutor_id, old_rating, new_rating):
+    old = float(old_rating) if old_rating is not None else None
+    new = float(new_rating) if new_rating is not None else None
+    _apply_deltas(
+        tutor_id,
+        rating_sum=(new or 0.0) - (old or 0.0),
+        rating_count=(new is not None) - (old is not None),
+    )
+
+
+def record_booking(tutor_id, delta=1):
+    _apply_deltas(tutor_id, booked_session_count=delta)
+
+
+def record_availability(tutor_id, delta):
+    _apply_deltas(tutor_id, availability_count=delta)
+
+
+def session_totals(session):
+    """What `session` contributes to its tutor's stats, as (tutor_id, deltas)."""
+    rating_sum, rating_count = (
+        db.session.query(func.sum(Feedback.rating), func.count(Feedback.rating))
+        .filter(Feedback.session_id == session.id)
+        .one()
+    )
+    return session.tutor_id, {
+        "rating_sum": float(rating_sum or 0.0),
+        "rating_count": rating_count,
+        "booked_session_count": int(session.status == "booked"),
+    }
+
+
+def record_session_change(before, after):
+    """Move a session's contribution from `before` to `after`.
+
+    Both are `session_totals` results, or None for a created or deleted session."""
+    if before:
+        tutor_id, deltas = before
+        _apply_deltas(tutor_id, **{field: -delta for field, delta in deltas.items()})
+    if after:
+        tutor_id, deltas = after
+        _apply_deltas(tutor_id, **deltas)
+
+
+def compute_tutor_stats():
+    """Recompute every tutor's stats from the source tables, keyed by tutor user id."""
+    stats = {}
+
+    def row(tutor_id):
+        return stats.setdefault(tutor_id, dict.fromkeys(STAT_FIELDS, 0))
+
+    ratings = (
+        db.session.query(Session.tutor_id, func.sum(Feedback.rating), func.count(Feedback.rating))
+        .join(Feedback, Feedback.session_id == Session.id)
+        .group_by(Session.tutor_id)
+    )
+    for tutor_id, rating_sum, rating_count in ratings:
+        row(tutor_id).update(rating_sum=float(rating_sum or 0.0), rating_count=rating_count)
+
+    booked = (
+        db.session.query(Session.tutor_id, func.count(Session.id))
+        .filter(Session.status == "booked")
+        .group_by(Session.tutor_id)
+    )
+    for tutor_id, count in booked:
+        row(tutor_id)["booked_session_count"] = count
+
+    availability = (
+        db.session.query(Tutor.user_id, func.count(Availability.id))
+        .join(Availability, Availability.tutor_id == Tutor.id)
+        .group_by(Tutor.user_id)
+    )
+    for tutor_id, count in availability:
+        row(tutor_id)["availability_count"] = count
+
+    return stats
+
+
+def _stats_drift(actual, stored):
+    drift = []
+    for tutor_id in sorted(set(actual) | set(stored)):
+        expected = actual.get(tutor_id, dict.fromkeys(STAT_FIELDS, 0))
+        current = stored.get(tutor_id)
+        for field in STAT_FIELDS:
+            have = getattr(current, field) if current else 0
+            if abs((have or 0) - expected[field]) > 1e-9:
+                drift.append({"tutor_id": tutor_id, "field": field, "stored": have, "actual": expected[field]})
+    return drift
+
+
+def _write_stats(actual, stored):
+    """Make the `stored` rows match `actual`, adding and deleting rows as needed. Does not commit."""
+    now = datetime.utcnow()
+    for tutor_id, values in actual.items():
+        row = stored.get(tutor_id)
+        if row is None:
+            row = TutorStats(tutor_id=tutor_id)
+            db.session.add(row)
+        for field in STAT_FIELDS:
+            setattr(row, field, values[field])
+        row.updated_at = now
+    for tutor_id, row in stored.items():
+        if tutor_id not in actual:
+            db.session.delete(row)
+
+
+def rebuild_tutor_stats(apply=True):
+    """Compare stored stats with the source tables and return the drift found.
+
+    Each drift entry is {"tutor_id", "field", "stored", "actual"}. With `apply`
+    the table is rewritten to the recomputed values and committed."""
+    actual = compute_tutor_stats()
+    stored = {s.tutor_id: s for s in TutorStats.query.all()}
+
+    drift = _stats_drift(actual, stored)
+    if apply:
+        _write_stats(actual, stored)
+        if drift:
+            change_tracking.bump_after_commit(change_tracking.RATINGS, change_tracking.AVAILABILITY)
+        db.session.commit()
+
+    return drift
@@ -0,0 +1,66 @@
+import json
+from itertools import islice
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
+CHUNK_BYTES = 64 * 1024
+
+
+def stream_mode():
+    """'ndjson', 'json' or None for a buffered response.
+
+    `Accept: application/x-ndjson` selects one JSON document per line;
+    `stream=1` keeps the regular JSON envelope but sends it in chunks."""
+    if request.accept_mimetypes.best_match(["application/json", NDJSON]) == NDJSON:
+        return "ndjson"
+    if request.args.get("stream", "").lower() in ("1", "true", "yes"):
+        return "json"
+    return None
+
+
+def iter_batches(rows, size=STREAM_BATCH_SIZE):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _chunked(pieces, chunk_bytes):
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_bytes:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_response(items, mode, key, envelope=None, chunk_bytes=CHUNK_BYTES):
+    """Stream `items` (an iterable of JSON-able dicts) without holding them all.
+
+    In 'json' mode the body is `envelope` with `key` set to the list of items,
+    byte-for-byte what jsonify would produce for a non-streamed response
+    apart from whitespace."""
+    dumps = current_app.json.dumps
+
+    def ndjson_pieces():
+        for item in items:
+            yield dumps(item) + "\n"
+
+    def json_pieces():
+        head = dumps(dict(envelope or {}))
+        yield (head[:-1] + ", " if len(head) > 2 else "{") + json.dumps(key) + ": ["
+        for i, item in enumerate(items):
+            yield ("," if i else "") + dumps(item)
+        yield "]}"
+
+    if mode == "ndjson":
+        body, mimetype = ndjson_pieces(), NDJSON
+    else:
+        body, mimetype = json_pieces(), "application/json"
+    return Response(stream_with_context(_chunked(body, chunk_bytes)), mimetype=mimetype)
@@ -1,12 +1,14 @@
 import pytest
 import sys
 import os
+from contextlib import contextmanager
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from flask import Flask, jsonify
+from sqlalchemy import event
 from models import db, User, Tutor, Availability, Session, SessionNote, Feedback
 from config import Config
 from auth import require_auth
@@ -19,6 +21,8 @@ class TestConfig(Config):
     RESEND_API_KEY = 'test_resend_key'
     RESEND_FROM_EMAIL = 'test@example.com'
     FRONTEND_URL = 'http://localhost:5173'
+    CLERK_WEBHOOK_SECRET = 'whsec_dGVzdF93ZWJob29rX3NlY3JldA=='
+    TASKS_EAGER = True
 
 
 def create_test_app():
@@ -31,11 +35,13 @@ def create_test_app():
     from routes.sessions import session_bp
     from routes.matching import matching_bp
     from routes.invitations import invitations_bp
+    from routes.webhooks import webhooks_bp
     
     app.register_blueprint(availability_bp)
     app.register_blueprint(session_bp)
     app.register_blueprint(matching_bp)
     app.register_blueprint(invitations_bp)
+    app.register_blueprint(webhooks_bp)
     
     from zoneinfo import ZoneInfo
     NY_TZ = ZoneInfo("America/New_York")
@@ -169,6 +175,26 @@ def mock_require_auth(user):
     return decorator
 
 
+@pytest.fixture(autouse=True)
+def reset_clerk_state():
+    import auth
+    from services.clerk_client import clerk_client
+    auth.clerk_user_cache.clear()
+    clerk_client.breaker.reset()
+    yield
+    auth.clerk_user_cache.clear()
+    clerk_client.breaker.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_recommendation_cache():
+    # Each test starts from an empty database, so ids and versions repeat.
+    from services.matching_service import recommendation_cache
+    recommendation_cache.clear()
+    yield
+    recommendation_cache.clear()
+
+
 @pytest.fixture
 def app():
     test_app = create_test_app()
@@ -179,6 +205,30 @@ def app():
         db.drop_all()
 
 
+@pytest.fixture
+def count_queries(app):
+    """Collect the statements the engine runs inside a `with` block.
+
+    Pass parameters=True to record (statement, parameters) pairs instead.
+    """
+    @contextmanager
+    def counting(parameters=False):
+        statements = []
+
+        def record(conn, cursor, statement, params, *args):
+            statements.append((statement, params) if parameters else statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+
+    return counting
+
+
 @pytest.fixture
 def client(app):
     return app.test_client()
@@ -386,7 +436,7 @@ def auth_client(app, student_user):
             mock_sdk.authenticate_request.return_value = mock_request_state
             mock_clerk.return_value = mock_sdk
             
-            with patch('auth.requests.get') as mock_get:
+            with patch('services.clerk_client.requests.Session.get') as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {
@@ -418,7 +468,7 @@ def tutor_auth_client(app, tutor_user):
             mock_sdk.authenticate_request.return_value = mock_request_state
             mock_clerk.return_value = mock_sdk
             
-            with patch('auth.requests.get') as mock_get:
+            with patch('services.clerk_client.requests.Session.get') as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {
@@ -450,7 +500,7 @@ def professor_auth_client(app, professor_user):
             mock_sdk.authenticate_request.return_value = mock_request_state
             mock_clerk.return_value = mock_sdk
             
-            with patch('auth.requests.get') as mock_get:
+            with patch('services.clerk_client.requests.Session.get') as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {
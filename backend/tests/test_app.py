@@ -21,10 +21,9 @@ class TestHealthEndpoint:
 
 
 class TestUserEndpoint:
-    @patch('app.get_clerk_user_metadata')
-    def test_get_user(self, mock_clerk, app, client, student_user):
-        mock_clerk.return_value = None
-        
+    def test_get_user(self, app, client, student_user):
+        from app import app as flask_app
+
         with app.app_context():
             with patch('auth.require_auth') as mock_auth:
                 def auth_decorator(f):
@@ -39,19 +38,13 @@ class TestUserEndpoint:
                     return decorated
                 mock_auth.side_effect = auth_decorator
                 
-                from app import app as flask_app
                 flask_app.config.from_object('tests.conftest.TestConfig')
                 
                 with flask_app.test_client() as test_client:
                     with patch('app.require_auth', auth_decorator):
                         response = test_client.get('/api/user')
 
-    @patch('app.get_clerk_user_metadata')
-    def test_get_user_with_clerk_role_sync(self, mock_clerk, app, student_user):
-        mock_clerk.return_value = {
-            'public_metadata': {'role': 'tutor'}
-        }
-        
+    def test_get_user_with_clerk_role_sync(self, app, student_user):
         with app.app_context():
             user = User.query.filter_by(clerk_user_id='clerk_test_student').first()
             assert user is not None
@@ -309,7 +302,7 @@ class TestRoleRequired:
 
 
 class TestUpdateClerkMetadata:
-    @patch('app.requests.patch')
+    @patch('services.clerk_client.requests.Session.patch')
     def test_update_clerk_metadata_success(self, mock_patch, app):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -320,7 +313,7 @@ class TestUpdateClerkMetadata:
             result = update_clerk_metadata('clerk_user_123', {'role': 'student'})
             assert result is True
 
-    @patch('app.requests.patch')
+    @patch('services.clerk_client.requests.Session.patch')
     def test_update_clerk_metadata_failure(self, mock_patch, app):
         mock_response = MagicMock()
         mock_response.status_code = 400
@@ -338,7 +331,7 @@ class TestUpdateClerkMetadata:
             result = update_clerk_metadata('clerk_user_123', {'role': 'student'})
             assert result is False
 
-    @patch('app.requests.patch')
+    @patch('services.clerk_client.requests.Session.patch')
     def test_update_clerk_metadata_exception(self, mock_patch, app):
         mock_patch.side_effect = Exception('Network error')
         
@@ -348,48 +341,6 @@ class TestUpdateClerkMetadata:
             assert result is False
 
 
-class TestGetClerkUserMetadata:
-    @patch('app.requests.get')
-    def test_get_clerk_user_metadata_success(self, mock_get, app):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'id': 'clerk_123', 'public_metadata': {'role': 'student'}}
-        mock_get.return_value = mock_response
-        
-        with app.app_context():
-            from app import get_clerk_user_metadata
-            result = get_clerk_user_metadata('clerk_123')
-            assert result is not None
-            assert result['id'] == 'clerk_123'
-
-    @patch('app.requests.get')
-    def test_get_clerk_user_metadata_not_found(self, mock_get, app):
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_get.return_value = mock_response
-        
-        with app.app_context():
-            from app import get_clerk_user_metadata
-            result = get_clerk_user_metadata('nonexistent')
-            assert result is None
-
-    def test_get_clerk_user_metadata_no_key(self, app):
-        with app.app_context():
-            app.config['CLERK_SECRET_KEY'] = None
-            from app import get_clerk_user_metadata
-            result = get_clerk_user_metadata('clerk_123')
-            assert result is None
-
-    @patch('app.requests.get')
-    def test_get_clerk_user_metadata_exception(self, mock_get, app):
-        mock_get.side_effect = Exception('Network error')
-        
-        with app.app_context():
-            from app import get_clerk_user_metadata
-            result = get_clerk_user_metadata('clerk_123')
-            assert result is None
-
-
 class TestAppHTTPEndpoints:
     def test_get_user_http(self, app, student_user):
         with app.app_context():
@@ -403,7 +354,7 @@ class TestAppHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -435,7 +386,7 @@ class TestAppHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -464,7 +415,7 @@ class TestAppHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -493,7 +444,7 @@ class TestAppHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -524,7 +475,7 @@ class TestAppHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': admin_user.email}]}
@@ -548,7 +499,7 @@ class TestAppHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': student.email}]}
@@ -571,7 +522,7 @@ class TestAppHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -594,7 +545,7 @@ class TestAppHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
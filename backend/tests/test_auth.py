@@ -219,13 +219,13 @@ class TestExtractDisplayName:
 
 
 class TestRequireAuth:
-    @patch('auth.requests.get')
+    @patch('services.clerk_client.requests.Session.get')
     @patch('auth.Clerk')
     def test_require_auth_options_request(self, mock_clerk, mock_get, app, client):
         with app.app_context():
             pass
 
-    @patch('auth.requests.get')
+    @patch('services.clerk_client.requests.Session.get')
     @patch('auth.Clerk')
     def test_require_auth_unauthorized(self, mock_clerk, mock_get, app, client):
         mock_sdk = MagicMock()
@@ -237,7 +237,7 @@ class TestRequireAuth:
         with app.app_context():
             pass
 
-    @patch('auth.requests.get')
+    @patch('services.clerk_client.requests.Session.get')
     @patch('auth.Clerk')
     def test_require_auth_success(self, mock_clerk, mock_get, app, client, student_user):
         mock_sdk = MagicMock()
@@ -265,7 +265,7 @@ class TestRequireAuth:
         with app.app_context():
             pass
 
-    @patch('auth.requests.get')
+    @patch('services.clerk_client.requests.Session.get')
     @patch('auth.Clerk')
     def test_require_auth_with_authorized_party(self, mock_clerk, mock_get, app, client):
         mock_sdk = MagicMock()
@@ -278,7 +278,7 @@ class TestRequireAuth:
         with app.app_context():
             pass
 
-    @patch('auth.requests.get')
+    @patch('services.clerk_client.requests.Session.get')
     @patch('auth.Clerk')
     def test_require_auth_exception(self, mock_clerk, mock_get, app, client):
         mock_sdk = MagicMock()
@@ -288,7 +288,7 @@ class TestRequireAuth:
         with app.app_context():
             pass
 
-    @patch('auth.requests.get')
+    @patch('services.clerk_client.requests.Session.get')
     def test_fetch_clerk_user_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -299,7 +299,7 @@ class TestRequireAuth:
             result = fetch_clerk_user('user_123')
             assert result == {'id': 'clerk_123'}
 
-    @patch('auth.requests.get')
+    @patch('services.clerk_client.requests.Session.get')
     def test_fetch_clerk_user_failure(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 404
@@ -332,7 +332,7 @@ class TestRequireAuth:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {
@@ -360,7 +360,7 @@ class TestRequireAuth:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 404
                     mock_get.return_value = mock_response
@@ -368,3 +368,225 @@ class TestRequireAuth:
                     client = app.test_client()
                     response = client.get('/api/user', headers={'Authorization': 'Bearer test_token'})
                     assert response.status_code == 200
+
+
+def _make_signing_key(kid):
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jwt.algorithms import RSAAlgorithm
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk.update({'kid': kid, 'use': 'sig', 'alg': 'RS256'})
+    return private_key, jwk
+
+
+def _write_jwks(path, *jwks):
+    import json
+    path.write_text(json.dumps({'keys': list(jwks)}))
+
+
+def _make_token(private_key, kid, sub='clerk_test_student', **claims):
+    import jwt
+    import time
+    now = int(time.time())
+    payload = {'sub': sub, 'iat': now, 'exp': now + 60}
+    payload.update(claims)
+    return jwt.encode(payload, private_key, algorithm='RS256', headers={'kid': kid})
+
+
+class TestJWKSAuth:
+    @pytest.fixture
+    def signing_key(self):
+        return _make_signing_key('kid_1')
+
+    @pytest.fixture
+    def jwks_file(self, tmp_path, signing_key):
+        path = tmp_path / 'jwks.json'
+        _write_jwks(path, signing_key[1])
+        return path
+
+    def _get_user(self, app, token):
+        with patch('services.clerk_client.requests.Session.get') as mock_get:
+            mock_get.return_value = MagicMock(status_code=404)
+            return app.test_client().get('/api/user', headers={'Authorization': f'Bearer {token}'})
+
+    def test_valid_token_authenticates_without_sdk(self, app, student_user, signing_key, jwks_file):
+        token = _make_token(signing_key[0], 'kid_1')
+        with patch.dict(os.environ, {'CLERK_JWKS_URL': str(jwks_file)}), patch('auth.Clerk') as mock_clerk:
+            response = self._get_user(app, token)
+            assert response.status_code == 200
+            assert response.get_json()['user']['clerk_user_id'] == 'clerk_test_student'
+            mock_clerk.assert_not_called()
+
+    def test_session_cookie_accepted(self, app, student_user, signing_key, jwks_file):
+        token = _make_token(signing_key[0], 'kid_1')
+        with patch.dict(os.environ, {'CLERK_JWKS_URL': str(jwks_file)}), patch('services.clerk_client.requests.Session.get') as mock_get:
+            mock_get.return_value = MagicMock(status_code=404)
+            client = app.test_client()
+            client.set_cookie('__session', token)
+            response = client.get('/api/user')
+            assert response.status_code == 200
+
+    def test_missing_token_unauthorized(self, app, jwks_file):
+        with patch.dict(os.environ, {'CLERK_JWKS_URL': str(jwks_file)}):
+            response = app.test_client().get('/api/user')
+            assert response.status_code == 401
+
+    def test_expired_token_unauthorized(self, app, student_user, signing_key, jwks_file):
+        import time
+        past = int(time.time()) - 3600
+        token = _make_token(signing_key[0], 'kid_1', iat=past, exp=past + 60)
+        with patch.dict(os.environ, {'CLERK_JWKS_URL': str(jwks_file)}):
+            assert self._get_user(app, token).status_code == 401
+
+    def test_wrong_key_unauthorized(self, app, student_user, jwks_file):
+        other_private, _ = _make_signing_key('kid_1')
+        token = _make_token(other_private, 'kid_1')
+        with patch.dict(os.environ, {'CLERK_JWKS_URL': str(jwks_file)}):
+            assert self._get_user(app, token).status_code == 401
+
+    def test_unauthorized_party_rejected(self, app, student_user, signing_key, jwks_file):
+        token = _make_token(signing_key[0], 'kid_1', azp='https://evil.example.com')
+        env = {'CLERK_JWKS_URL': str(jwks_file), 'AUTHORIZED_PARTY': 'http://localhost:5173'}
+        with patch.dict(os.environ, env):
+            assert self._get_user(app, token).status_code == 401
+
+    def test_authorized_party_accepted(self, app, student_user, signing_key, jwks_file):
+        token = _make_token(signing_key[0], 'kid_1', azp='http://localhost:5173')
+        env = {'CLERK_JWKS_URL': str(jwks_file), 'AUTHORIZED_PARTY': 'http://localhost:5173,https://app.example.com'}
+        with patch.dict(os.environ, env):
+            assert self._get_user(app, token).status_code == 200
+
+
+class TestJWKSCache:
+    def test_keys_fetched_once(self, tmp_path):
+        from auth import JWKSCache
+        _, jwk = _make_signing_key('kid_1')
+        path = tmp_path / 'jwks.json'
+        _write_jwks(path, jwk)
+        cache = JWKSCache(str(path))
+
+        with patch.object(cache, '_load', wraps=cache._load) as mock_load:
+            assert cache.get_signing_key('kid_1').key_id == 'kid_1'
+            assert cache.get_signing_key('kid_1').key_id == 'kid_1'
+            assert mock_load.call_count == 1
+
+    def test_file_url_scheme(self, tmp_path):
+        from auth import JWKSCache
+        _, jwk = _make_signing_key('kid_1')
+        path = tmp_path / 'jwks.json'
+        _write_jwks(path, jwk)
+        cache = JWKSCache(f'file://{path}')
+        assert cache.get_signing_key('kid_1').key_id == 'kid_1'
+
+    def test_unknown_kid_triggers_refresh(self, tmp_path):
+        from auth import JWKSCache
+        _, jwk_1 = _make_signing_key('kid_1')
+        _, jwk_2 = _make_signing_key('kid_2')
+        path = tmp_path / 'jwks.json'
+        _write_jwks(path, jwk_1)
+        cache = JWKSCache(str(path), min_refresh_interval=0)
+        cache.get_signing_key('kid_1')
+
+        _write_jwks(path, jwk_1, jwk_2)
+        assert cache.get_signing_key('kid_2').key_id == 'kid_2'
+
+    def test_unknown_kid_refresh_rate_limited(self, tmp_path):
+        import jwt
+        from auth import JWKSCache
+        _, jwk = _make_signing_key('kid_1')
+        path = tmp_path / 'jwks.json'
+        _write_jwks(path, jwk)
+        cache = JWKSCache(str(path), min_refresh_interval=60)
+        cache.get_signing_key('kid_1')
+
+        with patch.object(cache, '_load') as mock_load:
+            with pytest.raises(jwt.InvalidTokenError):
+                cache.get_signing_key('kid_unknown')
+            mock_load.assert_not_called()
+
+    def test_ttl_expiry_refetches(self, tmp_path):
+        from auth import JWKSCache
+        _, jwk = _make_signing_key('kid_1')
+        path = tmp_path / 'jwks.json'
+        _write_jwks(path, jwk)
+        cache = JWKSCache(str(path), ttl=0)
+
+        with patch.object(cache, '_load', wraps=cache._load) as mock_load:
+            cache.get_signing_key('kid_1')
+            cache.get_signing_key('kid_1')
+            assert mock_load.call_count == 2
+
+    @patch('auth.requests.get')
+    def test_http_url_sends_secret(self, mock_get):
+        from auth import JWKSCache
+        _, jwk = _make_signing_key('kid_1')
+        mock_response = MagicMock()
+        mock_response.json.return_value = {'keys': [jwk]}
+        mock_get.return_value = mock_response
+
+        with patch.dict(os.environ, {'CLERK_SECRET_KEY': 'test_key'}):
+            cache = JWKSCache('https://api.clerk.com/v1/jwks')
+            assert cache.get_signing_key('kid_1').key_id == 'kid_1'
+
+        args, kwargs = mock_get.call_args
+        assert args[0] == 'https://api.clerk.com/v1/jwks'
+        assert kwargs['headers']['Authorization'] == 'Bearer test_key'
+
+    def test_get_jwks_cache_disabled_without_url(self):
+        from auth import get_jwks_cache
+        with patch.dict(os.environ, {}, clear=True):
+            assert get_jwks_cache() is None
+
+    def test_get_jwks_cache_reused_for_same_url(self, tmp_path):
+        from auth import get_jwks_cache
+        with patch.dict(os.environ, {'CLERK_JWKS_URL': str(tmp_path / 'a.json')}):
+            assert get_jwks_cache() is get_jwks_cache()
+        with patch.dict(os.environ, {'CLERK_JWKS_URL': str(tmp_path / 'b.json')}):
+            assert get_jwks_cache().url == str(tmp_path / 'b.json')
+
+
+class TestClerkUserCache:
+    @patch('services.clerk_client.requests.Session.get')
+    def test_fetch_clerk_user_cached(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'id': 'user_123'}
+        mock_get.return_value = mock_response
+
+        with patch.dict(os.environ, {'CLERK_SECRET_KEY': 'test_key'}):
+            assert fetch_clerk_user('user_123') == {'id': 'user_123'}
+            assert fetch_clerk_user('user_123') == {'id': 'user_123'}
+        assert mock_get.call_count == 1
+
+    @patch('services.clerk_client.requests.Session.get')
+    def test_fetch_clerk_user_miss_cached(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=404)
+
+        with patch.dict(os.environ, {'CLERK_SECRET_KEY': 'test_key'}):
+            assert fetch_clerk_user('user_404') is None
+            assert fetch_clerk_user('user_404') is None
+        assert mock_get.call_count == 1
+
+    @patch('services.clerk_client.requests.Session.get')
+    def test_require_auth_uses_cached_profile(self, mock_get, app, student_user):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'full_name': 'Test Student',
+            'email_addresses': [{'id': 'e1', 'email_address': 'student@test.com'}]
+        }
+        mock_get.return_value = mock_response
+
+        with patch('auth.Clerk') as mock_clerk, patch.dict(os.environ, {'CLERK_SECRET_KEY': 'test_key'}):
+            mock_sdk = MagicMock()
+            mock_sdk.authenticate_request.return_value = MagicMock(
+                is_signed_in=True, payload={'sub': 'clerk_test_student'}
+            )
+            mock_clerk.return_value = mock_sdk
+
+            client = app.test_client()
+            for _ in range(3):
+                response = client.get('/api/user', headers={'Authorization': 'Bearer test_token'})
+                assert response.status_code == 200
+        assert mock_get.call_count == 1
@@ -46,7 +46,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -78,7 +78,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -104,7 +104,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -135,7 +135,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -166,7 +166,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -197,7 +197,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -220,7 +220,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -243,7 +243,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -267,7 +267,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -290,7 +290,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -314,7 +314,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -340,7 +340,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -367,7 +367,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -394,7 +394,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -417,7 +417,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -442,7 +442,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -474,7 +474,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -500,7 +500,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -528,7 +528,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -573,7 +573,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -600,7 +600,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -648,7 +648,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -698,7 +698,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -725,7 +725,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -767,7 +767,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -812,7 +812,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -859,7 +859,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -884,7 +884,7 @@ class TestAvailabilityHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
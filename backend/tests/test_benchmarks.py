@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db, User, Session, Feedback, TutorStats
+from benchmarks.generate import generate_population
+from benchmarks import run_matching
+
+
+class TestGenerator:
+    def test_deterministic_population(self, app):
+        with app.app_context():
+            student_ids = generate_population(tutors=4, students=10, sessions=200, seed=1)
+            assert len(student_ids) == 10
+            assert User.query.filter_by(role='tutor').count() == 4
+            assert Session.query.count() == 200
+            assert TutorStats.query.count() > 0
+            first = [(s.tutor_id, s.student_id, s.start_time, s.status)
+                     for s in Session.query.order_by(Session.id).limit(20)]
+            feedback = Feedback.query.count()
+
+            db.drop_all()
+            db.create_all()
+            generate_population(tutors=4, students=10, sessions=200, seed=1)
+            assert [(s.tutor_id, s.student_id, s.start_time, s.status)
+                    for s in Session.query.order_by(Session.id).limit(20)] == first
+            assert Feedback.query.count() == feedback
+
+
+class TestRunner:
+    def test_writes_report_and_compares(self, tmp_path, capsys):
+        output = tmp_path / 'run.json'
+        args = ['--tutors', '3', '--students', '8', '--sessions', '50', '--calls', '2', '--memory-calls', '1',
+                '--data-dir', str(tmp_path), '--output', str(output)]
+        assert run_matching.main(args) == 0
+        assert 'Generating' in capsys.readouterr().out
+
+        report = json.loads(output.read_text())
+        assert report['params']['sessions'] == 50
+        assert set(report['scenarios']) == set(run_matching.scenarios([]))
+        recommend = report['scenarios']['recommend']
+        assert recommend['calls'] == 2
+        assert recommend['queries']['max'] >= 1
+        assert recommend['peak_memory_kib']['max'] > 0
+
+        # The data file is reused on the second run.
+        baseline = tmp_path / 'baseline.json'
+        slower = dict(report, scenarios={
+            name: dict(result, wall_ms=dict(result['wall_ms'], median=result['wall_ms']['median'] * 1000))
+            for name, result in report['scenarios'].items()
+        })
+        baseline.write_text(json.dumps(slower))
+        assert run_matching.main(args + ['--scenario', 'recommend', '--compare', str(baseline)]) == 0
+        assert 'Generating' not in capsys.readouterr().out
+
+    def test_compare_flags_regressions(self):
+        current = {'scenarios': {'a': {'wall_ms': {'median': 30.0}}, 'b': {'wall_ms': {'median': 10.0}}}}
+        baseline = {'scenarios': {'a': {'wall_ms': {'median': 10.0}}, 'b': {'wall_ms': {'median': 10.0}}}}
+        assert run_matching.compare(current, baseline, 0.2) == [('a', 3.0)]
+        assert run_matching.compare(current, {'scenarios': {}}, 0.2) == []
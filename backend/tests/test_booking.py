@@ -0,0 +1,226 @@
+import pytest
+import sys
+import os
+import threading
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db, User, Session, TutorStats, StudentSessionRollup
+from services import change_tracking
+from services.booking import (
+    BookingConflict,
+    InvalidBooking,
+    apply_session_update,
+    book_slot,
+    booking_window,
+    claim_slot,
+)
+from benchmarks import create_benchmark_app, run_booking
+
+START = datetime(2025, 1, 6, 13, 0)
+
+
+class TestBookSlot:
+    def test_books_and_commits(self, app, tutor_user, student_user):
+        with app.app_context():
+            session = book_slot(student_user.id, tutor_user.id, START, START + timedelta(hours=1),
+                                course='Chinese 101', session_type='online')
+            session_id = session.id
+            db.session.remove()
+            stored = db.session.get(Session, session_id)
+            assert (stored.status, stored.student_id) == ('booked', student_user.id)
+            assert db.session.get(TutorStats, tutor_user.id).booked_session_count == 1
+
+    def test_overlap_conflicts_and_rolls_back(self, app, tutor_user, student_user, session_obj):
+        with app.app_context():
+            with pytest.raises(BookingConflict):
+                book_slot(student_user.id, tutor_user.id, session_obj.start_time + timedelta(minutes=30),
+                          session_obj.end_time + timedelta(minutes=30), session_type='online')
+            assert Session.query.count() == 1
+            assert TutorStats.query.count() == 0
+
+    def test_adjacent_slots_do_not_conflict(self, app, tutor_user, student_user, session_obj):
+        with app.app_context():
+            book_slot(student_user.id, tutor_user.id, session_obj.end_time,
+                      session_obj.end_time + timedelta(hours=1), session_type='online')
+            assert Session.query.count() == 2
+
+    def test_counters_are_bumped_after_the_commit(self, app, tutor_user, student_user):
+        seen = []
+
+        def on_booked(session):
+            seen.append(change_tracking.versions(change_tracking.BOOKINGS))
+
+        with app.app_context():
+            book_slot(student_user.id, tutor_user.id, START, START + timedelta(hours=1),
+                      session_type='online', on_booked=on_booked)
+            assert seen == [(0,)]
+            assert change_tracking.versions(
+                change_tracking.BOOKINGS, change_tracking.student_key(student_user.id)) == (1, 1)
+
+
+class TestClaimSlot:
+    def test_claims_available_slot(self, app, tutor_user, student_user, available_session):
+        with app.app_context():
+            session = db.session.get(Session, available_session.id)
+            assert claim_slot(session.id, student_user.id) == tutor_user.id
+            assert (session.status, session.student_id) == ('booked', student_user.id)
+            db.session.commit()
+            assert db.session.get(TutorStats, tutor_user.id).booked_session_count == 1
+            assert StudentSessionRollup.query.one().session_count == 1
+            assert change_tracking.versions(change_tracking.table_key('sessions'))[0] >= 1
+
+    def test_claim_is_a_single_statement(self, app, student_user, available_session, count_queries):
+        with app.app_context():
+            with count_queries() as statements:
+                claim_slot(available_session.id, student_user.id)
+            # The claim is decided by the first statement; the rest is bookkeeping.
+            assert statements[0].startswith('UPDATE sessions')
+            assert 'sessions.status = ?' in statements[0]
+            assert sum(s.startswith('UPDATE sessions') for s in statements) == 1
+
+    @pytest.mark.parametrize('status', ['booked', 'cancelled'])
+    def test_only_available_slots_can_be_claimed(self, app, student_user, available_session, status):
+        with app.app_context():
+            db.session.get(Session, available_session.id).status = status
+            db.session.commit()
+            with pytest.raises(BookingConflict):
+                claim_slot(available_session.id, student_user.id)
+
+    def test_missing_slot(self, app, student_user):
+        with app.app_context():
+            with pytest.raises(BookingConflict):
+                claim_slot(999, student_user.id)
+
+    def test_concurrent_claims_have_one_winner(self, tmp_path):
+        app = create_benchmark_app(tmp_path / 'claim.db')
+        with app.app_context():
+            db.create_all()
+            tutor = User(clerk_user_id='t', name='Tutor', email='t@test.com', role='tutor')
+            students = [User(clerk_user_id=f's{i}', name=f'S{i}', email=f's{i}@test.com', role='student')
+                        for i in range(20)]
+            db.session.add_all([tutor] + students)
+            db.session.flush()
+            slot = Session(tutor_id=tutor.id, session_type='online', status='available',
+                           start_time=START, end_time=START + timedelta(hours=1))
+            db.session.add(slot)
+            db.session.commit()
+            slot_id, student_ids = slot.id, [s.id for s in students]
+
+        outcomes, barrier = [], threading.Barrier(len(student_ids))
+
+        def claimer(student_id):
+            with app.app_context():
+                barrier.wait()
+                try:
+                    claim_slot(slot_id, student_id)
+                    db.session.commit()
+                    outcomes.append(('won', student_id))
+                except BookingConflict:
+                    db.session.rollback()
+                    outcomes.append(('lost', student_id))
+                except Exception as e:
+                    outcomes.append(('error', repr(e)))
+                db.session.remove()
+
+        threads = [threading.Thread(target=claimer, args=(sid,)) for sid in student_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        winners = [sid for outcome, sid in outcomes if outcome == 'won']
+        assert len(winners) == 1
+        assert sorted(outcome for outcome, _ in outcomes) == ['lost'] * 19 + ['won']
+        with app.app_context():
+            assert db.session.get(Session, slot_id).student_id == winners[0]
+            db.session.remove()
+
+
+class TestBookingWindow:
+    def test_recurring_window_matches_time_of_day(self, app, availability):
+        with app.app_context():
+            assert booking_window(availability, '2025-02-03T10:00:00', '2025-02-03T11:00:00') == (
+                datetime(2025, 2, 3, 10), datetime(2025, 2, 3, 11))
+
+    @pytest.mark.parametrize('start, end, message, status', [
+        ('soon', '2025-01-06T11:00:00', 'Invalid datetime format', 400),
+        ('2025-01-06T11:00:00', '2025-01-06T10:00:00', 'end_time must be after start_time', 400),
+        ('2025-01-06T16:30:00', '2025-01-06T17:30:00', 'Requested time outside availability window', 409),
+    ])
+    def test_rejections(self, app, availability, start, end, message, status):
+        with app.app_context():
+            with pytest.raises(InvalidBooking) as excinfo:
+                booking_window(availability, start, end)
+            assert (str(excinfo.value), excinfo.value.status) == (message, status)
+
+
+class TestApplySessionUpdate:
+    def test_sets_fields(self, app, session_obj):
+        with app.app_context():
+            session = db.session.get(Session, session_obj.id)
+            apply_session_update(session, {'course': 'Chinese 201', 'end_time': '2025-01-06T12:00:00'})
+            assert (session.course, session.end_time) == ('Chinese 201', datetime(2025, 1, 6, 12))
+
+    @pytest.mark.parametrize('data, message, status', [
+        ({'tutor_id': 99999}, 'Tutor not found', 404),
+        ({'student_id': 99999}, 'Student not found', 404),
+        ({'start_time': 'soon'}, 'Invalid datetime format for start_time', 400),
+    ])
+    def test_rejections_leave_session_unchanged(self, app, session_obj, data, message, status):
+        with app.app_context():
+            session = db.session.get(Session, session_obj.id)
+            with pytest.raises(InvalidBooking) as excinfo:
+                apply_session_update(session, dict(data, course='Chinese 201'))
+            assert (str(excinfo.value), excinfo.value.status) == (message, status)
+            assert session.course == 'Chinese 101'
+
+
+def test_book_existing_route(app, auth_client, student_user, available_session):
+    response = auth_client.post(f'/api/sessions/{available_session.id}/book')
+    assert response.status_code == 200
+    assert response.get_json()['session']['student_id'] == student_user.id
+    again = auth_client.post(f'/api/sessions/{available_session.id}/book')
+    assert again.get_json() == {'error': 'Session already booked'}
+
+
+def test_update_session_claims_open_slot(app, tutor_auth_client, tutor_user, student_user, available_session):
+    response = tutor_auth_client.put(f'/api/sessions/{available_session.id}',
+                                     json={'status': 'booked', 'student_id': student_user.id})
+    assert response.status_code == 200
+    with app.app_context():
+        assert db.session.get(TutorStats, tutor_user.id).booked_session_count == 1
+
+
+def test_route_returns_409_on_conflict(app, auth_client, availability, session_obj):
+    response = auth_client.post('/api/sessions/book', json={
+        'availability_id': availability.id,
+        'start_time': '2025-01-06T10:30:00',
+        'end_time': '2025-01-06T11:30:00',
+    })
+    assert response.status_code == 409
+    assert response.get_json() == {'error': 'Tutor already has a session at this time'}
+
+
+def test_update_route_returns_validation_errors(app, tutor_auth_client, session_obj):
+    response = tutor_auth_client.put(f'/api/sessions/{session_obj.id}', json={'tutor_id': 99999})
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Tutor not found'}
+
+
+class TestConcurrentBooking:
+    def test_fifty_bookers_never_double_book(self, tmp_path):
+        report = run_booking.run(bookers=50, tutors=3, attempts=6, data_dir=str(tmp_path), log=lambda *_: None)
+        assert report['errors'] == []
+        assert report['double_bookings'] == 0
+        assert report['booked'] + report['conflicts'] == 300
+        assert report['stored_sessions'] == report['booked'] > 0
+        assert report['attempts_per_s'] > 0
+
+    def test_main(self, tmp_path, capsys):
+        output = tmp_path / 'booking.json'
+        assert run_booking.main(['--bookers', '4', '--tutors', '1', '--attempts', '3',
+                                 '--data-dir', str(tmp_path), '--output', str(output)]) == 0
+        assert '0 double-bookings' in capsys.readouterr().out
+        assert output.exists()
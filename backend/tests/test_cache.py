@@ -0,0 +1,151 @@
+import pytest
+import sys
+import os
+import threading
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_get_missing_returns_default(self):
+        cache = TTLCache()
+        assert cache.get('missing') is None
+        assert cache.get('missing', 'fallback') == 'fallback'
+
+    def test_set_and_get(self):
+        cache = TTLCache()
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+        assert len(cache) == 1
+
+    def test_entry_expires(self):
+        cache = TTLCache(ttl=10)
+        with patch('services.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with patch('services.cache.time.monotonic', return_value=109.0):
+            assert cache.get('a') == 1
+        with patch('services.cache.time.monotonic', return_value=110.0):
+            assert cache.get('a') is None
+            assert cache.get('a', allow_stale=True) == 1
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('c') == 3
+
+    def test_invalidate_and_clear(self):
+        cache = TTLCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.invalidate('a')
+        assert cache.get('a') is None
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_get_or_load_caches_value(self):
+        cache = TTLCache()
+        calls = []
+
+        def loader(key):
+            calls.append(key)
+            return key.upper()
+
+        assert cache.get_or_load('a', loader) == 'A'
+        assert cache.get_or_load('a', loader) == 'A'
+        assert calls == ['a']
+
+    def test_get_or_load_negative_cache(self):
+        cache = TTLCache(ttl=60, negative_ttl=5)
+        calls = []
+
+        def loader(key):
+            calls.append(key)
+            return None
+
+        with patch('services.cache.time.monotonic', return_value=100.0):
+            assert cache.get_or_load('a', loader) is None
+            assert cache.get_or_load('a', loader) is None
+        assert calls == ['a']
+        with patch('services.cache.time.monotonic', return_value=105.0):
+            cache.get_or_load('a', loader)
+        assert calls == ['a', 'a']
+
+    def test_get_or_load_errors_not_cached(self):
+        cache = TTLCache()
+        calls = []
+
+        def loader(key):
+            calls.append(key)
+            if len(calls) == 1:
+                raise RuntimeError('upstream down')
+            return 'ok'
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_load('a', loader)
+        assert cache.get_or_load('a', loader) == 'ok'
+
+    def test_get_or_load_coalesces_concurrent_loads(self):
+        cache = TTLCache()
+        calls = []
+        started = threading.Event()
+
+        def loader(key):
+            calls.append(key)
+            started.set()
+            time.sleep(0.05)
+            return 'value'
+
+        results = []
+
+        def worker():
+            results.append(cache.get_or_load('a', loader))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        threads[0].start()
+        started.wait(1)
+        for t in threads[1:]:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert calls == ['a']
+        assert results == ['value'] * 8
+
+    def test_get_or_load_propagates_error_to_waiters(self):
+        cache = TTLCache()
+        started = threading.Event()
+        release = threading.Event()
+
+        def loader(key):
+            started.set()
+            release.wait(1)
+            raise RuntimeError('boom')
+
+        errors = []
+
+        def worker():
+            try:
+                cache.get_or_load('a', loader)
+            except RuntimeError as e:
+                errors.append(str(e))
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait(1)
+        follower = threading.Thread(target=worker)
+        follower.start()
+        time.sleep(0.02)
+        release.set()
+        leader.join()
+        follower.join()
+
+        assert errors == ['boom', 'boom']
@@ -0,0 +1,87 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from models import db
+from services import change_tracking
+
+
+class TestChangeCounters:
+    def test_unknown_keys_are_zero(self, app):
+        with app.app_context():
+            assert change_tracking.versions('a', 'b') == (0, 0)
+
+    def test_bump_increments(self, app):
+        with app.app_context():
+            change_tracking.bump('a')
+            change_tracking.bump('a', 'b')
+            db.session.commit()
+            assert change_tracking.versions('b', 'a', 'c') == (1, 2, 0)
+
+    def test_bump_ignores_duplicates_and_none(self, app):
+        with app.app_context():
+            change_tracking.bump('a', 'a', None)
+            db.session.commit()
+            assert change_tracking.versions('a') == (1,)
+
+    def test_bump_rolls_back_with_transaction(self, app):
+        with app.app_context():
+            change_tracking.bump('a')
+            db.session.rollback()
+            assert change_tracking.versions('a') == (0,)
+
+    def test_bump_takes_keys_in_sorted_order(self, app, count_queries):
+        with app.app_context():
+            with count_queries(parameters=True) as statements:
+                change_tracking.bump('b', 'c', 'a')
+            keys = [params[-1] for statement, params in statements
+                    if statement.startswith('UPDATE change_counters')]
+            assert keys == ['a', 'b', 'c']
+
+    def test_bump_after_commit(self, app):
+        with app.app_context():
+            change_tracking.bump_after_commit('a', None)
+            assert change_tracking.versions('a') == (0,)
+            db.session.commit()
+            assert change_tracking.versions('a') == (1,)
+            db.session.commit()
+            assert change_tracking.versions('a') == (1,)
+
+    def test_bump_after_commit_waits_for_the_outer_transaction(self, app):
+        with app.app_context():
+            with db.session.begin_nested():
+                change_tracking.bump_after_commit('a')
+            assert change_tracking.versions('a') == (0,)
+            db.session.commit()
+            assert change_tracking.versions('a') == (1,)
+
+    def test_bump_after_commit_dropped_on_rollback(self, app):
+        with app.app_context():
+            change_tracking.bump_after_commit('a')
+            db.session.rollback()
+            db.session.commit()
+            assert change_tracking.versions('a') == (0,)
+
+    def test_writes_bump_counters_after_commit(self, app, auth_client, student_user, session_obj, count_queries):
+        with app.app_context():
+            engine = db.engine
+        with count_queries() as statements:
+            def commit(conn):
+                statements.append('COMMIT')
+
+            event.listen(engine, 'commit', commit)
+            try:
+                response = auth_client.post('/api/feedback', json={'session_id': session_obj.id, 'rating': 5})
+            finally:
+                event.remove(engine, 'commit', commit)
+        assert response.status_code == 201
+        labels = ['feedback' if s.startswith('INSERT INTO feedbacks')
+                  else 'counter' if s.startswith('UPDATE change_counters')
+                  else s for s in statements]
+        writes = labels[labels.index('feedback'):]
+        assert writes.index('COMMIT') < writes.index('counter')
+
+    def test_student_key(self):
+        assert change_tracking.student_key(7) == 'student:7'
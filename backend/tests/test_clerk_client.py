@@ -0,0 +1,197 @@
+import pytest
+import sys
+import os
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.clerk_client import ClerkClient, CircuitBreaker, ClerkUnavailable
+
+
+class FakeClerk:
+    """Local stand-in for the Clerk Backend API. Responses are served from a
+    queue of (status, body) pairs; once it is empty every call gets `default`."""
+
+    def __init__(self):
+        self.responses = []
+        self.default = (200, {'id': 'user_123'})
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                fake.requests.append({
+                    'method': self.command,
+                    'path': self.path,
+                    'headers': dict(self.headers),
+                    'body': json.loads(body) if body else None,
+                })
+                status, payload = fake.responses.pop(0) if fake.responses else fake.default
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = _respond
+            do_PATCH = _respond
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/v1'
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_clerk():
+    fake = FakeClerk()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def client(fake_clerk):
+    return ClerkClient(base_url=fake_clerk.url, retries=2, backoff=0, read_timeout=2)
+
+
+class TestClerkClient:
+    def test_get_user(self, client, fake_clerk):
+        assert client.get_user('user_123', secret_key='sk_test') == {'id': 'user_123'}
+        request = fake_clerk.requests[0]
+        assert request['path'] == '/v1/users/user_123'
+        assert request['headers']['Authorization'] == 'Bearer sk_test'
+
+    def test_get_user_not_found(self, client, fake_clerk):
+        fake_clerk.responses = [(404, {'errors': []})]
+        assert client.get_user('missing') is None
+        assert len(fake_clerk.requests) == 1
+
+    def test_get_user_retries_server_errors(self, client, fake_clerk):
+        fake_clerk.responses = [(503, {}), (502, {}), (200, {'id': 'user_123'})]
+        assert client.get_user('user_123') == {'id': 'user_123'}
+        assert len(fake_clerk.requests) == 3
+
+    def test_get_user_gives_up_after_retries(self, client, fake_clerk):
+        fake_clerk.default = (500, {})
+        with pytest.raises(ClerkUnavailable):
+            client.get_user('user_123')
+        assert len(fake_clerk.requests) == 3
+
+    def test_update_user_metadata(self, client, fake_clerk):
+        assert client.update_user_metadata('user_123', {'role': 'tutor'}, secret_key='sk') is True
+        request = fake_clerk.requests[0]
+        assert request['method'] == 'PATCH'
+        assert request['path'] == '/v1/users/user_123/metadata'
+        assert request['body'] == {'public_metadata': {'role': 'tutor'}}
+
+    def test_update_user_metadata_client_error(self, client, fake_clerk):
+        fake_clerk.responses = [(422, {})]
+        assert client.update_user_metadata('user_123', {'role': 'tutor'}) is False
+
+    def test_connections_are_reused(self, client, fake_clerk):
+        for _ in range(3):
+            client.get_user('user_123')
+        adapter = client.session.get_adapter(fake_clerk.url)
+        pool = adapter.poolmanager.connection_from_url(fake_clerk.url)
+        assert pool.num_connections == 1
+
+    def test_connection_error_opens_breaker(self):
+        client = ClerkClient(
+            base_url='http://127.0.0.1:9/v1', retries=0, backoff=0, connect_timeout=0.2,
+            breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60),
+        )
+        for _ in range(2):
+            with pytest.raises(ClerkUnavailable):
+                client.get_user('user_123')
+        assert client.breaker.state == CircuitBreaker.OPEN
+
+        with patch.object(client.session, 'get') as mock_get:
+            with pytest.raises(ClerkUnavailable):
+                client.get_user('user_123')
+            mock_get.assert_not_called()
+
+    def test_breaker_half_open_recovers(self, fake_clerk):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        client = ClerkClient(base_url=fake_clerk.url, retries=0, backoff=0, breaker=breaker)
+        fake_clerk.responses = [(500, {})]
+        with pytest.raises(ClerkUnavailable):
+            client.get_user('user_123')
+        assert breaker.state == CircuitBreaker.OPEN
+
+        assert client.get_user('user_123') == {'id': 'user_123'}
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.allow() is True
+        breaker.record_failure()
+        assert breaker.allow() is False
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        with patch('services.clerk_client.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        with patch('services.clerk_client.time.monotonic', return_value=111.0):
+            assert breaker.allow() is True
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert breaker.allow() is False
+            breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+
+class TestFetchClerkUserFallback:
+    def test_serves_stale_profile_when_upstream_down(self):
+        import auth
+        with patch.dict(os.environ, {'CLERK_SECRET_KEY': 'sk'}):
+            with patch('services.cache.time.monotonic', return_value=100.0):
+                auth.clerk_user_cache.set('user_123', {'id': 'user_123'})
+            with patch('services.cache.time.monotonic', return_value=10000.0), \
+                    patch.object(auth.clerk_client, 'get_user', side_effect=ClerkUnavailable('down')):
+                assert auth.fetch_clerk_user('user_123') == {'id': 'user_123'}
+
+    def test_returns_none_without_cached_profile(self):
+        import auth
+        with patch.dict(os.environ, {'CLERK_SECRET_KEY': 'sk'}), \
+                patch.object(auth.clerk_client, 'get_user', side_effect=ClerkUnavailable('down')):
+            assert auth.fetch_clerk_user('user_123') is None
+
+    def test_require_auth_falls_back_to_token_claims(self, app, student_user):
+        import auth
+        from unittest.mock import MagicMock
+        with patch.dict(os.environ, {'CLERK_SECRET_KEY': 'sk'}), patch('auth.Clerk') as mock_clerk, \
+                patch.object(auth.clerk_client, 'get_user', side_effect=ClerkUnavailable('down')):
+            mock_sdk = MagicMock()
+            mock_sdk.authenticate_request.return_value = MagicMock(
+                is_signed_in=True,
+                payload={'sub': 'clerk_test_student', 'name': 'Test Student', 'email': 'student@test.com'},
+            )
+            mock_clerk.return_value = mock_sdk
+            response = app.test_client().get('/api/user', headers={'Authorization': 'Bearer t'})
+            assert response.status_code == 200
+            assert response.get_json()['user']['email'] == 'student@test.com'
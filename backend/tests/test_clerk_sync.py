@@ -0,0 +1,82 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db, User, Tutor
+from services.clerk_sync import apply_role, apply_user_event, reconcile_roles
+from services.tasks import task_runner
+
+
+class TestApplyRole:
+    def test_same_role_is_noop(self, app, student_user):
+        with app.app_context():
+            user = User.query.get(student_user.id)
+            assert apply_role(user, 'student') is False
+            assert apply_role(user, None) is False
+
+    def test_tutor_role_creates_profile_once(self, app, student_user):
+        with app.app_context():
+            user = User.query.get(student_user.id)
+            assert apply_role(user, 'tutor') is True
+            db.session.commit()
+            assert Tutor.query.filter_by(user_id=user.id).count() == 1
+
+    def test_existing_tutor_profile_reused(self, app, tutor_user, tutor_profile):
+        with app.app_context():
+            user = User.query.get(tutor_user.id)
+            user.role = 'student'
+            db.session.commit()
+            assert apply_role(user, 'tutor') is True
+            db.session.commit()
+            assert Tutor.query.filter_by(user_id=user.id).count() == 1
+
+
+class TestApplyUserEvent:
+    def test_missing_user_id_raises(self, app):
+        with app.app_context():
+            with pytest.raises(ValueError):
+                apply_user_event({'type': 'user.updated', 'data': {}})
+
+    def test_unchanged_role_not_committed(self, app, student_user):
+        with app.app_context():
+            event = {'type': 'user.updated', 'data': {'id': 'clerk_test_student',
+                                                      'public_metadata': {'role': 'student'}}}
+            with patch.object(db.session, 'commit') as mock_commit:
+                assert apply_user_event(event) is False
+                mock_commit.assert_not_called()
+
+    def test_ignored_events_are_not_task_failures(self, app, student_user):
+        task_runner.failures.clear()
+        events = [
+            {'type': 'session.created', 'data': {'id': 'sess_1'}},
+            {'type': 'user.updated', 'data': {'id': 'clerk_test_student', 'public_metadata': {'role': 'student'}}},
+        ]
+        with app.app_context():
+            for event in events:
+                task_runner.submit(apply_user_event, event)
+        assert task_runner.recent_failures() == []
+
+
+class TestReconcileRoles:
+    def test_pages_through_users_and_fixes_drift(self, app, student_user, tutor_user):
+        pages = [
+            [{'id': 'clerk_test_student', 'public_metadata': {'role': 'professor'}},
+             {'id': 'clerk_unknown', 'public_metadata': {'role': 'tutor'}}],
+            [{'id': 'clerk_test_tutor', 'public_metadata': {'role': 'tutor'}}],
+        ]
+        with app.app_context():
+            with patch('services.clerk_sync.clerk_client.list_users', side_effect=pages) as mock_list:
+                changed = reconcile_roles(page_size=2)
+
+            assert changed == 1
+            assert mock_list.call_args_list[1].kwargs == {'limit': 2, 'offset': 2}
+            assert User.query.filter_by(clerk_user_id='clerk_test_student').first().role == 'professor'
+            assert User.query.filter_by(clerk_user_id='clerk_test_tutor').first().role == 'tutor'
+
+    def test_empty_directory(self, app):
+        with app.app_context():
+            with patch('services.clerk_sync.clerk_client.list_users', return_value=[]):
+                assert reconcile_roles() == 0
@@ -0,0 +1,133 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import request
+from models import db, Session, Invitation
+from conditional import request_etag
+from services import change_tracking
+
+POLLED = [
+    ('tutor_auth_client', '/api/tutor/dashboard'),
+    ('professor_auth_client', '/api/professor/dashboard'),
+    ('auth_client', '/api/student/sessions'),
+    ('tutor_auth_client', '/api/tutor/sessions'),
+    ('auth_client', '/api/availability/all'),
+    ('auth_client', '/api/sessions/all'),
+]
+
+
+def _table_version(name):
+    return change_tracking.versions(change_tracking.table_key(name))[0]
+
+
+class TestTableCounters:
+    def test_orm_writes_bump_their_table(self, app, tutor_user, student_user):
+        with app.app_context():
+            start = datetime(2025, 2, 3, 10, 0)
+            session = Session(tutor_id=tutor_user.id, student_id=student_user.id, course='Chinese 101',
+                              session_type='online', start_time=start, end_time=start + timedelta(hours=1),
+                              status='booked')
+            db.session.add(session)
+            db.session.commit()
+            assert _table_version('sessions') == 1
+
+            session.status = 'cancelled'
+            db.session.commit()
+            db.session.delete(session)
+            db.session.commit()
+            assert _table_version('sessions') == 3
+
+    def test_counters_are_written_once_after_commit(self, app, session_obj, count_queries):
+        with count_queries() as statements, app.app_context():
+            before = _table_version('sessions')
+            session = db.session.get(Session, session_obj.id)
+            session.course = 'Chinese 201'
+            db.session.flush()
+            session.status = 'cancelled'
+            db.session.flush()
+            assert not any(s.startswith(('INSERT', 'UPDATE')) and 'change_counters' in s for s in statements)
+            db.session.commit()
+            assert _table_version('sessions') == before + 1
+
+    def test_rolled_back_writes_do_not_bump(self, app, session_obj):
+        with app.app_context():
+            before = _table_version('sessions')
+            db.session.get(Session, session_obj.id).course = 'Chinese 201'
+            db.session.flush()
+            db.session.rollback()
+            db.session.commit()
+            assert _table_version('sessions') == before
+
+    def test_untracked_and_unchanged_objects_do_not_bump(self, app, session_obj, professor_user):
+        with app.app_context():
+            before = _table_version('sessions')
+            session = db.session.get(Session, session_obj.id)
+            session.status = session.status
+            db.session.add(Invitation(email='new@test.com', role='tutor', invited_by=professor_user.id))
+            db.session.commit()
+            assert _table_version('sessions') == before
+            assert _table_version('invitations') == 0
+
+
+class TestConditionalGet:
+    @pytest.mark.parametrize('client_name, path', POLLED)
+    def test_unchanged_poll_is_304(self, app, request, session_obj, availability, client_name, path,
+                                   count_queries):
+        client = request.getfixturevalue(client_name)
+        first = client.get(path)
+        assert first.status_code == 200
+        assert first.headers['ETag']
+        assert first.headers['Cache-Control'] == 'private, no-cache'
+
+        with count_queries() as cold:
+            client.get(path)
+        with count_queries() as warm:
+            second = client.get(path, headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 304
+        assert second.data == b''
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert len(warm) < len(cold)
+
+    def test_write_invalidates(self, app, auth_client, session_obj):
+        etag = auth_client.get('/api/student/sessions').headers['ETag']
+        with app.app_context():
+            db.session.get(Session, session_obj.id).course = 'Chinese 201'
+            db.session.commit()
+        response = auth_client.get('/api/student/sessions', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+    def test_query_string_and_accept_vary(self, app, auth_client, session_obj):
+        plain = auth_client.get('/api/sessions/all').headers['ETag']
+        assert auth_client.get('/api/sessions/all?limit=5').headers['ETag'] != plain
+        ndjson = auth_client.get('/api/sessions/all', headers={'Accept': 'application/x-ndjson'})
+        assert ndjson.headers['ETag'] != plain
+
+    def test_tag_is_per_user(self, app, student_user, tutor_user):
+        with app.test_request_context('/api/sessions/all'):
+            request.db_user = student_user
+            student_tag = request_etag(['sessions'])
+            request.db_user = tutor_user
+            assert request_etag(['sessions']) != student_tag
+
+    def test_dashboard_tag_rolls_over_daily(self, app, tutor_auth_client, session_obj):
+        etag = tutor_auth_client.get('/api/tutor/dashboard').headers['ETag']
+
+        class Tomorrow(datetime):
+            @classmethod
+            def utcnow(cls):
+                return datetime.utcnow() + timedelta(days=1)
+
+        with patch('conditional.datetime', Tomorrow):
+            response = tutor_auth_client.get('/api/tutor/dashboard', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+
+    def test_errors_are_not_tagged(self, app, auth_client):
+        response = auth_client.get('/api/professor/dashboard')
+        assert response.status_code == 403
+        assert 'ETag' not in response.headers
@@ -0,0 +1,203 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db, User, Session, SessionNote, Feedback, DailySessionRollup, StudentSessionRollup
+from services import dashboard_service
+from services.dashboard_rollups import daily_rows, student_rows, rebuild_dashboard_rollups, refresh
+
+NOW = datetime(2025, 3, 12, 15, 0)
+DAILY_FIELDS = ('day', 'tutor_id', 'course', 'iso_week', 'session_count', 'booked_seconds',
+                'attended_count', 'rating_sum', 'rating_count', 'first_session_id')
+STUDENT_FIELDS = ('student_id', 'tutor_id', 'course', 'session_count', 'first_session_id')
+
+
+def _table(model, fields):
+    return sorted(tuple(getattr(row, f) for f in fields) for row in model.query.all())
+
+
+def _expected(rows, fields):
+    return sorted(tuple(row[f] for f in fields) for row in rows)
+
+
+def assert_in_sync():
+    db.session.expire_all()
+    conn = db.session.connection()
+    assert _table(DailySessionRollup, DAILY_FIELDS) == _expected(daily_rows(conn), DAILY_FIELDS)
+    assert _table(StudentSessionRollup, STUDENT_FIELDS) == _expected(student_rows(conn), STUDENT_FIELDS)
+
+
+def _booked(tutor_id, student_id, start, minutes=60, course='Chinese 101', status='booked'):
+    session = Session(tutor_id=tutor_id, student_id=student_id, course=course, session_type='online',
+                      start_time=start, end_time=start + timedelta(minutes=minutes), status=status)
+    db.session.add(session)
+    db.session.commit()
+    return session
+
+
+class TestIncrementalMaintenance:
+    def test_booking_creates_rows(self, app, tutor_user, student_user):
+        with app.app_context():
+            _booked(tutor_user.id, student_user.id, datetime(2025, 3, 11, 10, 0), minutes=90)
+            row = DailySessionRollup.query.one()
+            assert (row.day.isoformat(), row.session_count, row.booked_seconds) == ('2025-03-11', 1, 5400.0)
+            assert row.iso_week == 11
+            assert StudentSessionRollup.query.one().session_count == 1
+            assert_in_sync()
+
+    def test_available_sessions_are_not_counted(self, app, tutor_user, available_session):
+        with app.app_context():
+            assert DailySessionRollup.query.count() == 0
+
+    def test_status_course_and_time_changes(self, app, tutor_user, student_user, session_obj):
+        with app.app_context():
+            session = db.session.get(Session, session_obj.id)
+            session.course = 'Chinese 201'
+            db.session.commit()
+            assert_in_sync()
+            session.start_time += timedelta(days=3)
+            session.end_time += timedelta(days=3)
+            db.session.commit()
+            assert [r.day.isoformat() for r in DailySessionRollup.query] == ['2025-01-09']
+            assert_in_sync()
+            session.status = 'cancelled'
+            db.session.commit()
+            assert DailySessionRollup.query.count() == 0
+            assert StudentSessionRollup.query.count() == 0
+
+    def test_notes_and_feedback(self, app, tutor_user, student_user, session_obj):
+        with app.app_context():
+            note = SessionNote(session_id=session_obj.id, tutor_id=tutor_user.id, attendance_status='absent')
+            feedback = Feedback(session_id=session_obj.id, student_id=student_user.id, rating=3)
+            db.session.add_all([note, feedback])
+            db.session.commit()
+            row = DailySessionRollup.query.one()
+            assert (row.attended_count, row.rating_sum, row.rating_count) == (0, 3.0, 1)
+
+            note.attendance_status = 'present'
+            feedback.rating = 5
+            db.session.commit()
+            db.session.expire_all()
+            row = DailySessionRollup.query.one()
+            assert (row.attended_count, row.rating_sum) == (1, 5.0)
+
+            db.session.delete(feedback)
+            db.session.commit()
+            assert DailySessionRollup.query.one().rating_count == 0
+            assert_in_sync()
+
+    def test_delete_session(self, app, tutor_user, student_user, session_obj):
+        with app.app_context():
+            db.session.delete(db.session.get(Session, session_obj.id))
+            db.session.commit()
+            assert DailySessionRollup.query.count() == 0
+            assert StudentSessionRollup.query.count() == 0
+
+    def test_unrelated_changes_skip_refresh(self, app, session_obj, count_queries):
+        with app.app_context():
+            session = db.session.get(Session, session_obj.id)
+            session.session_type = 'in-person'
+            with count_queries() as statements:
+                db.session.commit()
+            assert not any('rollups' in statement for statement in statements)
+
+    def test_refresh_updates_existing_rows_in_place(self, app, tutor_user, student_user, session_obj):
+        # A row a concurrent transaction inserted for the same key must be
+        # overwritten, not hit on insert.
+        with app.app_context():
+            db.session.query(DailySessionRollup).update({'session_count': 9})
+            db.session.query(StudentSessionRollup).update({'session_count': 9})
+            conn = db.session.connection()
+            refresh(conn, day_keys=[(tutor_user.id, session_obj.start_time.date())],
+                    student_keys=[(student_user.id, tutor_user.id)])
+            refresh(conn, day_keys=[(tutor_user.id, session_obj.start_time.date())],
+                    student_keys=[(student_user.id, tutor_user.id)])
+            db.session.commit()
+            assert_in_sync()
+            assert DailySessionRollup.query.one().session_count == 1
+
+
+class TestRebuild:
+    def test_rebuild_repairs_drift(self, app, tutor_user, student_user, session_obj, feedback):
+        with app.app_context():
+            db.session.query(DailySessionRollup).delete()
+            db.session.query(StudentSessionRollup).update({'session_count': 7})
+            db.session.commit()
+
+            assert rebuild_dashboard_rollups() == (1, 1)
+            assert_in_sync()
+            assert StudentSessionRollup.query.one().session_count == 1
+
+
+class TestRollupDashboard:
+    @pytest.fixture
+    def history(self, app, tutor_user, student_user):
+        with app.app_context():
+            other = User(clerk_user_id='clerk_other', name='Other Student', email='o@test.com', role='student')
+            db.session.add(other)
+            db.session.commit()
+            sessions = [
+                _booked(tutor_user.id, student_user.id, datetime(2025, 3, 11, 10, 0), minutes=90),
+                _booked(tutor_user.id, other.id, datetime(2025, 3, 4, 10, 0), course='Chinese 201'),
+                _booked(tutor_user.id, student_user.id, datetime(2025, 1, 20, 10, 0)),
+                # Two years back: only the all-time totals see it.
+                _booked(tutor_user.id, student_user.id, datetime(2023, 1, 9, 10, 0)),
+            ]
+            db.session.add_all([
+                Feedback(session_id=sessions[0].id, student_id=student_user.id, rating=4),
+                SessionNote(session_id=sessions[0].id, tutor_id=tutor_user.id, attendance_status='present'),
+                SessionNote(session_id=sessions[2].id, tutor_id=tutor_user.id, attendance_status='absent'),
+            ])
+            db.session.commit()
+
+    @pytest.mark.parametrize('filters', [{}, {'course': 'Chinese 201'}, {'course': 'Chinese 101'}])
+    def test_matches_live_metrics(self, app, tutor_user, history, filters):
+        with app.app_context():
+            live = dashboard_service.dashboard_metrics(now=NOW, **filters)
+            live_filters = dashboard_service.dashboard_filters()
+            app.config['DASHBOARD_USE_ROLLUPS'] = True
+            try:
+                assert dashboard_service.dashboard_metrics(now=NOW, **filters) == live
+                assert dashboard_service.dashboard_filters() == live_filters
+            finally:
+                app.config['DASHBOARD_USE_ROLLUPS'] = False
+            assert live['stats']['total_sessions'] in (1, 3, 4)
+
+    def test_oldest_month_counts_from_its_first_day(self, app, tutor_user, student_user):
+        with app.app_context():
+            session = _booked(tutor_user.id, student_user.id, datetime(2024, 10, 1, 10, 0))
+            db.session.add(SessionNote(session_id=session.id, tutor_id=tutor_user.id, attendance_status='present'))
+            db.session.commit()
+
+            live = dashboard_service.dashboard_metrics(now=NOW)
+            app.config['DASHBOARD_USE_ROLLUPS'] = True
+            try:
+                assert dashboard_service.dashboard_metrics(now=NOW) == live
+            finally:
+                app.config['DASHBOARD_USE_ROLLUPS'] = False
+            assert live['monthly_attendance'][0] == {'month': 'Oct', 'rate': 100}
+
+    def test_query_count(self, app, tutor_user, history, count_queries):
+        with app.app_context():
+            app.config['DASHBOARD_USE_ROLLUPS'] = True
+            try:
+                with count_queries() as statements:
+                    metrics = dashboard_service.dashboard_metrics(tutor_id=tutor_user.id, now=NOW)
+            finally:
+                app.config['DASHBOARD_USE_ROLLUPS'] = False
+            assert metrics['stats']['total_sessions'] == 4
+            assert metrics['monthly_attendance'][-1] == {'month': 'Mar', 'rate': 50}
+            assert len(statements) == 6
+            assert not any('FROM sessions' in statement for statement in statements)
+
+    def test_tutor_route_uses_rollups(self, app, tutor_auth_client, history):
+        app.config['DASHBOARD_USE_ROLLUPS'] = True
+        try:
+            data = tutor_auth_client.get('/api/tutor/dashboard').get_json()
+        finally:
+            app.config['DASHBOARD_USE_ROLLUPS'] = False
+        assert data['stats']['total_sessions'] == 4
+        assert data['course_distribution'] == {'Chinese 101': 3, 'Chinese 201': 1}
@@ -0,0 +1,127 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db, User, Session, SessionNote, Feedback
+from services import dashboard_service
+
+NOW = datetime(2025, 3, 12, 15, 0)
+
+
+def _session(tutor, student, start, minutes=60, course='Chinese 101', status='booked'):
+    session = Session(tutor_id=tutor.id, student_id=student.id if student else None, course=course,
+                      session_type='online', start_time=start,
+                      end_time=start + timedelta(minutes=minutes), status=status)
+    db.session.add(session)
+    db.session.flush()
+    return session
+
+
+@pytest.fixture
+def dashboard_data(app, tutor_user, student_user):
+    with app.app_context():
+        other_tutor = User(clerk_user_id='clerk_other_tutor', name='Another Tutor',
+                           email='other_tutor@test.com', role='tutor')
+        other_student = User(clerk_user_id='clerk_other_student', name='Other Student',
+                             email='other@test.com', role='student')
+        db.session.add_all([other_tutor, other_student])
+        db.session.flush()
+        tutor = db.session.get(User, tutor_user.id)
+        student = db.session.get(User, student_user.id)
+
+        this_week = _session(tutor, student, datetime(2025, 3, 11, 10, 0), minutes=90)
+        last_week = _session(tutor, other_student, datetime(2025, 3, 4, 10, 0), course='Chinese 201')
+        _session(other_tutor, student, datetime(2025, 2, 3, 10, 0), minutes=30)
+        _session(tutor, student, datetime(2025, 3, 10, 9, 0), status='available')
+
+        db.session.add_all([
+            Feedback(session_id=this_week.id, student_id=student.id, rating=2),
+            Feedback(session_id=this_week.id, student_id=student.id, rating=4),
+            Feedback(session_id=last_week.id, student_id=other_student.id, rating=0),
+            SessionNote(session_id=this_week.id, tutor_id=tutor.id, attendance_status='absent'),
+            SessionNote(session_id=this_week.id, tutor_id=tutor.id, attendance_status='present'),
+            SessionNote(session_id=last_week.id, tutor_id=tutor.id, attendance_status='attended'),
+        ])
+        db.session.commit()
+        return {'other_tutor_id': other_tutor.id}
+
+
+class TestDashboardMetrics:
+    def test_stats(self, app, dashboard_data):
+        with app.app_context():
+            stats = dashboard_service.dashboard_metrics(now=NOW)['stats']
+            # The newest feedback per session counts and zero ratings are ignored.
+            assert stats == {'total_sessions': 3, 'total_hours': 3.0, 'active_students': 2, 'avg_rating': 4.0}
+
+    def test_weekly_buckets(self, app, dashboard_data):
+        with app.app_context():
+            metrics = dashboard_service.dashboard_metrics(now=NOW)
+            assert [w['week'] for w in metrics['weekly_data']] == [
+                '02/03/2025', '02/10/2025', '02/17/2025', '02/24/2025', '03/03/2025', '03/10/2025']
+            assert [w['sessions'] for w in metrics['weekly_data']] == [1, 0, 0, 0, 1, 1]
+            assert [w['hours'] for w in metrics['weekly_data']] == [0.5, 0, 0, 0, 1.0, 1.5]
+            assert [w['rating'] for w in metrics['weekly_ratings']] == [None] * 5 + [4.0]
+
+    def test_monthly_attendance(self, app, dashboard_data):
+        with app.app_context():
+            months = dashboard_service.dashboard_metrics(now=NOW)['monthly_attendance']
+            # Months step back 30 days from the 1st, as the dashboard always has.
+            assert [m['month'] for m in months] == ['Oct', 'Nov', 'Dec', 'Dec', 'Jan', 'Mar']
+            assert [m['rate'] for m in months] == [0, 0, 0, 0, 0, 100]
+
+    def test_distribution_and_top_students(self, app, dashboard_data):
+        with app.app_context():
+            metrics = dashboard_service.dashboard_metrics(now=NOW)
+            assert metrics['course_distribution'] == {'Chinese 101': 2, 'Chinese 201': 1}
+            assert metrics['top_students'] == [
+                {'name': 'Test Student', 'count': 2}, {'name': 'Other Student', 'count': 1}]
+
+    def test_filters_narrow_metrics(self, app, tutor_user, dashboard_data):
+        with app.app_context():
+            by_course = dashboard_service.dashboard_metrics(course='Chinese 201', now=NOW)
+            assert by_course['stats']['total_sessions'] == 1
+            assert by_course['stats']['avg_rating'] is None
+            by_tutor = dashboard_service.dashboard_metrics(tutor_id=dashboard_data['other_tutor_id'], now=NOW)
+            assert by_tutor['stats']['total_hours'] == 0.5
+            assert by_tutor['course_distribution'] == {'Chinese 101': 1}
+
+    def test_empty(self, app):
+        with app.app_context():
+            metrics = dashboard_service.dashboard_metrics(now=NOW)
+            assert metrics['stats'] == {'total_sessions': 0, 'total_hours': 0, 'active_students': 0, 'avg_rating': None}
+            assert metrics['top_students'] == []
+
+    def test_query_count_is_constant(self, app, dashboard_data, count_queries):
+        with app.app_context(), count_queries() as statements:
+            dashboard_service.dashboard_metrics(now=NOW)
+            dashboard_service.dashboard_filters()
+            assert len(statements) == 6
+
+
+def test_dashboard_filters(app, tutor_user, dashboard_data):
+    with app.app_context():
+        filters = dashboard_service.dashboard_filters()
+        assert filters['classes'] == ['Chinese 101', 'Chinese 201']
+        assert filters['tutors'] == [
+            {'id': dashboard_data['other_tutor_id'], 'name': 'Another Tutor'},
+            {'id': tutor_user.id, 'name': 'Test Tutor'},
+        ]
+
+
+def test_professor_dashboard_route(app, professor_auth_client, tutor_user, dashboard_data):
+    response = professor_auth_client.get(f'/api/professor/dashboard?tutor={tutor_user.id}')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['success'] is True
+    assert data['stats']['total_sessions'] == 2
+    assert len(data['filters']['tutors']) == 2
+
+
+def test_tutor_dashboard_route(app, tutor_auth_client, dashboard_data):
+    data = tutor_auth_client.get('/api/tutor/dashboard').get_json()
+    assert data['stats']['total_sessions'] == 2
+    assert 'weekly_ratings' not in data
+    assert 'filters' not in data
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from datetime import datetime
 import sys
 import os
@@ -76,274 +76,102 @@ class TestGenerateIcsEvent:
             assert result is not None
 
 
-class TestSendBookingConfirmation:
-    def test_send_booking_confirmation_no_api_key(self, app):
-        with app.app_context():
-            app.config['RESEND_API_KEY'] = None
-            from services.email_service import send_booking_confirmation
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': '2025-01-06T10:00:00+00:00',
-                'end_time': '2025-01-06T11:00:00+00:00',
-                'session_type': 'online'
-            }
-            result = send_booking_confirmation(
-                'student@test.com',
-                'Test Student',
-                'Test Tutor',
-                session_data
-            )
-            assert result is False
+SESSION_DATA = {
+    'id': 1,
+    'course': 'Chinese 101',
+    'start_time': '2025-01-06T10:00:00+00:00',
+    'end_time': '2025-01-06T11:00:00+00:00',
+    'session_type': 'online'
+}
 
-    @patch('services.email_service.resend')
-    def test_send_booking_confirmation_success(self, mock_resend, app):
-        mock_resend.Emails.send.return_value = {'id': 'email_123'}
-        
-        with app.app_context():
-            app.config['RESEND_API_KEY'] = 'test_key'
-            app.config['RESEND_FROM_EMAIL'] = 'from@test.com'
-            from services.email_service import send_booking_confirmation
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': '2025-01-06T10:00:00+00:00',
-                'end_time': '2025-01-06T11:00:00+00:00',
-                'session_type': 'online'
-            }
-            result = send_booking_confirmation(
-                'student@test.com',
-                'Test Student',
-                'Test Tutor',
-                session_data
-            )
-            assert result is True
 
-    @patch('services.email_service.resend')
-    def test_send_booking_confirmation_with_datetime(self, mock_resend, app):
-        mock_resend.Emails.send.return_value = {'id': 'email_123'}
-        
+class TestEmailBuilders:
+    @pytest.mark.parametrize('session_data', [
+        SESSION_DATA,
+        dict(SESSION_DATA, start_time=datetime(2025, 1, 6, 10, 0), end_time=datetime(2025, 1, 6, 11, 0),
+             session_type='in-person'),
+    ])
+    def test_booking_emails_carry_a_calendar_invite(self, app, session_data):
+        from services.email_service import booking_confirmation_email, tutor_notification_email
         with app.app_context():
-            app.config['RESEND_API_KEY'] = 'test_key'
             app.config['RESEND_FROM_EMAIL'] = 'from@test.com'
-            from services.email_service import send_booking_confirmation
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': datetime(2025, 1, 6, 10, 0),
-                'end_time': datetime(2025, 1, 6, 11, 0),
-                'session_type': 'in-person'
-            }
-            result = send_booking_confirmation(
-                'student@test.com',
-                'Test Student',
-                'Test Tutor',
-                session_data
-            )
-            assert result is True
+            student = booking_confirmation_email('student@test.com', 'Test Student', 'Test Tutor', session_data)
+            tutor = tutor_notification_email('tutor@test.com', 'Test Tutor', 'Test Student', session_data)
+        assert (student['from'], student['to']) == ('from@test.com', ['student@test.com'])
+        assert tutor['to'] == ['tutor@test.com']
+        for params in (student, tutor):
+            assert params['attachments'][0]['filename'] == 'session.ics'
+            assert 'Chinese 101' in params['html']
 
-    @patch('services.email_service.resend')
-    def test_send_booking_confirmation_exception(self, mock_resend, app):
-        mock_resend.Emails.send.side_effect = Exception('Email error')
-        
+    def test_feedback_request(self, app):
+        from services.email_service import feedback_request_email
         with app.app_context():
-            app.config['RESEND_API_KEY'] = 'test_key'
-            app.config['RESEND_FROM_EMAIL'] = 'from@test.com'
-            from services.email_service import send_booking_confirmation
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': '2025-01-06T10:00:00+00:00',
-                'end_time': '2025-01-06T11:00:00+00:00',
-                'session_type': 'online'
-            }
-            result = send_booking_confirmation(
-                'student@test.com',
-                'Test Student',
-                'Test Tutor',
-                session_data
-            )
-            assert result is False
+            params = feedback_request_email('student@test.com', 'Test Student', 'Test Tutor', SESSION_DATA)
+        assert params['to'] == ['student@test.com']
+        assert params['subject'] == 'How was your session with Test Tutor?'
+        assert 'attachments' not in params
 
 
-class TestSendTutorNotification:
-    def test_send_tutor_notification_no_api_key(self, app):
-        with app.app_context():
-            app.config['RESEND_API_KEY'] = None
-            from services.email_service import send_tutor_notification
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': '2025-01-06T10:00:00+00:00',
-                'end_time': '2025-01-06T11:00:00+00:00',
-                'session_type': 'online'
-            }
-            result = send_tutor_notification(
-                'tutor@test.com',
-                'Test Tutor',
-                'Test Student',
-                session_data
-            )
-            assert result is False
+def _params(n, attachments=False):
+    params = {'from': 'from@test.com', 'to': [f'user{n}@test.com'], 'subject': f'Email {n}', 'html': '<p>hi</p>'}
+    if attachments:
+        params['attachments'] = [{'filename': 'session.ics', 'content': 'aWNz', 'content_type': 'text/calendar'}]
+    return params
+
+
+def _batch_ids(params):
+    return {'data': [{'id': p['subject']} for p in params]}
 
-    @patch('services.email_service.resend')
-    def test_send_tutor_notification_success(self, mock_resend, app):
-        mock_resend.Emails.send.return_value = {'id': 'email_123'}
-        
-        with app.app_context():
-            app.config['RESEND_API_KEY'] = 'test_key'
-            app.config['RESEND_FROM_EMAIL'] = 'from@test.com'
-            from services.email_service import send_tutor_notification
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': '2025-01-06T10:00:00+00:00',
-                'end_time': '2025-01-06T11:00:00+00:00',
-                'session_type': 'online'
-            }
-            result = send_tutor_notification(
-                'tutor@test.com',
-                'Test Tutor',
-                'Test Student',
-                session_data
-            )
-            assert result is True
 
+class TestEmailBatch:
     @patch('services.email_service.resend')
-    def test_send_tutor_notification_with_datetime(self, mock_resend, app):
-        mock_resend.Emails.send.return_value = {'id': 'email_123'}
-        
-        with app.app_context():
-            app.config['RESEND_API_KEY'] = 'test_key'
-            app.config['RESEND_FROM_EMAIL'] = 'from@test.com'
-            from services.email_service import send_tutor_notification
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': datetime(2025, 1, 6, 10, 0),
-                'end_time': datetime(2025, 1, 6, 11, 0),
-                'session_type': 'in-person'
-            }
-            result = send_tutor_notification(
-                'tutor@test.com',
-                'Test Tutor',
-                'Test Student',
-                session_data
-            )
-            assert result is True
+    def test_chunks_and_maps_results_in_order(self, mock_resend, app):
+        from services.email_service import EmailBatch
+        mock_resend.Batch.send.side_effect = _batch_ids
+        mock_resend.Emails.send.side_effect = lambda p: {'id': p['subject']}
+
+        batch = EmailBatch(chunk_size=2)
+        for n in range(6):
+            assert batch.add(_params(n, attachments=(n == 1))) == n
+        assert len(batch) == 6
+
+        assert batch.flush() == [f'Email {n}' for n in range(6)]
+        assert [len(call.args[0]) for call in mock_resend.Batch.send.call_args_list] == [2, 2]
+        # The email with an attachment and the odd one left over go out on their own.
+        assert [call.args[0]['subject'] for call in mock_resend.Emails.send.call_args_list] == ['Email 1', 'Email 5']
+        assert len(batch) == 0
 
     @patch('services.email_service.resend')
-    def test_send_tutor_notification_exception(self, mock_resend, app):
-        mock_resend.Emails.send.side_effect = Exception('Email error')
-        
-        with app.app_context():
-            app.config['RESEND_API_KEY'] = 'test_key'
-            app.config['RESEND_FROM_EMAIL'] = 'from@test.com'
-            from services.email_service import send_tutor_notification
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': '2025-01-06T10:00:00+00:00',
-                'end_time': '2025-01-06T11:00:00+00:00',
-                'session_type': 'online'
-            }
-            result = send_tutor_notification(
-                'tutor@test.com',
-                'Test Tutor',
-                'Test Student',
-                session_data
-            )
-            assert result is False
+    def test_failed_chunk_fails_only_its_messages(self, mock_resend, app):
+        from services.email_service import EmailBatch
+        mock_resend.Batch.send.side_effect = [_batch_ids([_params(0), _params(1)]), Exception('rate limited')]
 
+        assert EmailBatch(chunk_size=2).flush() == []
 
-class TestSendFeedbackRequest:
-    def test_send_feedback_request_no_api_key(self, app):
-        with app.app_context():
-            app.config['RESEND_API_KEY'] = None
-            from services.email_service import send_feedback_request
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': '2025-01-06T10:00:00+00:00',
-                'end_time': '2025-01-06T11:00:00+00:00',
-                'session_type': 'online'
-            }
-            result = send_feedback_request(
-                'student@test.com',
-                'Test Student',
-                'Test Tutor',
-                session_data
-            )
-            assert result is False
+        batch = EmailBatch(chunk_size=2)
+        for n in range(4):
+            batch.add(_params(n))
+        results = batch.flush()
+        assert results[:2] == ['Email 0', 'Email 1']
+        assert all(isinstance(r, Exception) and str(r) == 'rate limited' for r in results[2:])
 
     @patch('services.email_service.resend')
-    def test_send_feedback_request_success(self, mock_resend, app):
-        mock_resend.Emails.send.return_value = {'id': 'email_123'}
-        
-        with app.app_context():
-            app.config['RESEND_API_KEY'] = 'test_key'
-            app.config['RESEND_FROM_EMAIL'] = 'from@test.com'
-            app.config['FRONTEND_URL'] = 'http://localhost:5173'
-            from services.email_service import send_feedback_request
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': '2025-01-06T10:00:00+00:00',
-                'end_time': '2025-01-06T11:00:00+00:00',
-                'session_type': 'online'
-            }
-            result = send_feedback_request(
-                'student@test.com',
-                'Test Student',
-                'Test Tutor',
-                session_data
-            )
-            assert result is True
+    def test_short_batch_response_is_an_error(self, mock_resend, app):
+        from services.email_service import EmailBatch
+        mock_resend.Batch.send.return_value = {'data': [{'id': 'only_one'}]}
+        batch = EmailBatch()
+        batch.add(_params(0))
+        batch.add(_params(1))
+        assert all(isinstance(r, ValueError) for r in batch.flush())
 
-    @patch('services.email_service.resend')
-    def test_send_feedback_request_with_datetime(self, mock_resend, app):
-        mock_resend.Emails.send.return_value = {'id': 'email_123'}
-        
-        with app.app_context():
-            app.config['RESEND_API_KEY'] = 'test_key'
-            app.config['RESEND_FROM_EMAIL'] = 'from@test.com'
-            app.config['FRONTEND_URL'] = 'http://localhost:5173'
-            from services.email_service import send_feedback_request
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': datetime(2025, 1, 6, 10, 0),
-                'end_time': datetime(2025, 1, 6, 11, 0),
-                'session_type': 'in-person'
-            }
-            result = send_feedback_request(
-                'student@test.com',
-                'Test Student',
-                'Test Tutor',
-                session_data
-            )
-            assert result is True
+    def test_chunk_size_is_capped_at_the_resend_limit(self):
+        from services.email_service import BATCH_LIMIT, EmailBatch
+        assert EmailBatch(chunk_size=1000).chunk_size == BATCH_LIMIT
+        assert EmailBatch(chunk_size=0).chunk_size == 1
 
-    @patch('services.email_service.resend')
-    def test_send_feedback_request_exception(self, mock_resend, app):
-        mock_resend.Emails.send.side_effect = Exception('Email error')
-        
+    def test_send_emails_without_api_key(self, app):
         with app.app_context():
-            app.config['RESEND_API_KEY'] = 'test_key'
-            app.config['RESEND_FROM_EMAIL'] = 'from@test.com'
-            from services.email_service import send_feedback_request
-            session_data = {
-                'id': 1,
-                'course': 'Chinese 101',
-                'start_time': '2025-01-06T10:00:00+00:00',
-                'end_time': '2025-01-06T11:00:00+00:00',
-                'session_type': 'online'
-            }
-            result = send_feedback_request(
-                'student@test.com',
-                'Test Student',
-                'Test Tutor',
-                session_data
-            )
-            assert result is False
-
+            app.config['RESEND_API_KEY'] = None
+            from services.email_service import send_emails
+            results = send_emails([_params(0), _params(1)])
+            assert len(results) == 2 and all(isinstance(r, Exception) for r in results)
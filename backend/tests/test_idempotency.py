@@ -0,0 +1,174 @@
+import pytest
+import sys
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import jsonify, request
+from models import db, User, Session, Feedback, TutorStats, IdempotencyKey
+from idempotency import idempotent, purge_expired_keys, request_fingerprint
+from benchmarks import create_benchmark_app
+
+BOOKING = {'start_time': '2025-01-06T13:00:00', 'end_time': '2025-01-06T14:00:00'}
+
+
+class TestSessionEndpoints:
+    def test_booking_retry_is_replayed(self, app, auth_client, student_user, tutor_profile, availability,
+                                       count_queries):
+        body = dict(BOOKING, availability_id=availability.id)
+        with patch('services.email_service.resend') as mock_resend:
+            mock_resend.Emails.send.return_value = {'id': 'email_123'}
+            first = auth_client.post('/api/sessions/book', json=body, headers={'Idempotency-Key': 'book-1'})
+            with count_queries() as statements:
+                retry = auth_client.post('/api/sessions/book', json=body, headers={'Idempotency-Key': 'book-1'})
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.get_json() == first.get_json()
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+        assert 'Idempotent-Replayed' not in first.headers
+        assert mock_resend.Emails.send.call_count == 2
+        assert not any('sessions' in s or 'availabilities' in s for s in statements)
+        with app.app_context():
+            assert Session.query.count() == 1
+
+    def test_requests_without_a_key_run_every_time(self, app, auth_client, student_user, tutor_profile,
+                                                   availability):
+        body = dict(BOOKING, availability_id=availability.id)
+        with patch('services.email_service.resend') as mock_resend:
+            mock_resend.Emails.send.return_value = {'id': 'email_123'}
+            auth_client.post('/api/sessions/book', json=body)
+            second = auth_client.post('/api/sessions/book', json=body)
+        assert second.status_code == 409
+        with app.app_context():
+            assert IdempotencyKey.query.count() == 0
+
+    def test_client_errors_are_replayed(self, app, auth_client, student_user):
+        first = auth_client.post('/api/sessions/book', json={}, headers={'Idempotency-Key': 'bad'})
+        retry = auth_client.post('/api/sessions/book', json={}, headers={'Idempotency-Key': 'bad'})
+        assert first.status_code == retry.status_code == 400
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+
+    def test_key_reused_for_another_body_is_rejected(self, app, auth_client, student_user, session_obj):
+        auth_client.post('/api/feedback', json={'session_id': session_obj.id, 'rating': 5},
+                         headers={'Idempotency-Key': 'fb'})
+        response = auth_client.post('/api/feedback', json={'session_id': session_obj.id, 'rating': 1},
+                                    headers={'Idempotency-Key': 'fb'})
+        assert response.status_code == 422
+        with app.app_context():
+            assert Feedback.query.one().rating == 5
+
+    def test_feedback_retry_counts_once(self, app, auth_client, student_user, tutor_user, session_obj):
+        body = {'session_id': session_obj.id, 'rating': 4}
+        for _ in range(3):
+            response = auth_client.post('/api/feedback', json=body, headers={'Idempotency-Key': 'fb-2'})
+            assert response.status_code == 201
+        with app.app_context():
+            assert Feedback.query.count() == 1
+            assert db.session.get(TutorStats, tutor_user.id).rating_count == 1
+
+    def test_session_note_retry_is_replayed(self, app, tutor_auth_client, tutor_user, session_obj):
+        body = {'session_id': session_obj.id, 'attendance_status': 'absent', 'notes': 'No show'}
+        first = tutor_auth_client.post('/api/session-notes', json=body, headers={'Idempotency-Key': 'note'})
+        retry = tutor_auth_client.post('/api/session-notes', json=body, headers={'Idempotency-Key': 'note'})
+        assert first.status_code == retry.status_code == 201
+        assert retry.get_json() == first.get_json()
+
+    def test_overlong_key_is_rejected(self, auth_client, student_user):
+        response = auth_client.post('/api/feedback', json={}, headers={'Idempotency-Key': 'k' * 256})
+        assert response.status_code == 400
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    app = create_benchmark_app(tmp_path / 'idempotency.db', IDEMPOTENCY_WAIT=5)
+    calls = []
+
+    @app.route('/run', methods=['POST'])
+    def run():
+        request.db_user = db.session.get(User, 1)
+        return view()
+
+    @idempotent
+    def view():
+        calls.append(request.get_json())
+        time.sleep(request.get_json().get('sleep', 0))
+        if request.get_json().get('fail'):
+            return jsonify({'error': 'boom'}), 500
+        return jsonify({'call': len(calls)}), 201
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(clerk_user_id='u1', name='Student', email='s@example.com', role='student'))
+        db.session.commit()
+    app.calls = calls
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+class TestIdempotentDecorator:
+    def test_concurrent_duplicates_wait_for_the_first(self, file_app):
+        responses = []
+        barrier = threading.Barrier(4)
+
+        def post():
+            client = file_app.test_client()
+            barrier.wait()
+            response = client.post('/run', json={'sleep': 0.3}, headers={'Idempotency-Key': 'same'})
+            responses.append((response.status_code, response.get_json()))
+
+        threads = [threading.Thread(target=post) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(file_app.calls) == 1
+        assert responses == [(201, {'call': 1})] * 4
+
+    def test_server_errors_release_the_key(self, file_app):
+        client = file_app.test_client()
+        assert client.post('/run', json={'fail': True}, headers={'Idempotency-Key': 'k'}).status_code == 500
+        assert client.post('/run', json={'fail': True}, headers={'Idempotency-Key': 'k'}).status_code == 500
+        assert len(file_app.calls) == 2
+        with file_app.app_context():
+            assert IdempotencyKey.query.count() == 0
+
+    def test_gives_up_waiting_with_409(self, file_app):
+        file_app.config['IDEMPOTENCY_WAIT'] = 0
+        with file_app.test_request_context('/run', method='POST', json={}):
+            now = datetime.utcnow()
+            db.session.add(IdempotencyKey(user_id=1, key='busy', request_hash=request_fingerprint(),
+                                          created_at=now, expires_at=now + timedelta(hours=1)))
+            db.session.commit()
+        response = file_app.test_client().post('/run', json={}, headers={'Idempotency-Key': 'busy'})
+        assert response.status_code == 409
+        assert file_app.calls == []
+
+    def test_expired_and_stale_keys_run_again(self, file_app):
+        client = file_app.test_client()
+        client.post('/run', json={}, headers={'Idempotency-Key': 'old'})
+        with file_app.app_context():
+            long_ago = datetime.utcnow() - timedelta(days=2)
+            db.session.add(IdempotencyKey(user_id=1, key='stuck', request_hash='x' * 64,
+                                          created_at=long_ago, expires_at=datetime.utcnow() + timedelta(hours=1)))
+            IdempotencyKey.query.filter_by(key='old').update({'expires_at': long_ago})
+            db.session.commit()
+
+        assert client.post('/run', json={}, headers={'Idempotency-Key': 'old'}).get_json() == {'call': 2}
+        assert client.post('/run', json={}, headers={'Idempotency-Key': 'stuck'}).get_json() == {'call': 3}
+
+    def test_purge_removes_only_expired_keys(self, file_app):
+        client = file_app.test_client()
+        client.post('/run', json={}, headers={'Idempotency-Key': 'a'})
+        client.post('/run', json={}, headers={'Idempotency-Key': 'b'})
+        with file_app.app_context():
+            IdempotencyKey.query.filter_by(key='a').update({'expires_at': datetime.utcnow() - timedelta(seconds=1)})
+            db.session.commit()
+            assert purge_expired_keys() == 1
+            assert [k.key for k in IdempotencyKey.query.all()] == ['b']
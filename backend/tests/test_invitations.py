@@ -666,3 +666,48 @@ class TestSendInvitationEmail:
             )
             
             assert result is False
+
+
+class TestBatchInvitations:
+    @patch('services.email_service.resend')
+    def test_invites_cohort_in_one_request(self, mock_resend, app, professor_auth_client, tutor_user):
+        mock_resend.Batch.send.side_effect = lambda params: {'data': [{'id': f'id_{i}'} for i in range(len(params))]}
+
+        response = professor_auth_client.post('/api/invitations/batch', json={
+            'emails': ['a@test.com', 'bad-email', 'b@test.com', 'a@test.com', tutor_user.email],
+            'role': 'tutor',
+        })
+
+        assert response.status_code == 201
+        data = response.get_json()
+        assert data['invited'] == 2
+        results = data['results']
+        assert [r['email'] for r in results] == ['a@test.com', 'bad-email', 'b@test.com', 'a@test.com', tutor_user.email]
+        assert results[0]['invitation']['email'] == 'a@test.com' and 'warning' not in results[0]
+        assert results[1]['error'] == 'Invalid email format'
+        assert results[3]['error'] == 'Duplicate email in request'
+        assert results[4]['error'] == 'User with this email already exists'
+        mock_resend.Batch.send.assert_called_once()
+        mock_resend.Emails.send.assert_not_called()
+        with app.app_context():
+            assert Invitation.query.count() == 2
+
+    @patch('services.email_service.resend')
+    def test_failed_send_warns_per_address(self, mock_resend, app, professor_auth_client):
+        mock_resend.Batch.send.side_effect = Exception('Email error')
+        response = professor_auth_client.post('/api/invitations/batch', json={
+            'emails': ['a@test.com', 'b@test.com'], 'role': 'professor',
+        })
+        assert response.status_code == 201
+        assert all('email failed to send' in r['warning'] for r in response.get_json()['results'])
+
+    def test_validates_request(self, professor_auth_client):
+        assert professor_auth_client.post('/api/invitations/batch', json={'role': 'tutor'}).status_code == 400
+        assert professor_auth_client.post('/api/invitations/batch', json={
+            'emails': ['a@test.com'], 'role': 'student'}).status_code == 400
+        assert professor_auth_client.post('/api/invitations/batch', json={
+            'emails': ['a@test.com'] * 501, 'role': 'tutor'}).status_code == 400
+
+    def test_requires_professor(self, auth_client):
+        response = auth_client.post('/api/invitations/batch', json={'emails': ['a@test.com'], 'role': 'tutor'})
+        assert response.status_code == 403
@@ -224,3 +224,242 @@ class TestMatchingRecommendEndpoint:
             data = response.get_json()
             assert data['error'] == 'Only students can get tutor recommendations'
 
+
+
+class TestRecommendationCache:
+    def test_etag_and_not_modified(self, app, auth_client, student_user, tutor_user, tutor_profile):
+        first = auth_client.get('/api/matching/recommend')
+        assert first.status_code == 200
+        etag = first.headers['ETag']
+        assert 'no-cache' in first.headers['Cache-Control']
+
+        with patch('routes.matching.get_cached_recommendations') as mock_get:
+            second = auth_client.get('/api/matching/recommend', headers={'If-None-Match': etag})
+            assert second.status_code == 304
+            assert second.data == b''
+            assert second.headers['ETag'] == etag
+            mock_get.assert_not_called()
+
+    def test_cached_between_requests(self, app, auth_client, student_user, tutor_user, tutor_profile):
+        auth_client.get('/api/matching/recommend')
+        with patch('services.matching_service.calculate_tutor_match_scores') as mock_calc:
+            response = auth_client.get('/api/matching/recommend')
+            assert response.status_code == 200
+            assert len(response.get_json()['recommendations']) == 1
+            mock_calc.assert_not_called()
+
+    def test_feedback_invalidates(self, app, auth_client, student_user, tutor_user, tutor_profile, session_obj):
+        first = auth_client.get('/api/matching/recommend')
+        assert first.get_json()['recommendations'][0]['score_breakdown']['rating'] == 17.5
+
+        auth_client.post('/api/feedback', json={'session_id': session_obj.id, 'rating': 5})
+
+        second = auth_client.get('/api/matching/recommend', headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+        assert second.headers['ETag'] != first.headers['ETag']
+        assert second.get_json()['recommendations'][0]['score_breakdown']['rating'] == 35.0
+
+    def test_booking_invalidates(self, app, auth_client, student_user, tutor_user, tutor_profile, available_session):
+        first = auth_client.get('/api/matching/recommend')
+        assert first.get_json()['recommendations'][0]['score_breakdown']['previous_sessions'] == 0.0
+
+        auth_client.post(f'/api/sessions/{available_session.id}/book')
+
+        second = auth_client.get('/api/matching/recommend')
+        assert second.headers['ETag'] != first.headers['ETag']
+        assert second.get_json()['recommendations'][0]['score_breakdown']['previous_sessions'] == 10.0
+
+    def test_tutor_rename_invalidates(self, app, auth_client, student_user, tutor_user, tutor_profile):
+        first = auth_client.get('/api/matching/recommend')
+        with app.app_context():
+            db.session.get(User, tutor_user.id).name = 'Renamed Tutor'
+            db.session.commit()
+
+        second = auth_client.get('/api/matching/recommend', headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+        assert second.get_json()['recommendations'][0]['tutor_name'] == 'Renamed Tutor'
+
+    def test_other_students_booking_keeps_etag(self, app, auth_client, student_user, tutor_user, tutor_profile):
+        from services import change_tracking
+        first = auth_client.get('/api/matching/recommend')
+        with app.app_context():
+            change_tracking.bump(change_tracking.student_key(student_user.id + 100))
+            db.session.commit()
+        second = auth_client.get('/api/matching/recommend')
+        assert second.headers['ETag'] == first.headers['ETag']
+
+    def test_availability_invalidates(self, app, auth_client, student_user, tutor_user, tutor_profile):
+        from services import change_tracking
+        first = auth_client.get('/api/matching/recommend')
+        with app.app_context():
+            db.session.add(Availability(tutor_id=tutor_profile.id, day_of_week=1,
+                                        start_time=datetime(2025, 1, 6, 9, 0),
+                                        end_time=datetime(2025, 1, 6, 10, 0),
+                                        session_type='online'))
+            change_tracking.bump(change_tracking.AVAILABILITY)
+            db.session.commit()
+        second = auth_client.get('/api/matching/recommend')
+        assert second.headers['ETag'] != first.headers['ETag']
+        assert second.get_json()['recommendations'][0]['score_breakdown']['availability'] == 3.0
+
+
+class TestRecommendationPagination:
+    def _add_tutors(self, count):
+        for i in range(count):
+            user = User(clerk_user_id=f'clerk_page_tutor_{i}', name=f'Page Tutor {i}',
+                        email=f'page{i}@test.com', role='tutor')
+            db.session.add(user)
+            db.session.flush()
+            profile = Tutor(user_id=user.id)
+            db.session.add(profile)
+            db.session.flush()
+            for _ in range(i % 4):
+                db.session.add(Availability(tutor_id=profile.id, day_of_week=1,
+                                            start_time=datetime(2025, 1, 6, 9, 0),
+                                            end_time=datetime(2025, 1, 6, 10, 0),
+                                            session_type='online'))
+        db.session.commit()
+
+    def test_walk_pages(self, app, auth_client, student_user):
+        with app.app_context():
+            self._add_tutors(7)
+
+        full = auth_client.get('/api/matching/recommend').get_json()
+        assert full['next_cursor'] is None
+
+        seen, url = [], '/api/matching/recommend?limit=3'
+        while url:
+            data = auth_client.get(url).get_json()
+            assert len(data['recommendations']) <= 3
+            seen.extend(data['recommendations'])
+            url = data['next_cursor'] and f"/api/matching/recommend?limit=3&cursor={data['next_cursor']}"
+        assert seen == full['recommendations']
+
+    @pytest.mark.parametrize('query', ['limit=0', 'limit=101', 'limit=abc', 'cursor=bogus'])
+    def test_invalid_params(self, app, auth_client, student_user, query):
+        response = auth_client.get(f'/api/matching/recommend?{query}')
+        assert response.status_code == 400
+
+
+class TestBatchRecommendEndpoint:
+    def test_requires_professor(self, app, auth_client, student_user):
+        response = auth_client.post('/api/matching/batch', json={'class_name': 'Chinese 101'})
+        assert response.status_code == 403
+
+    @pytest.mark.parametrize('body', [
+        {},
+        {'student_ids': 'abc'},
+        {'student_ids': [1, 'x']},
+        {'class_name': 'Chinese 101', 'limit': 0},
+    ])
+    def test_invalid_body(self, app, professor_auth_client, body):
+        response = professor_auth_client.post('/api/matching/batch', json=body)
+        assert response.status_code == 400
+
+    def test_by_class_name(self, app, professor_auth_client, student_user, tutor_user, tutor_profile, session_obj):
+        response = professor_auth_client.post('/api/matching/batch', json={'class_name': 'Chinese 101'})
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert len(results) == 1
+        assert results[0]['student_id'] == student_user.id
+        assert results[0]['student_name'] == student_user.name
+        assert results[0]['recommendations'][0]['tutor_id'] == tutor_user.id
+        assert results[0]['recommendations'][0]['score_breakdown']['previous_sessions'] == 10.0
+
+    def test_unknown_class(self, app, professor_auth_client, student_user):
+        response = professor_auth_client.post('/api/matching/batch', json={'class_name': 'Chinese 999'})
+        assert response.status_code == 200
+        assert response.get_json()['results'] == []
+
+    def test_student_ids_skip_other_roles(self, app, professor_auth_client, student_user, tutor_user,
+                                          tutor_profile, professor_user):
+        response = professor_auth_client.post('/api/matching/batch', json={
+            'student_ids': [student_user.id, tutor_user.id, professor_user.id],
+        })
+        assert response.status_code == 200
+        assert [r['student_id'] for r in response.get_json()['results']] == [student_user.id]
+
+    def test_streams_ndjson(self, app, professor_auth_client, student_user, tutor_user, tutor_profile):
+        import json
+        response = professor_auth_client.post(
+            '/api/matching/batch',
+            json={'student_ids': [student_user.id], 'limit': 1},
+            headers={'Accept': 'application/x-ndjson'},
+        )
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [line['student_id'] for line in lines] == [student_user.id]
+        assert len(lines[0]['recommendations']) == 1
+
+
+class TestSlotAwareRecommendations:
+    def _tutor_with_monday(self, name, hours):
+        user = User(clerk_user_id=f'clerk_{name}', name=name, email=f'{name}@test.com', role='tutor')
+        db.session.add(user)
+        db.session.flush()
+        profile = Tutor(user_id=user.id)
+        db.session.add(profile)
+        db.session.flush()
+        db.session.add(Availability(tutor_id=profile.id, day_of_week=1,
+                                    start_time=datetime(2025, 1, 6, hours[0], 0),
+                                    end_time=datetime(2025, 1, 6, hours[1], 0),
+                                    session_type='online', is_recurring=True))
+        return user
+
+    def test_fully_booked_tutor_ranks_below_open_tutor(self, app, auth_client, student_user):
+        with app.app_context():
+            busy = self._tutor_with_monday('busy', (9, 14))
+            free = self._tutor_with_monday('free', (9, 14))
+            other = User(clerk_user_id='clerk_other', name='Other', email='other@test.com', role='student')
+            db.session.add(other)
+            db.session.flush()
+            db.session.add(Session(tutor_id=busy.id, student_id=other.id, course='Chinese 101',
+                                   session_type='online', start_time=datetime(2025, 1, 6, 9, 0),
+                                   end_time=datetime(2025, 1, 6, 14, 0), status='booked'))
+            db.session.commit()
+            busy_id, free_id = busy.id, free.id
+
+        plain = auth_client.get('/api/matching/recommend').get_json()['recommendations']
+        assert plain[0]['total_score'] == plain[1]['total_score']
+
+        response = auth_client.get('/api/matching/recommend?from=2025-01-06T00:00:00&to=2025-01-07T00:00:00')
+        assert response.status_code == 200
+        ranked = response.get_json()['recommendations']
+        assert [r['tutor_id'] for r in ranked] == [free_id, busy_id]
+        assert ranked[0]['open_minutes'] == 300
+        assert ranked[0]['earliest_open_slot'] == '2025-01-06T09:00:00'
+        assert ranked[1]['open_minutes'] == 0
+        assert ranked[1]['earliest_open_slot'] is None
+        assert ranked[1]['score_breakdown']['availability'] == 0.0
+        assert ranked[0]['score_breakdown']['availability'] == pytest.approx(10.0 + 5.0 * (1 - 9 / 24))
+
+    def test_other_students_booking_invalidates_slot_mode(self, app, auth_client, student_user, tutor_user,
+                                                          tutor_profile, availability, available_session):
+        from services import change_tracking
+        url = '/api/matching/recommend?from=2025-01-06T00:00:00&to=2025-01-07T00:00:00'
+        first = auth_client.get(url)
+        plain = auth_client.get('/api/matching/recommend')
+        with app.app_context():
+            change_tracking.bump(change_tracking.BOOKINGS)
+            db.session.commit()
+        assert auth_client.get(url).headers['ETag'] != first.headers['ETag']
+        assert auth_client.get('/api/matching/recommend').headers['ETag'] == plain.headers['ETag']
+
+    @pytest.mark.parametrize('query', [
+        'from=2025-01-06T00:00:00',
+        'from=2025-01-06&to=2025-01-05',
+        'from=2025-01-06&to=2025-03-06',
+        'from=yesterday&to=today',
+    ])
+    def test_invalid_window(self, app, auth_client, student_user, query):
+        response = auth_client.get(f'/api/matching/recommend?{query}')
+        assert response.status_code == 400
+
+    def test_batch_accepts_window(self, app, professor_auth_client, student_user, tutor_user, tutor_profile,
+                                  availability, session_obj):
+        response = professor_auth_client.post('/api/matching/batch', json={
+            'student_ids': [student_user.id], 'from': '2025-01-06T00:00:00', 'to': '2025-01-07T00:00:00'})
+        assert response.status_code == 200
+        recommendation = response.get_json()['results'][0]['recommendations'][0]
+        assert recommendation['open_minutes'] == 420
@@ -454,3 +454,181 @@ class TestGetRecommendedTutors:
             assert len(recommendations) == 2
             assert recommendations[0]['total_score'] >= recommendations[1]['total_score']
 
+
+
+def _legacy_match_scores(student_id):
+    """Per-tutor reference implementation the set-based engine must reproduce."""
+    from sqlalchemy import func
+    tutor_scores = []
+    for tutor in User.query.filter(User.role == 'tutor').order_by(User.id).all():
+        tutor_profile = Tutor.query.filter_by(user_id=tutor.id).first()
+        if not tutor_profile:
+            continue
+        previous = Session.query.filter(
+            Session.student_id == student_id, Session.tutor_id == tutor.id, Session.status == 'booked'
+        ).count()
+        previous_score = 0.0 if previous == 0 else 50.0 * min(previous / 5, 1.0)
+        session_ids = [s.id for s in Session.query.filter(Session.tutor_id == tutor.id).all()]
+        avg_rating = None
+        if session_ids:
+            avg_rating = db.session.query(func.avg(Feedback.rating)).filter(
+                Feedback.session_id.in_(session_ids)
+            ).scalar()
+        rating_score = 35.0 * 0.5 if avg_rating is None else 35.0 * (avg_rating / 5.0)
+        availability = Availability.query.filter_by(tutor_id=tutor_profile.id).count()
+        availability_score = 0.0 if availability == 0 else 15.0 * min(availability / 5.0, 1.0)
+        score = 0.0 + previous_score + rating_score + availability_score
+        tutor_scores.append({
+            'tutor_id': tutor.id,
+            'tutor_name': tutor.name,
+            'tutor_email': tutor.email,
+            'total_score': round(score, 2),
+            'score_breakdown': {
+                'previous_sessions': previous_score,
+                'rating': rating_score,
+                'availability': availability_score,
+            },
+        })
+    tutor_scores.sort(key=lambda x: x['total_score'], reverse=True)
+    return tutor_scores
+
+
+def _build_roster(student_ids, tutor_count=6, prefix='roster'):
+    import random
+    rng = random.Random(7)
+    tutors = []
+    for i in range(tutor_count):
+        user = User(clerk_user_id=f'clerk_{prefix}_tutor_{i}', name=f'Roster Tutor {i}',
+                    email=f'{prefix}{i}@test.com', role='tutor')
+        db.session.add(user)
+        db.session.flush()
+        if i != 3:
+            profile = Tutor(user_id=user.id)
+            db.session.add(profile)
+            db.session.flush()
+            for d in range(rng.randint(0, 7)):
+                db.session.add(Availability(tutor_id=profile.id, day_of_week=d % 7,
+                                            start_time=datetime(2025, 1, 6, 9, 0),
+                                            end_time=datetime(2025, 1, 6, 10, 0),
+                                            session_type='online'))
+        tutors.append(user)
+    for n in range(60):
+        tutor = rng.choice(tutors)
+        session = Session(tutor_id=tutor.id, student_id=rng.choice(student_ids + [None]),
+                          course='Chinese 101', session_type='online',
+                          start_time=datetime(2025, 2, 1, 9, 0), end_time=datetime(2025, 2, 1, 10, 0),
+                          status=rng.choice(['booked', 'booked', 'available', 'cancelled']))
+        db.session.add(session)
+        db.session.flush()
+        if session.student_id and rng.random() < 0.6:
+            db.session.add(Feedback(session_id=session.id, student_id=session.student_id,
+                                    rating=rng.choice([1.0, 2.5, 3.0, 4.0, 4.5, 5.0, None])))
+    db.session.commit()
+
+
+class TestSetBasedScoringParity:
+    def test_matches_per_tutor_reference(self, app, student_user, tutor_user, tutor_profile):
+        with app.app_context():
+            other = User(clerk_user_id='clerk_other_student', name='Other', email='o@test.com', role='student')
+            db.session.add(other)
+            db.session.commit()
+            _build_roster([student_user.id, other.id])
+
+            for sid in (student_user.id, other.id):
+                assert calculate_tutor_match_scores(sid) == _legacy_match_scores(sid)
+
+    def test_constant_query_count(self, app, student_user, count_queries):
+        with app.app_context():
+            _build_roster([student_user.id], tutor_count=2)
+            with count_queries() as statements:
+                calculate_tutor_match_scores(student_user.id)
+            small = len(statements)
+
+            _build_roster([student_user.id], tutor_count=8, prefix='more')
+            with count_queries() as statements:
+                calculate_tutor_match_scores(student_user.id)
+            large = len(statements)
+
+            assert small == large
+
+
+class TestTopKRecommendations:
+    def test_limit_is_prefix_of_full_ranking(self, app, student_user):
+        from services.matching_service import get_recommended_tutors
+        with app.app_context():
+            _build_roster([student_user.id], tutor_count=12)
+            full = calculate_tutor_match_scores(student_user.id)
+            for k in (1, 3, 11, 50):
+                assert get_recommended_tutors(student_user.id, limit=k) == full[:k]
+
+    def test_pages_cover_full_ranking(self, app, student_user):
+        from services.matching_service import get_recommendation_page, decode_cursor
+        with app.app_context():
+            _build_roster([student_user.id], tutor_count=12)
+            full = calculate_tutor_match_scores(student_user.id)
+
+            seen, after = [], None
+            while True:
+                page, cursor = get_recommendation_page(student_user.id, 4, after=after)
+                seen.extend(page)
+                if cursor is None:
+                    break
+                after = decode_cursor(cursor)
+            assert seen == full
+
+    def test_cursor_round_trip(self):
+        from services.matching_service import encode_cursor, decode_cursor
+        cursor = encode_cursor({'total_score': 52.5, 'tutor_id': 9})
+        assert decode_cursor(cursor) == (52.5, 9)
+
+    @pytest.mark.parametrize('cursor', ['', 'not-base64!', 'e30', 'WzEsMiwzXQ', 'WyJhIiwgMV0'])
+    def test_decode_cursor_rejects_garbage(self, cursor):
+        from services.matching_service import decode_cursor
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestBatchMatchScores:
+    def _students(self, count):
+        students = []
+        for i in range(count):
+            user = User(clerk_user_id=f'clerk_batch_student_{i}', name=f'Batch Student {i}',
+                        email=f'batch{i}@test.com', role='student', class_name='Chinese 101')
+            db.session.add(user)
+            students.append(user)
+        db.session.commit()
+        return [s.id for s in students]
+
+    def test_matches_single_student_scoring(self, app):
+        from services.matching_service import iter_batch_match_scores
+        with app.app_context():
+            student_ids = self._students(4)
+            _build_roster(student_ids, tutor_count=9)
+
+            results = list(iter_batch_match_scores(student_ids + [9999]))
+            assert [student['student_id'] for student, _ in results] == student_ids
+            for student, recommendations in results:
+                assert recommendations == calculate_tutor_match_scores(student['student_id'])
+
+            limited = dict((s['student_id'], r) for s, r in iter_batch_match_scores(student_ids, limit=3))
+            for student_id in student_ids:
+                assert limited[student_id] == calculate_tutor_match_scores(student_id)[:3]
+
+    def test_no_students(self, app):
+        from services.matching_service import iter_batch_match_scores
+        with app.app_context():
+            assert list(iter_batch_match_scores([])) == []
+
+    def test_constant_query_count(self, app, count_queries):
+        from services.matching_service import iter_batch_match_scores
+        with app.app_context():
+            student_ids = self._students(10)
+            _build_roster(student_ids, tutor_count=5)
+            with count_queries() as statements:
+                list(iter_batch_match_scores(student_ids[:2]))
+            small = len(statements)
+            with count_queries() as statements:
+                list(iter_batch_match_scores(student_ids))
+            large = len(statements)
+
+            assert small == large
@@ -1,5 +1,6 @@
 import pytest
 from datetime import datetime
+from unittest.mock import patch
 from models import db, User, Tutor, Availability, Session, SessionNote, Feedback
 
 
@@ -104,6 +105,51 @@ class TestUserModel:
             assert user2.name == 'Original Name'
             assert user2.email == 'original@example.com'
 
+    def test_get_or_create_from_clerk_unchanged_does_not_commit(self, app):
+        with app.app_context():
+            user1 = User(
+                clerk_user_id='clerk_unchanged',
+                name='Same Name',
+                email='same@example.com'
+            )
+            db.session.add(user1)
+            db.session.commit()
+
+            with patch.object(db.session, 'commit') as mock_commit:
+                user2 = User.get_or_create_from_clerk(
+                    clerk_user_id='clerk_unchanged',
+                    name='Same Name',
+                    email='same@example.com'
+                )
+                mock_commit.assert_not_called()
+            assert user2.id == user1.id
+
+    def test_get_or_create_from_clerk_first_login_race(self, app):
+        from models import insert_ignore
+        with app.app_context():
+            def concurrent_insert(*args, **kwargs):
+                # Another request inserts the row after our SELECT missed.
+                db.session.add(User(clerk_user_id='clerk_race', name='Winner', email='win@example.com'))
+                db.session.flush()
+                return insert_ignore(*args, **kwargs)
+
+            with patch('models.insert_ignore', side_effect=concurrent_insert):
+                user = User.get_or_create_from_clerk('clerk_race', 'Loser', 'lose@example.com')
+
+            assert user.name == 'Winner'
+            assert User.query.filter_by(clerk_user_id='clerk_race').count() == 1
+
+    def test_insert_ignore_skips_conflicts(self, app):
+        from models import insert_ignore
+        with app.app_context():
+            values = {'clerk_user_id': 'clerk_dup', 'name': 'Dup', 'email': 'dup@example.com'}
+            assert insert_ignore(User, values, index_elements=['clerk_user_id']) is True
+            assert insert_ignore(User, values, index_elements=['clerk_user_id']) is False
+            db.session.commit()
+            user = User.query.filter_by(clerk_user_id='clerk_dup').one()
+            assert user.onboarding_complete is False
+            assert user.created_at is not None
+
     def test_user_to_dict_with_none_created_at(self, app):
         with app.app_context():
             user = User(
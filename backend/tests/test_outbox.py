@@ -0,0 +1,248 @@
+import pytest
+import sys
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db, EmailOutbox
+from services import outbox
+from benchmarks import create_benchmark_app, run_email
+from benchmarks.fake_resend import FakeResend
+
+BOOKING = {'start_time': '2025-01-06T13:00:00', 'end_time': '2025-01-06T14:00:00'}
+
+
+def _params(n):
+    return {'from': 'test@example.com', 'to': [f'student{n}@example.com'], 'subject': f'Email {n}', 'html': '<p>hi</p>'}
+
+
+@pytest.fixture
+def fake_resend():
+    with FakeResend() as fake:
+        yield fake
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    outbox.metrics.reset()
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    app = create_benchmark_app(tmp_path / 'outbox.db', RESEND_API_KEY='re_test', EMAIL_MAX_ATTEMPTS=3)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+class TestDrain:
+    def test_rolled_back_transaction_queues_nothing(self, file_app):
+        with file_app.app_context():
+            outbox.enqueue('test', _params(1))
+            db.session.rollback()
+            assert EmailOutbox.query.count() == 0
+
+    def test_sends_through_resend(self, file_app, fake_resend):
+        with file_app.app_context():
+            outbox.enqueue('test', _params(1))
+            outbox.enqueue('test', _params(2))
+            db.session.commit()
+
+            assert outbox.drain() == {'sent': 2, 'failed': 0}
+            rows = EmailOutbox.query.order_by(EmailOutbox.id).all()
+            assert [(r.status, r.attempts, r.provider_id) for r in rows] == [
+                ('sent', 1, 'fake_1'), ('sent', 1, 'fake_2'),
+            ]
+        assert [e['subject'] for e in fake_resend.emails] == ['Email 1', 'Email 2']
+        assert outbox.metrics.snapshot()['sent'] == 2
+
+    def test_drains_in_batch_requests(self, file_app, fake_resend):
+        file_app.config['EMAIL_BATCH_SIZE'] = 10
+        with file_app.app_context():
+            for n in range(25):
+                outbox.enqueue('test', _params(n))
+            attached = dict(_params(99), attachments=[{'filename': 'session.ics', 'content': 'aWNz'}])
+            outbox.enqueue('test', attached)
+            db.session.commit()
+
+            assert outbox.drain() == {'sent': 26, 'failed': 0}
+            assert EmailOutbox.query.filter(EmailOutbox.provider_id.is_(None)).count() == 0
+        # Chunks of 10, 10 and 5, plus the attachment on its own.
+        assert fake_resend.requests == 4
+
+    def test_failed_batch_retries_each_email(self, file_app, fake_resend):
+        fake_resend.fail_next(1)
+        with file_app.app_context():
+            for n in range(3):
+                outbox.enqueue('test', _params(n))
+            db.session.commit()
+            assert outbox.drain() == {'sent': 0, 'failed': 3}
+            assert {r.status for r in EmailOutbox.query} == {'pending'}
+
+    def test_failures_back_off_then_dead_letter(self, file_app, fake_resend):
+        fake_resend.fail_next(3)
+        with file_app.app_context():
+            outbox.enqueue('test', _params(1))
+            db.session.commit()
+
+            assert outbox.drain() == {'sent': 0, 'failed': 1}
+            row = EmailOutbox.query.one()
+            assert (row.status, row.attempts) == ('pending', 1)
+            assert row.next_attempt_at > datetime.utcnow()
+            assert 'Simulated failure' in row.last_error
+            # Not due yet: a second drain leaves it alone.
+            assert outbox.drain() == {'sent': 0, 'failed': 0}
+
+            for _ in range(2):
+                EmailOutbox.query.update({'next_attempt_at': datetime.utcnow()})
+                db.session.commit()
+                outbox.drain()
+            row = EmailOutbox.query.one()
+            assert (row.status, row.attempts) == ('dead', 3)
+            assert outbox.stats()['dead_letters'][0]['id'] == row.id
+
+            assert outbox.requeue_dead() == 1
+            assert outbox.drain() == {'sent': 1, 'failed': 0}
+        assert fake_resend.requests == 4
+
+    def test_backoff_doubles(self, app):
+        with app.app_context():
+            app.config['EMAIL_RETRY_BACKOFF'] = 10
+            with patch('services.outbox.random.uniform', return_value=1.0):
+                assert [outbox._backoff(n) for n in (1, 2, 3)] == [10, 20, 40]
+                assert outbox._backoff(20) == outbox.MAX_BACKOFF_SECONDS
+
+    def test_expired_lease_is_claimed_again(self, file_app, fake_resend):
+        with file_app.app_context():
+            outbox.enqueue('test', _params(1))
+            db.session.commit()
+            assert len(outbox.claim()) == 1
+            assert outbox.claim() == []
+
+            EmailOutbox.query.update({'locked_until': datetime.utcnow() - timedelta(seconds=1)})
+            db.session.commit()
+            assert outbox.drain() == {'sent': 1, 'failed': 0}
+            assert EmailOutbox.query.one().attempts == 2
+
+    def test_stats(self, file_app):
+        with file_app.app_context():
+            outbox.enqueue('test', _params(1))
+            db.session.commit()
+            stats = outbox.stats()
+            assert stats['counts'] == {'pending': 1, 'sending': 0, 'sent': 0, 'dead': 0}
+            assert stats['oldest_pending_seconds'] >= 0
+            assert stats['process'] == {'claimed': 0, 'sent': 0, 'retried': 0, 'dead': 0}
+
+    def test_without_api_key_emails_stay_queued(self, file_app):
+        file_app.config['RESEND_API_KEY'] = None
+        with file_app.app_context():
+            outbox.enqueue('test', _params(1))
+            db.session.commit()
+            assert outbox.drain() == {'sent': 0, 'failed': 0}
+            assert EmailOutbox.query.one().status == 'pending'
+
+    def test_concurrent_drains_send_each_email_once(self, file_app, fake_resend):
+        with file_app.app_context():
+            for n in range(60):
+                outbox.enqueue('test', _params(n))
+            db.session.commit()
+
+        barrier = threading.Barrier(4)
+
+        def worker():
+            with file_app.app_context():
+                barrier.wait()
+                outbox.drain(batch_size=5)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(e['subject'] for e in fake_resend.emails) == sorted(f'Email {n}' for n in range(60))
+        with file_app.app_context():
+            assert outbox.stats()['counts'] == {'pending': 0, 'sending': 0, 'sent': 60, 'dead': 0}
+
+    def test_worker_drains_until_stopped(self, file_app, fake_resend):
+        stop = threading.Event()
+        with file_app.app_context():
+            outbox.enqueue('test', _params(1))
+            db.session.commit()
+
+        def run():
+            with file_app.app_context():
+                outbox.run_worker(concurrency=2, poll_interval=0.05, stop=stop)
+
+        worker = threading.Thread(target=run)
+        worker.start()
+        deadline = datetime.utcnow() + timedelta(seconds=5)
+        while not fake_resend.emails and datetime.utcnow() < deadline:
+            stop.wait(0.05)
+        stop.set()
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+        assert len(fake_resend.emails) == 1
+
+
+class TestRoutes:
+    def test_booking_queues_emails_with_the_session(self, app, auth_client, student_user, tutor_user,
+                                                    tutor_profile, availability, fake_resend):
+        response = auth_client.post('/api/sessions/book', json=dict(BOOKING, availability_id=availability.id))
+        assert response.status_code == 201
+
+        with app.app_context():
+            rows = EmailOutbox.query.order_by(EmailOutbox.id).all()
+            assert [(r.kind, r.status) for r in rows] == [
+                ('booking_confirmation', 'sent'), ('tutor_notification', 'sent'),
+            ]
+            assert json.loads(rows[0].payload)['to'] == [student_user.email]
+        assert [e['to'] for e in fake_resend.emails] == [[student_user.email], [tutor_user.email]]
+        assert fake_resend.emails[0]['attachments'][0]['filename'] == 'session.ics'
+
+    def test_conflicting_booking_queues_nothing(self, app, auth_client, student_user, tutor_profile,
+                                                availability, session_obj):
+        response = auth_client.post('/api/sessions/book', json={
+            'availability_id': availability.id,
+            'start_time': '2025-01-06T10:30:00',
+            'end_time': '2025-01-06T11:30:00',
+        })
+        assert response.status_code == 409
+        with app.app_context():
+            assert EmailOutbox.query.count() == 0
+
+    def test_booking_does_not_wait_for_resend(self, app, auth_client, student_user, tutor_profile, availability):
+        app.config['TASKS_EAGER'] = False
+        with patch('services.outbox.task_runner.submit') as submit, patch('services.email_service.resend') as mock_resend:
+            response = auth_client.post('/api/sessions/book', json=dict(BOOKING, availability_id=availability.id))
+        assert response.status_code == 201
+        submit.assert_called_once()
+        mock_resend.Emails.send.assert_not_called()
+        outbox._drain_slots.release()
+        with app.app_context():
+            assert EmailOutbox.query.filter_by(status='pending').count() == 2
+
+    def test_session_note_queues_feedback_request(self, app, tutor_auth_client, tutor_user, student_user,
+                                                  session_obj, fake_resend):
+        response = tutor_auth_client.post('/api/session-notes', json={
+            'session_id': session_obj.id, 'attendance_status': 'present', 'notes': 'Good',
+        })
+        assert response.status_code == 201
+        with app.app_context():
+            assert EmailOutbox.query.one().kind == 'feedback_request'
+        assert fake_resend.emails[0]['subject'] == f'How was your session with {tutor_user.name}?'
+
+
+class TestBenchmark:
+    def test_batching_cuts_requests(self, tmp_path):
+        report = run_email.run(emails=30, latency=0, batch_sizes=(1, 10), data_dir=str(tmp_path), log=lambda *a: None)
+        assert [(m['batch_size'], m['requests'], m['delivered_once']) for m in report['modes']] == [
+            (1, 30, True), (10, 3, True),
+        ]
@@ -0,0 +1,88 @@
+import pytest
+import sys
+import os
+from datetime import datetime
+from werkzeug.datastructures import MultiDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db, Session
+from pagination import (
+    InvalidPageRequest,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+    parse_datetime_arg,
+    parse_page_args,
+)
+
+
+def _add_sessions(tutor_id, starts):
+    for start in starts:
+        db.session.add(Session(tutor_id=tutor_id, course='Chinese 101', session_type='online',
+                               start_time=start, end_time=start.replace(hour=start.hour + 1),
+                               status='available'))
+    db.session.commit()
+
+
+class TestCursor:
+    def test_round_trip(self):
+        cursor = encode_cursor(datetime(2025, 1, 6, 10, 30), 42)
+        assert decode_cursor(cursor) == (datetime(2025, 1, 6, 10, 30), 42)
+
+    @pytest.mark.parametrize('cursor', ['x', 'e30', 'WyJub3QgYSBkYXRlIiwgMV0', 'WyIyMDI1LTAxLTA2IiwgIjEiXQ'])
+    def test_rejects_garbage(self, cursor):
+        with pytest.raises(InvalidPageRequest):
+            decode_cursor(cursor)
+
+    def test_parse_datetime_arg(self):
+        assert parse_datetime_arg('2025-01-06T09:00:00') == datetime(2025, 1, 6, 9)
+        assert parse_datetime_arg('soon') is None
+        assert parse_datetime_arg(None) is None
+
+
+class TestParsePageArgs:
+    def test_no_paging(self):
+        assert parse_page_args(MultiDict()) == (None, None)
+
+    def test_limit_and_cursor(self):
+        cursor = encode_cursor(datetime(2025, 1, 6), 3)
+        assert parse_page_args(MultiDict({'limit': '5', 'cursor': cursor})) == (5, (datetime(2025, 1, 6), 3))
+
+    @pytest.mark.parametrize('args', [{'limit': '0'}, {'limit': '501'}, {'limit': 'ten'},
+                                      {'cursor': encode_cursor(datetime(2025, 1, 6), 3)}])
+    def test_invalid(self, args):
+        with pytest.raises(InvalidPageRequest):
+            parse_page_args(MultiDict(args))
+
+
+class TestKeysetPage:
+    def test_pages_cover_everything_with_ties(self, app, tutor_user):
+        with app.app_context():
+            # Several rows share a start_time so the id tie-breaker matters.
+            starts = [datetime(2025, 1, 6 + (i % 3), 9 + (i % 2)) for i in range(11)]
+            _add_sessions(tutor_user.id, starts)
+            expected = [s.id for s in Session.query.order_by(Session.start_time, Session.id)]
+
+            seen, after = [], None
+            while True:
+                rows, cursor = keyset_page(Session.query, Session.start_time, Session.id, 4, after)
+                seen.extend(r.id for r in rows)
+                if cursor is None:
+                    break
+                after = decode_cursor(cursor)
+            assert seen == expected
+
+    def test_without_limit_returns_all(self, app, tutor_user):
+        with app.app_context():
+            _add_sessions(tutor_user.id, [datetime(2025, 1, 7, 9), datetime(2025, 1, 6, 9)])
+            rows, cursor = keyset_page(Session.query, Session.start_time, Session.id)
+            assert [r.start_time.day for r in rows] == [6, 7]
+            assert cursor is None
+
+    def test_exact_page_has_no_cursor(self, app, tutor_user):
+        with app.app_context():
+            _add_sessions(tutor_user.id, [datetime(2025, 1, 6, 9), datetime(2025, 1, 7, 9)])
+            rows, cursor = keyset_page(Session.query, Session.start_time, Session.id, 2)
+            assert len(rows) == 2
+            assert cursor is None
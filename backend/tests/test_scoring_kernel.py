@@ -0,0 +1,83 @@
+import pytest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import scoring_kernel
+from services.matching_service import previous_session_points, rating_points, availability_points
+
+BACKENDS = [
+    pytest.param(False, id='python'),
+    pytest.param(True, id='numpy', marks=pytest.mark.skipif(
+        not scoring_kernel.HAS_NUMPY, reason='numpy not installed')),
+]
+
+
+def _columns(n, seed=3):
+    rng = random.Random(seed)
+    previous = [rng.choice([0, 0, 1, 2, 4, 5, 6, 40]) for _ in range(n)]
+    ratings = [rng.choice([None, 1.0, 2.5, 3.3333333333333335, 4.75, 5.0, rng.uniform(1, 5)]) for _ in range(n)]
+    availability = [rng.choice([0, 1, 3, 5, 9]) for _ in range(n)]
+    return previous, ratings, availability
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+class TestScoringKernelParity:
+    def test_previous_sessions(self, use_numpy):
+        counts = _columns(200)[0]
+        column = scoring_kernel.to_list(scoring_kernel.previous_session_column(counts, use_numpy=use_numpy))
+        assert column == [previous_session_points(c) for c in counts]
+
+    def test_ratings(self, use_numpy):
+        ratings = _columns(200)[1]
+        column = scoring_kernel.to_list(scoring_kernel.rating_column(ratings, use_numpy=use_numpy))
+        assert column == [rating_points(r) for r in ratings]
+
+    def test_availability(self, use_numpy):
+        counts = _columns(200)[2]
+        column = scoring_kernel.to_list(scoring_kernel.availability_column(counts, use_numpy=use_numpy))
+        assert column == [availability_points(c) for c in counts]
+
+    def test_totals(self, use_numpy):
+        previous, ratings, availability = _columns(500)
+        totals = scoring_kernel.total_column(
+            scoring_kernel.previous_session_column(previous, use_numpy=use_numpy),
+            scoring_kernel.rating_column(ratings, use_numpy=use_numpy),
+            scoring_kernel.availability_column(availability, use_numpy=use_numpy),
+            use_numpy=use_numpy,
+        )
+        expected = [
+            round(0.0 + previous_session_points(p) + rating_points(r) + availability_points(a), 2)
+            for p, r, a in zip(previous, ratings, availability)
+        ]
+        assert totals == expected
+        assert all(type(t) is float for t in totals)
+
+    def test_rounding_half_way_cases(self, use_numpy):
+        values = [x / 1000 for x in range(0, 100001, 5)] + [2.675, 1.005, 0.125, 0.375, 99.995]
+        zeros = [0.0] * len(values)
+        assert scoring_kernel.total_column(values, zeros, zeros, use_numpy=use_numpy) == [round(v, 2) for v in values]
+
+    def test_custom_plan(self, use_numpy):
+        plan = scoring_kernel.DEFAULT_PLAN._replace(previous_session_weight=20.0, max_sessions_for_full_score=3,
+                                                    rating_weight=60.0, availability_weight=20.0)
+        previous, ratings, availability = _columns(200)
+        assert scoring_kernel.to_list(scoring_kernel.previous_session_column(
+            previous, use_numpy=use_numpy, plan=plan)) == [previous_session_points(c, plan) for c in previous]
+        assert scoring_kernel.to_list(scoring_kernel.rating_column(
+            ratings, use_numpy=use_numpy, plan=plan)) == [rating_points(r, plan) for r in ratings]
+        assert scoring_kernel.to_list(scoring_kernel.availability_column(
+            availability, use_numpy=use_numpy, plan=plan)) == [availability_points(c, plan) for c in availability]
+
+    def test_empty(self, use_numpy):
+        assert scoring_kernel.to_list(scoring_kernel.rating_column([], use_numpy=use_numpy)) == []
+        assert scoring_kernel.total_column([], [], [], use_numpy=use_numpy) == []
+
+
+def test_numpy_required_when_forced(monkeypatch):
+    monkeypatch.setattr(scoring_kernel, 'HAS_NUMPY', False)
+    with pytest.raises(RuntimeError):
+        scoring_kernel.rating_column([1.0], use_numpy=True)
+    assert scoring_kernel.rating_column([None]) == [17.5]
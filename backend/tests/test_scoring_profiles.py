@@ -0,0 +1,150 @@
+import pytest
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.scoring_kernel import DEFAULT_PLAN, plan_fingerprint
+from services.scoring_profiles import (
+    ScoringProfiles,
+    UnknownProfile,
+    compile_profiles,
+    get_scoring_profiles,
+)
+from services.matching_service import calculate_tutor_match_scores
+
+AVAILABILITY_FIRST = {'availability_first': {'availability_weight': 40, 'previous_session_weight': 25}}
+
+
+class TestCompileProfiles:
+    def test_default_always_present(self):
+        plans = compile_profiles({})
+        assert plans == {'default': DEFAULT_PLAN}
+
+    def test_overrides_on_top_of_default(self):
+        plan = compile_profiles(AVAILABILITY_FIRST)['availability_first']
+        assert plan.availability_weight == 40
+        assert plan.previous_session_weight == 25
+        assert plan.rating_weight == DEFAULT_PLAN.rating_weight
+
+    @pytest.mark.parametrize('spec', [
+        [],
+        {'p': 5},
+        {'p': {'nope': 1}},
+        {'p': {'rating_weight': -1}},
+        {'p': {'rating_weight': 'high'}},
+        {'p': {'rating_weight': True}},
+        {'p': {'max_rating': 0}},
+        {'p': {'open_minutes_weight': 20}},
+    ])
+    def test_rejects_bad_specs(self, spec):
+        with pytest.raises(ValueError):
+            compile_profiles(spec)
+
+    def test_slot_weights_follow_availability_weight(self):
+        plan = compile_profiles(AVAILABILITY_FIRST)['availability_first']
+        assert plan.open_minutes_weight + plan.earliest_slot_weight == pytest.approx(40)
+        assert plan.open_minutes_weight / plan.earliest_slot_weight == pytest.approx(
+            DEFAULT_PLAN.open_minutes_weight / DEFAULT_PLAN.earliest_slot_weight)
+
+        explicit = compile_profiles({'p': {'availability_weight': 40, 'open_minutes_weight': 30,
+                                           'earliest_slot_weight': 0}})['p']
+        assert (explicit.open_minutes_weight, explicit.earliest_slot_weight) == (30, 0)
+
+    def test_fingerprint_tracks_values(self):
+        plans = compile_profiles(AVAILABILITY_FIRST)
+        assert plan_fingerprint(plans['default']) == plan_fingerprint(DEFAULT_PLAN)
+        assert plan_fingerprint(plans['availability_first']) != plan_fingerprint(DEFAULT_PLAN)
+
+
+class TestScoringProfiles:
+    def test_inline_json(self):
+        profiles = ScoringProfiles(json.dumps(AVAILABILITY_FIRST))
+        assert profiles.names() == ['availability_first', 'default']
+        assert profiles.get() == ('default', DEFAULT_PLAN)
+        with pytest.raises(UnknownProfile):
+            profiles.get('missing')
+
+    def test_unknown_default_fails_fast(self):
+        with pytest.raises(ValueError):
+            ScoringProfiles(None, default='missing')
+
+    def test_file_reloads_on_change(self, tmp_path):
+        path = tmp_path / 'profiles.json'
+        path.write_text(json.dumps(AVAILABILITY_FIRST))
+        profiles = ScoringProfiles(str(path), reload_interval=0)
+        assert profiles.get('availability_first')[1].availability_weight == 40
+
+        path.write_text(json.dumps({'availability_first': {'availability_weight': 60}}))
+        os.utime(path, (1, 1))
+        assert profiles.get('availability_first')[1].availability_weight == 60
+
+    def test_bad_reload_keeps_last_good(self, tmp_path):
+        path = tmp_path / 'profiles.json'
+        path.write_text(json.dumps(AVAILABILITY_FIRST))
+        profiles = ScoringProfiles(str(path), reload_interval=0)
+
+        path.write_text('{not json')
+        os.utime(path, (1, 1))
+        assert profiles.get('availability_first')[1].availability_weight == 40
+
+    def test_get_scoring_profiles_uses_app_config(self, app):
+        app.config['MATCHING_PROFILES'] = json.dumps(AVAILABILITY_FIRST)
+        app.extensions.pop('scoring_profiles', None)
+        with app.app_context():
+            assert 'availability_first' in get_scoring_profiles().names()
+        app.extensions.pop('scoring_profiles', None)
+
+
+class TestProfilesInMatching:
+    @pytest.fixture
+    def profiles(self, app):
+        app.extensions['scoring_profiles'] = ScoringProfiles(json.dumps(AVAILABILITY_FIRST))
+        yield app.extensions['scoring_profiles']
+        app.extensions.pop('scoring_profiles', None)
+
+    def test_plan_changes_scores(self, app, student_user, tutor_user, tutor_profile, availability, session_obj):
+        plan = compile_profiles(AVAILABILITY_FIRST)['availability_first']
+        with app.app_context():
+            default = calculate_tutor_match_scores(student_user.id)[0]['score_breakdown']
+            custom = calculate_tutor_match_scores(student_user.id, plan=plan)[0]['score_breakdown']
+        assert default['availability'] == 3.0
+        assert custom['availability'] == 8.0
+        assert custom['previous_sessions'] == 5.0
+        assert custom['rating'] == default['rating']
+
+    def test_endpoint_profile_param(self, app, auth_client, student_user, tutor_user, tutor_profile, availability,
+                                    profiles):
+        default = auth_client.get('/api/matching/recommend')
+        custom = auth_client.get('/api/matching/recommend?profile=availability_first')
+        assert default.get_json()['profile'] == 'default'
+        assert custom.get_json()['profile'] == 'availability_first'
+        assert custom.get_json()['recommendations'][0]['score_breakdown']['availability'] == 8.0
+        assert custom.headers['ETag'] != default.headers['ETag']
+
+        assert auth_client.get('/api/matching/recommend?profile=missing').status_code == 400
+
+    def test_profile_edit_invalidates_cache(self, app, auth_client, student_user, tutor_user, tutor_profile,
+                                            availability, profiles, tmp_path):
+        path = tmp_path / 'profiles.json'
+        path.write_text(json.dumps(AVAILABILITY_FIRST))
+        app.extensions['scoring_profiles'] = ScoringProfiles(str(path), reload_interval=0)
+
+        first = auth_client.get('/api/matching/recommend?profile=availability_first')
+        path.write_text(json.dumps({'availability_first': {'availability_weight': 60}}))
+        os.utime(path, (1, 1))
+        second = auth_client.get('/api/matching/recommend?profile=availability_first',
+                                 headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 200
+        assert second.get_json()['recommendations'][0]['score_breakdown']['availability'] == 12.0
+
+    def test_batch_profile(self, app, professor_auth_client, student_user, tutor_user, tutor_profile, availability,
+                           profiles):
+        response = professor_auth_client.post('/api/matching/batch', json={
+            'student_ids': [student_user.id], 'profile': 'availability_first'})
+        assert response.get_json()['profile'] == 'availability_first'
+        assert response.get_json()['results'][0]['recommendations'][0]['score_breakdown']['availability'] == 8.0
+        response = professor_auth_client.post('/api/matching/batch', json={
+            'student_ids': [student_user.id], 'profile': 'missing'})
+        assert response.status_code == 400
@@ -17,8 +17,8 @@ class TestBookSession:
             user = User.query.filter_by(clerk_user_id='clerk_test_tutor').first()
             assert user.role == 'tutor'
 
-    @patch('routes.sessions.send_booking_confirmation')
-    @patch('routes.sessions.send_tutor_notification')
+    @patch('services.booking.booking_confirmation_email')
+    @patch('services.booking.tutor_notification_email')
     def test_book_session_success(self, mock_tutor_email, mock_student_email, app, student_user, tutor_user, tutor_profile, availability):
         mock_student_email.return_value = True
         mock_tutor_email.return_value = True
@@ -130,8 +130,8 @@ class TestBookSession:
             assert av.tutor is not None
             assert av.tutor.user_id is not None
 
-    @patch('routes.sessions.send_booking_confirmation')
-    @patch('routes.sessions.send_tutor_notification')
+    @patch('services.booking.booking_confirmation_email')
+    @patch('services.booking.tutor_notification_email')
     def test_book_session_email_failure(self, mock_tutor_email, mock_student_email, app, student_user, tutor_user, tutor_profile, availability):
         mock_student_email.side_effect = Exception('Email error')
         mock_tutor_email.return_value = True
@@ -441,7 +441,7 @@ class TestCreateSessionNote:
             ).first()
             assert existing is not None
 
-    @patch('routes.sessions.send_feedback_request')
+    @patch('routes.sessions.feedback_request_email')
     def test_create_session_note_success(self, mock_email, app, tutor_user, student_user):
         mock_email.return_value = True
         
@@ -470,7 +470,7 @@ class TestCreateSessionNote:
             
             assert note.id is not None
 
-    @patch('routes.sessions.send_feedback_request')
+    @patch('routes.sessions.feedback_request_email')
     def test_create_session_note_sends_feedback_email(self, mock_email, app, tutor_user, student_user):
         mock_email.return_value = True
         
@@ -498,7 +498,7 @@ class TestCreateSessionNote:
             
             assert note.attendance_status in ['present', 'attended', 'late']
 
-    @patch('routes.sessions.send_feedback_request')
+    @patch('routes.sessions.feedback_request_email')
     def test_create_session_note_email_failure(self, mock_email, app, tutor_user, student_user):
         mock_email.side_effect = Exception('Email error')
         
@@ -881,7 +881,7 @@ class TestTutorDashboard:
 
 class TestSessionHTTPEndpoints:
     def _mock_auth(self, app, user):
-        return patch('auth.Clerk'), patch('auth.requests.get')
+        return patch('auth.Clerk'), patch('services.clerk_client.requests.Session.get')
 
     def test_book_session_http_success(self, app, student_user, tutor_user, tutor_profile, availability):
         with app.app_context():
@@ -896,13 +896,14 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
                     mock_get.return_value = mock_response
                     
-                    with patch('routes.sessions.send_booking_confirmation'), patch('routes.sessions.send_tutor_notification'):
+                    with patch('services.email_service.resend') as mock_resend:
+                        mock_resend.Emails.send.return_value = {'id': 'email_123'}
                         client = app.test_client()
                         response = client.post('/api/sessions/book',
                             data=json.dumps({
@@ -928,7 +929,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -958,7 +959,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -984,7 +985,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1007,7 +1008,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1030,7 +1031,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1053,7 +1054,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1077,7 +1078,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1101,7 +1102,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1139,7 +1140,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1174,13 +1175,14 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
                     mock_get.return_value = mock_response
                     
-                    with patch('routes.sessions.send_feedback_request'):
+                    with patch('services.email_service.resend') as mock_resend:
+                        mock_resend.Emails.send.return_value = {'id': 'email_123'}
                         client = app.test_client()
                         response = client.post('/api/session-notes',
                             data=json.dumps({
@@ -1217,7 +1219,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1247,7 +1249,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1270,7 +1272,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1293,7 +1295,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1316,7 +1318,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1347,7 +1349,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1378,7 +1380,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1409,7 +1411,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1451,7 +1453,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1495,7 +1497,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1526,7 +1528,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1560,7 +1562,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1587,7 +1589,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1615,7 +1617,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1642,7 +1644,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1678,7 +1680,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': other_tutor.email}]}
@@ -1708,7 +1710,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1747,7 +1749,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': other_tutor.email}]}
@@ -1783,7 +1785,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': other_student.email}]}
@@ -1810,7 +1812,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1837,7 +1839,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1864,7 +1866,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1891,7 +1893,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1926,7 +1928,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1963,7 +1965,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -1989,7 +1991,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2012,7 +2014,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2035,7 +2037,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2058,7 +2060,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2081,7 +2083,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2107,7 +2109,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2131,7 +2133,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2155,7 +2157,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2182,7 +2184,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2209,7 +2211,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2233,7 +2235,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2256,7 +2258,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2279,7 +2281,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2302,7 +2304,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2325,7 +2327,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2349,7 +2351,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2372,7 +2374,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2398,7 +2400,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2424,7 +2426,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2450,7 +2452,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2473,7 +2475,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2499,7 +2501,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2525,7 +2527,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2560,13 +2562,14 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
                     mock_get.return_value = mock_response
                     
-                    with patch('routes.sessions.send_booking_confirmation'), patch('routes.sessions.send_tutor_notification'):
+                    with patch('services.email_service.resend') as mock_resend:
+                        mock_resend.Emails.send.return_value = {'id': 'email_123'}
                         client = app.test_client()
                         response = client.post('/api/sessions/book',
                             data=json.dumps({
@@ -2592,28 +2595,26 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
                     mock_get.return_value = mock_response
                     
-                    with patch('routes.sessions.send_booking_confirmation') as mock_confirm:
-                        with patch('routes.sessions.send_tutor_notification') as mock_notify:
-                            mock_confirm.side_effect = Exception('Email error')
-                            mock_notify.return_value = True
-                            
-                            client = app.test_client()
-                            response = client.post('/api/sessions/book',
-                                data=json.dumps({
-                                    'availability_id': av.id,
-                                    'start_time': '2025-01-06T11:00:00',
-                                    'end_time': '2025-01-06T12:00:00'
-                                }),
-                                content_type='application/json',
-                                headers={'Authorization': 'Bearer test_token'})
-                            
-                            assert response.status_code == 201
+                    with patch('services.email_service.resend') as mock_resend:
+                        mock_resend.Emails.send.side_effect = Exception('Email error')
+                        
+                        client = app.test_client()
+                        response = client.post('/api/sessions/book',
+                            data=json.dumps({
+                                'availability_id': av.id,
+                                'start_time': '2025-01-06T11:00:00',
+                                'end_time': '2025-01-06T12:00:00'
+                            }),
+                            content_type='application/json',
+                            headers={'Authorization': 'Bearer test_token'})
+                        
+                        assert response.status_code == 201
 
     def test_tutor_sessions_http_with_invalid_datetime_filter(self, app, tutor_user, session_obj):
         with app.app_context():
@@ -2627,7 +2628,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2650,7 +2651,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2674,7 +2675,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2698,7 +2699,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2722,7 +2723,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2757,7 +2758,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2803,14 +2804,14 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
                     mock_get.return_value = mock_response
                     
-                    with patch('routes.sessions.send_feedback_request') as mock_email:
-                        mock_email.side_effect = Exception('Email error')
+                    with patch('services.email_service.resend') as mock_resend:
+                        mock_resend.Emails.send.side_effect = Exception('Email error')
                         
                         client = app.test_client()
                         response = client.post('/api/session-notes',
@@ -2875,7 +2876,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2940,7 +2941,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -2996,7 +2997,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -3041,7 +3042,7 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
@@ -3084,14 +3085,14 @@ class TestSessionHTTPEndpoints:
                 mock_sdk.authenticate_request.return_value = mock_request_state
                 mock_clerk.return_value = mock_sdk
                 
-                with patch('auth.requests.get') as mock_get:
+                with patch('services.clerk_client.requests.Session.get') as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 200
                     mock_response.json.return_value = {'email_addresses': [{'id': 'e1', 'email_address': user.email}]}
                     mock_get.return_value = mock_response
                     
-                    with patch('routes.sessions.send_feedback_request') as mock_email:
-                        mock_email.return_value = True
+                    with patch('services.email_service.resend') as mock_resend:
+                        mock_resend.Emails.send.return_value = {'id': 'email_123'}
                         
                         client = app.test_client()
                         response = client.post('/api/session-notes',
@@ -3104,5 +3105,95 @@ class TestSessionHTTPEndpoints:
                             headers={'Authorization': 'Bearer test_token'})
                         
                         assert response.status_code == 201
-                        mock_email.assert_called_once()
+                        mock_resend.Emails.send.assert_called_once()
+
+
+
+class TestSessionListPagination:
+    @pytest.fixture
+    def many_sessions(self, app, tutor_user, student_user):
+        with app.app_context():
+            for day in range(6, 16):
+                start = datetime(2025, 1, day, 10, 0)
+                db.session.add(Session(tutor_id=tutor_user.id, student_id=student_user.id,
+                                       course='Chinese 101', session_type='online', start_time=start,
+                                       end_time=start + timedelta(hours=1), status='booked'))
+            db.session.commit()
+
+    def _walk(self, client, url):
+        seen, cursor = [], None
+        while True:
+            page_url = f"{url}&cursor={cursor}" if cursor else url
+            response = client.get(page_url)
+            assert response.status_code == 200
+            data = response.get_json()
+            assert len(data['sessions']) <= 3
+            seen.extend(s['id'] for s in data['sessions'])
+            cursor = data['next_cursor']
+            if not cursor:
+                return seen
+
+    @pytest.mark.parametrize('path', ['/api/sessions/all', '/api/sessions', '/api/tutor/sessions'])
+    def test_pages_match_unpaged(self, app, tutor_auth_client, many_sessions, path):
+        full = tutor_auth_client.get(path).get_json()
+        assert full['next_cursor'] is None
+        assert len(full['sessions']) == 10
+        ids = [s['id'] for s in sorted(full['sessions'], key=lambda s: (s['start_time'], s['id']))]
+        assert self._walk(tutor_auth_client, f'{path}?limit=3') == ids
+
+    @pytest.mark.parametrize('path', ['/api/sessions/all', '/api/sessions', '/api/tutor/sessions'])
+    def test_time_window(self, app, tutor_auth_client, many_sessions, path):
+        response = tutor_auth_client.get(f'{path}?from=2025-01-08T00:00:00&to=2025-01-10T23:59:59')
+        starts = [s['start_time'] for s in response.get_json()['sessions']]
+        assert starts == ['2025-01-08T10:00:00', '2025-01-09T10:00:00', '2025-01-10T10:00:00']
+
+    @pytest.mark.parametrize('query', ['limit=0', 'limit=abc', 'limit=5&cursor=garbage', 'cursor=WyJ4IiwxXQ'])
+    @pytest.mark.parametrize('path', ['/api/sessions/all', '/api/sessions', '/api/tutor/sessions'])
+    def test_invalid_page_args(self, app, tutor_auth_client, path, query):
+        response = tutor_auth_client.get(f'{path}?{query}')
+        assert response.status_code == 400
+
+
+class TestSessionListStreaming:
+    @pytest.fixture
+    def many_sessions(self, app, tutor_user, student_user):
+        with app.app_context():
+            for day in range(6, 16):
+                start = datetime(2025, 1, day, 10, 0)
+                db.session.add(Session(tutor_id=tutor_user.id, student_id=student_user.id,
+                                       course='Chinese 101', session_type='online', start_time=start,
+                                       end_time=start + timedelta(hours=1), status='booked'))
+            db.session.commit()
 
+    @pytest.mark.parametrize('path', ['/api/sessions/all', '/api/professor/sessions'])
+    def test_stream_param_matches_buffered(self, app, professor_auth_client, many_sessions, path):
+        buffered = professor_auth_client.get(path).get_json()
+        response = professor_auth_client.get(f'{path}?stream=1')
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert json.loads(response.get_data(as_text=True)) == buffered
+
+    @pytest.mark.parametrize('path', ['/api/sessions/all', '/api/professor/sessions'])
+    def test_ndjson(self, app, professor_auth_client, many_sessions, path):
+        buffered = professor_auth_client.get(path).get_json()
+        response = professor_auth_client.get(path, headers={'Accept': 'application/x-ndjson'})
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert lines == buffered['sessions']
+
+    def test_professor_stream_includes_notes_and_feedback(self, app, professor_auth_client,
+                                                          session_obj, session_note, feedback):
+        response = professor_auth_client.get('/api/professor/sessions',
+                                             headers={'Accept': 'application/x-ndjson'})
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert lines[0]['note']['notes'] == 'Great session'
+        assert lines[0]['feedback'] is not None
+
+    def test_stream_honours_time_window(self, app, tutor_auth_client, many_sessions):
+        response = tutor_auth_client.get('/api/sessions/all?stream=1&from=2025-01-10&to=2025-01-12')
+        starts = [s['start_time'][:10] for s in json.loads(response.get_data(as_text=True))['sessions']]
+        assert starts == ['2025-01-10', '2025-01-11']
+
+    def test_stream_rejects_paging(self, app, tutor_auth_client):
+        response = tutor_auth_client.get('/api/sessions/all?stream=1&limit=5')
+        assert response.status_code == 400
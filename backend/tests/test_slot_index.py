@@ -0,0 +1,99 @@
+import random
+import sys
+import os
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db, Session
+from services.slot_index import IntervalIndex, expand_availability, open_intervals, load_open_time
+
+
+def dt(day, hour, minute=0):
+    return datetime(2025, 1, day, hour, minute)
+
+
+class TestIntervalIndex:
+    def test_merges_overlapping_and_touching(self):
+        index = IntervalIndex([(dt(6, 12), dt(6, 13)), (dt(6, 9), dt(6, 10)), (dt(6, 9, 30), dt(6, 11)),
+                               (dt(6, 11), dt(6, 11, 30)), (dt(6, 14), dt(6, 14))])
+        assert list(index) == [(dt(6, 9), dt(6, 11, 30)), (dt(6, 12), dt(6, 13))]
+
+    def test_overlapping(self):
+        index = IntervalIndex([(dt(6, 9), dt(6, 10)), (dt(6, 12), dt(6, 13)), (dt(6, 15), dt(6, 16))])
+        assert list(index.overlapping(dt(6, 10), dt(6, 12))) == []
+        assert list(index.overlapping(dt(6, 9, 30), dt(6, 12, 30))) == [
+            (dt(6, 9), dt(6, 10)), (dt(6, 12), dt(6, 13))]
+
+    def test_subtract_from(self):
+        index = IntervalIndex([(dt(6, 10), dt(6, 11)), (dt(6, 13), dt(6, 14))])
+        assert index.subtract_from(dt(6, 9), dt(6, 17)) == [
+            (dt(6, 9), dt(6, 10)), (dt(6, 11), dt(6, 13)), (dt(6, 14), dt(6, 17))]
+        assert index.subtract_from(dt(6, 10, 15), dt(6, 10, 45)) == []
+
+    def test_subtract_matches_brute_force(self):
+        rng = random.Random(11)
+        base = dt(6, 0)
+        for _ in range(50):
+            busy = []
+            for _ in range(rng.randint(0, 15)):
+                start = rng.randint(0, 1400)
+                busy.append((base + timedelta(minutes=start), base + timedelta(minutes=start + rng.randint(1, 90))))
+            start, end = sorted(rng.sample(range(0, 1440), 2))
+            free = IntervalIndex(busy).subtract_from(base + timedelta(minutes=start), base + timedelta(minutes=end))
+
+            minutes = {m for m in range(start, end)
+                       if not any(b[0] <= base + timedelta(minutes=m) < b[1] for b in busy)}
+            covered = {m for f in free for m in range(int((f[0] - base).total_seconds() // 60),
+                                                        int((f[1] - base).total_seconds() // 60))}
+            assert covered == minutes
+
+
+class _Av:
+    def __init__(self, day_of_week, start, end, is_recurring=True):
+        self.day_of_week = day_of_week
+        self.start_time = start
+        self.end_time = end
+        self.is_recurring = is_recurring
+
+
+class TestExpandAvailability:
+    def test_recurring_uses_js_weekdays(self):
+        # 2025-01-06 is a Monday, day_of_week 1 in the JS convention.
+        monday = _Av(1, dt(1, 9), dt(1, 11))
+        index = expand_availability([monday], dt(5, 0), dt(19, 0))
+        assert list(index) == [(dt(6, 9), dt(6, 11)), (dt(13, 9), dt(13, 11))]
+
+    def test_clipped_to_window(self):
+        index = expand_availability([_Av(1, dt(1, 9), dt(1, 11))], dt(6, 10), dt(6, 23))
+        assert list(index) == [(dt(6, 10), dt(6, 11))]
+
+    def test_one_time_replaces_recurring_that_day(self):
+        avs = [_Av(1, dt(1, 9), dt(1, 11)), _Av(1, dt(6, 14), dt(6, 15), is_recurring=False)]
+        index = expand_availability(avs, dt(5, 0), dt(14, 0))
+        assert list(index) == [(dt(6, 14), dt(6, 15)), (dt(13, 9), dt(13, 11))]
+
+    def test_short_fragments_are_not_open(self):
+        free = open_intervals(IntervalIndex([(dt(6, 9), dt(6, 10))]), IntervalIndex([(dt(6, 9, 10), dt(6, 9, 50))]))
+        assert free == []
+
+
+class TestLoadOpenTime:
+    def test_booked_sessions_reduce_open_time(self, app, student_user, tutor_user, availability, session_obj):
+        with app.app_context():
+            open_time = load_open_time(dt(6, 0), dt(7, 0))
+            minutes, earliest = open_time[tutor_user.id]
+            # 9-17 recurring on Monday minus the 10-11 booking.
+            assert minutes == 7 * 60
+            assert earliest == dt(6, 9)
+
+    def test_available_sessions_do_not_block(self, app, tutor_user, availability):
+        with app.app_context():
+            db.session.add(Session(tutor_id=tutor_user.id, course='Chinese 101', session_type='online',
+                                   start_time=dt(6, 10), end_time=dt(6, 11), status='available'))
+            db.session.commit()
+            assert load_open_time(dt(6, 0), dt(7, 0))[tutor_user.id][0] == 8 * 60
+
+    def test_no_availability_in_window(self, app, tutor_user, availability):
+        with app.app_context():
+            assert load_open_time(dt(7, 0), dt(8, 0))[tutor_user.id] == (0, None)
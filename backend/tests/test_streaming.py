@@ -0,0 +1,60 @@
+import json
+import pytest
+from flask import Flask
+from streaming import iter_batches, stream_mode, stream_response
+
+
+@pytest.fixture
+def flask_app():
+    return Flask(__name__)
+
+
+class TestStreamMode:
+    @pytest.mark.parametrize('headers, query, expected', [
+        ({}, '', None),
+        ({'Accept': 'application/json'}, '', None),
+        ({'Accept': 'application/x-ndjson'}, '', 'ndjson'),
+        ({}, '?stream=1', 'json'),
+        ({}, '?stream=true', 'json'),
+        ({}, '?stream=0', None),
+        ({'Accept': 'application/x-ndjson'}, '?stream=1', 'ndjson'),
+    ])
+    def test_selects_mode(self, flask_app, headers, query, expected):
+        with flask_app.test_request_context(f'/{query}', headers=headers):
+            assert stream_mode() == expected
+
+
+def test_iter_batches():
+    assert list(iter_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_batches([], 2)) == []
+
+
+class TestStreamResponse:
+    def _body(self, flask_app, *args, **kwargs):
+        with flask_app.test_request_context('/'):
+            response = stream_response(*args, **kwargs)
+            assert response.is_streamed
+            chunks = list(response.response)
+        return response, chunks
+
+    def test_json_mode_matches_buffered_shape(self, flask_app):
+        items = [{'id': i} for i in range(3)]
+        response, chunks = self._body(flask_app, iter(items), 'json', 'rows', {'success': True})
+        assert response.mimetype == 'application/json'
+        assert json.loads(''.join(chunks)) == {'success': True, 'rows': items}
+
+    def test_json_mode_without_envelope_or_items(self, flask_app):
+        _, chunks = self._body(flask_app, iter([]), 'json', 'rows')
+        assert json.loads(''.join(chunks)) == {'rows': []}
+
+    def test_ndjson_mode(self, flask_app):
+        items = [{'id': i} for i in range(3)]
+        response, chunks = self._body(flask_app, iter(items), 'ndjson', 'rows')
+        assert response.mimetype == 'application/x-ndjson'
+        assert [json.loads(line) for line in ''.join(chunks).splitlines()] == items
+
+    def test_flushes_in_chunks(self, flask_app):
+        items = [{'id': i, 'pad': 'x' * 50} for i in range(100)]
+        _, chunks = self._body(flask_app, iter(items), 'ndjson', 'rows', chunk_bytes=512)
+        assert len(chunks) > 1
+        assert all(len(chunk) >= 512 for chunk in chunks[:-1])
@@ -0,0 +1,136 @@
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import current_app
+from services.tasks import TaskRunner
+
+
+class TestTaskRunner:
+    def test_eager_runs_inline(self, app):
+        runner = TaskRunner()
+        calls = []
+        with app.app_context():
+            assert runner.submit(calls.append, 1) is None
+        assert calls == [1]
+
+    def test_background_runs_in_app_context(self, app):
+        runner = TaskRunner(max_workers=2)
+        app.config['TASKS_EAGER'] = False
+
+        def task(value):
+            return current_app.name, value
+
+        with app.app_context():
+            future = runner.submit(task, 42)
+        assert future.result(timeout=5) == (app.name, 42)
+        runner.shutdown()
+
+    def test_failures_are_contained(self, app, capsys):
+        runner = TaskRunner()
+
+        def boom():
+            raise RuntimeError('kaboom')
+
+        with app.app_context():
+            runner.submit(boom)
+        assert 'kaboom' in capsys.readouterr().out
+
+
+class TestTaskRetries:
+    def test_retries_until_success(self, app):
+        runner = TaskRunner()
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError('upstream down')
+            return True
+
+        with app.app_context():
+            runner.submit(flaky, retries=3, backoff=0)
+        assert len(attempts) == 3
+        assert runner.recent_failures() == []
+
+    def test_false_result_is_not_a_failure(self, app):
+        runner = TaskRunner()
+        attempts = []
+
+        def ignored(event):
+            attempts.append(event)
+            return False
+
+        with app.app_context():
+            runner.submit(ignored, {'type': 'session.created'}, retries=2, backoff=0)
+        assert len(attempts) == 1
+        assert runner.recent_failures() == []
+
+    def test_failure_log_leaves_out_arguments(self, app, capsys):
+        runner = TaskRunner()
+        attempts = []
+
+        def rejected(payload):
+            attempts.append(payload)
+            raise RuntimeError('rejected')
+
+        payload = {'email': 'student@example.com'}
+        with app.app_context():
+            runner.submit(rejected, payload, retries=2, backoff=0)
+        assert attempts == [payload] * 3
+
+        failure = runner.recent_failures()[0]
+        assert set(failure) == {'task', 'error', 'attempts', 'failed_at'}
+        assert (failure['task'], failure['error'], failure['attempts']) == ('rejected', 'rejected', 3)
+        assert 'student@example.com' not in capsys.readouterr().out
+
+    def test_failure_log_is_bounded(self, app):
+        runner = TaskRunner(failure_log_size=2)
+
+        def boom(n):
+            raise RuntimeError(f'boom {n}')
+
+        with app.app_context():
+            for n in range(3):
+                runner.submit(boom, n)
+        assert [f['error'] for f in runner.recent_failures()] == ['boom 1', 'boom 2']
+
+
+class TestOnboardingMetadataPush:
+    def test_onboarding_pushes_metadata_in_background(self, app):
+        import app as app_module
+        from models import db, User
+
+        with app.app_context():
+            user = User(clerk_user_id='clerk_bg', name='Bg User', email='bg@test.com')
+            db.session.add(user)
+            db.session.commit()
+
+            with app.test_request_context(json={'language': 'en', 'class_name': 'Chinese 101'}), \
+                    patch.object(app_module.task_runner, 'submit') as mock_submit, \
+                    patch.object(app_module.clerk_client, 'update_user_metadata') as mock_update:
+                from flask import request
+                request.db_user = user
+                request.clerk_user = {'sub': 'clerk_bg'}
+                response = app_module.complete_onboarding.__wrapped__()
+
+            assert response.get_json()['success'] is True
+            mock_update.assert_not_called()
+            args, kwargs = mock_submit.call_args
+            assert args == (app_module.push_clerk_metadata, 'clerk_bg', {'role': 'student'})
+            assert kwargs['retries'] == app_module.CLERK_METADATA_RETRIES
+
+    def test_rejected_metadata_push_is_retried(self, app):
+        import app as app_module
+        from services.tasks import task_runner
+
+        task_runner.failures.clear()
+        with app.app_context(), \
+                patch.object(app_module, 'update_clerk_metadata', return_value=False) as mock_update, \
+                patch('services.tasks.time.sleep'):
+            task_runner.submit(app_module.push_clerk_metadata, 'clerk_bg', {'role': 'student'}, retries=2)
+        assert mock_update.call_count == 3
+        assert task_runner.recent_failures()[0]['task'] == 'push_clerk_metadata'
+        task_runner.failures.clear()
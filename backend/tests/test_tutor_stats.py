@@ -0,0 +1,177 @@
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db, User, TutorStats
+from services import tutor_stats
+from services.tutor_stats import compute_tutor_stats, rebuild_tutor_stats
+from services.matching_service import calculate_tutor_match_scores
+
+
+def _stats(tutor_id):
+    db.session.expire_all()
+    return db.session.get(TutorStats, tutor_id)
+
+
+class TestRecordDeltas:
+    def test_record_creates_row(self, app, tutor_user):
+        with app.app_context():
+            tutor_stats.record_booking(tutor_user.id)
+            tutor_stats.record_availability(tutor_user.id, 2)
+            db.session.commit()
+
+            stats = _stats(tutor_user.id)
+            assert stats.booked_session_count == 1
+            assert stats.availability_count == 2
+            assert stats.rating_count == 0
+            assert stats.avg_rating is None
+
+    def test_feedback_update_replaces_rating(self, app, tutor_user):
+        with app.app_context():
+            tutor_stats.record_feedback(tutor_user.id, None, 4)
+            tutor_stats.record_feedback(tutor_user.id, None, 2)
+            tutor_stats.record_feedback(tutor_user.id, 2, 5)
+            db.session.commit()
+
+            stats = _stats(tutor_user.id)
+            assert stats.rating_count == 2
+            assert stats.rating_sum == 9.0
+            assert stats.avg_rating == 4.5
+
+    def test_rolled_back_with_transaction(self, app, tutor_user):
+        with app.app_context():
+            tutor_stats.record_booking(tutor_user.id)
+            db.session.rollback()
+            assert _stats(tutor_user.id) is None
+
+    def test_to_dict(self, app, tutor_user):
+        with app.app_context():
+            tutor_stats.record_feedback(tutor_user.id, None, 3)
+            db.session.commit()
+            data = _stats(tutor_user.id).to_dict()
+            assert data['tutor_id'] == tutor_user.id
+            assert data['avg_rating'] == 3.0
+            assert data['updated_at'] is not None
+
+
+class TestRouteHooks:
+    def test_booking_and_feedback_update_stats(self, app, auth_client, student_user, tutor_user, availability):
+        with patch('services.email_service.resend') as mock_resend:
+            mock_resend.Emails.send.return_value = {'id': 'email_123'}
+            response = auth_client.post('/api/sessions/book', json={
+                'availability_id': availability.id,
+                'start_time': '2025-01-06T10:00:00',
+                'end_time': '2025-01-06T11:00:00',
+            })
+        assert response.status_code == 201
+        session_id = response.get_json()['session']['id']
+
+        assert auth_client.post('/api/feedback', json={'session_id': session_id, 'rating': 4}).status_code == 201
+        assert auth_client.post('/api/feedback', json={'session_id': session_id, 'rating': 2}).status_code == 200
+
+        with app.app_context():
+            stats = _stats(tutor_user.id)
+            assert stats.booked_session_count == 1
+            assert stats.rating_count == 1
+            assert stats.rating_sum == 2.0
+
+    def test_book_existing_session(self, app, auth_client, tutor_user, available_session):
+        response = auth_client.post(f'/api/sessions/{available_session.id}/book')
+        assert response.status_code == 200
+        with app.app_context():
+            assert _stats(tutor_user.id).booked_session_count == 1
+
+    def test_availability_create_and_delete(self, app, tutor_auth_client, tutor_user):
+        response = tutor_auth_client.post('/api/availability', json={
+            'day_of_week': 2,
+            'start_time': '2025-01-07T09:00:00',
+            'end_time': '2025-01-07T12:00:00',
+            'session_type': 'online',
+        })
+        assert response.status_code == 201
+        with app.app_context():
+            assert _stats(tutor_user.id).availability_count == 1
+
+        availability_id = response.get_json()['availability']['id']
+        assert tutor_auth_client.delete(f'/api/availability/{availability_id}').status_code == 200
+        with app.app_context():
+            assert _stats(tutor_user.id).availability_count == 0
+
+    def test_session_delete_removes_booking_and_rating(self, app, auth_client, tutor_user, session_obj, feedback):
+        with app.app_context():
+            rebuild_tutor_stats()
+        assert auth_client.delete(f'/api/sessions/{session_obj.id}').status_code == 200
+        with app.app_context():
+            assert rebuild_tutor_stats(apply=False) == []
+            stats = _stats(tutor_user.id)
+            assert (stats.booked_session_count, stats.rating_count, stats.rating_sum) == (0, 0, 0.0)
+
+    def test_session_update_moves_stats(self, app, auth_client, tutor_user, session_obj, feedback):
+        with app.app_context():
+            other = User(clerk_user_id='clerk_other_tutor', name='Other Tutor', email='ot@test.com', role='tutor')
+            db.session.add(other)
+            db.session.commit()
+            other_id = other.id
+            rebuild_tutor_stats()
+
+        response = auth_client.put(f'/api/sessions/{session_obj.id}', json={'tutor_id': other_id})
+        assert response.status_code == 200
+        with app.app_context():
+            assert rebuild_tutor_stats(apply=False) == []
+            assert _stats(other_id).rating_count == 1
+
+        response = auth_client.put(f'/api/sessions/{session_obj.id}', json={'status': 'cancelled'})
+        assert response.status_code == 200
+        with app.app_context():
+            assert rebuild_tutor_stats(apply=False) == []
+            assert _stats(other_id).booked_session_count == 0
+
+
+class TestRebuild:
+    def test_reports_and_fixes_drift(self, app, tutor_user, tutor_profile, availability, session_obj, feedback):
+        with app.app_context():
+            db.session.add(TutorStats(tutor_id=tutor_user.id, availability_count=7))
+            db.session.commit()
+
+            drift = rebuild_tutor_stats(apply=False)
+            fields = {d['field']: d for d in drift}
+            assert fields['availability_count']['stored'] == 7
+            assert fields['availability_count']['actual'] == 1
+            assert set(fields) == set(tutor_stats.STAT_FIELDS)
+            assert _stats(tutor_user.id).availability_count == 7
+
+            assert rebuild_tutor_stats() == drift
+            assert rebuild_tutor_stats(apply=False) == []
+            assert _stats(tutor_user.id).availability_count == 1
+
+    def test_removes_rows_without_source_data(self, app, tutor_user):
+        with app.app_context():
+            db.session.add(TutorStats(tutor_id=tutor_user.id, booked_session_count=3))
+            db.session.commit()
+
+            rebuild_tutor_stats()
+            assert _stats(tutor_user.id) is None
+
+    def test_compute_matches_route_increments(self, app, auth_client, tutor_user, available_session):
+        auth_client.post(f'/api/sessions/{available_session.id}/book')
+        with app.app_context():
+            stats = _stats(tutor_user.id)
+            expected = compute_tutor_stats()[tutor_user.id]
+            assert expected['booked_session_count'] == stats.booked_session_count
+
+
+class TestMatchingFromStats:
+    def test_stats_path_matches_aggregates(self, app, student_user):
+        from tests.test_matching_service import _build_roster
+        with app.app_context():
+            _build_roster([student_user.id])
+            rebuild_tutor_stats()
+
+            expected = calculate_tutor_match_scores(student_user.id)
+            app.config['MATCHING_USE_TUTOR_STATS'] = True
+            try:
+                assert calculate_tutor_match_scores(student_user.id) == expected
+            finally:
+                app.config['MATCHING_USE_TUTOR_STATS'] = False
@@ -0,0 +1,138 @@
+import pytest
+import sys
+import os
+import base64
+import hashlib
+import hmac
+import json
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import User, Tutor
+from routes.webhooks import verify_webhook_signature, WebhookVerificationError
+from tests.conftest import TestConfig
+
+
+def sign(body, msg_id='msg_1', timestamp=None, secret=TestConfig.CLERK_WEBHOOK_SECRET):
+    timestamp = str(int(time.time()) if timestamp is None else timestamp)
+    key = base64.b64decode(secret[len('whsec_'):])
+    signature = base64.b64encode(
+        hmac.new(key, f'{msg_id}.{timestamp}.'.encode() + body, hashlib.sha256).digest()
+    ).decode()
+    return {'svix-id': msg_id, 'svix-timestamp': timestamp, 'svix-signature': f'v1,{signature}'}
+
+
+def user_event(clerk_user_id, role=None, event_type='user.updated'):
+    return {
+        'type': event_type,
+        'data': {
+            'id': clerk_user_id,
+            'first_name': 'Web',
+            'last_name': 'Hook',
+            'primary_email_address_id': 'e1',
+            'email_addresses': [{'id': 'e1', 'email_address': 'webhook@test.com'}],
+            'public_metadata': {'role': role} if role else {},
+        },
+    }
+
+
+def post_event(client, event, headers=None):
+    body = json.dumps(event).encode()
+    return client.post(
+        '/api/webhooks/clerk',
+        data=body,
+        headers=headers if headers is not None else sign(body),
+        content_type='application/json',
+    )
+
+
+class TestVerifyWebhookSignature:
+    def test_valid_signature(self):
+        body = b'{"type": "user.updated"}'
+        verify_webhook_signature(TestConfig.CLERK_WEBHOOK_SECRET, sign(body), body)
+
+    def test_any_matching_signature_accepted(self):
+        body = b'{}'
+        headers = sign(body)
+        headers['svix-signature'] = 'v1,bogus ' + headers['svix-signature']
+        verify_webhook_signature(TestConfig.CLERK_WEBHOOK_SECRET, headers, body)
+
+    def test_tampered_body_rejected(self):
+        headers = sign(b'{"a": 1}')
+        with pytest.raises(WebhookVerificationError):
+            verify_webhook_signature(TestConfig.CLERK_WEBHOOK_SECRET, headers, b'{"a": 2}')
+
+    def test_stale_timestamp_rejected(self):
+        body = b'{}'
+        headers = sign(body, timestamp=int(time.time()) - 3600)
+        with pytest.raises(WebhookVerificationError):
+            verify_webhook_signature(TestConfig.CLERK_WEBHOOK_SECRET, headers, body)
+
+    def test_missing_headers_rejected(self):
+        with pytest.raises(WebhookVerificationError):
+            verify_webhook_signature(TestConfig.CLERK_WEBHOOK_SECRET, {}, b'{}')
+
+    def test_non_numeric_timestamp_rejected(self):
+        headers = sign(b'{}')
+        headers['svix-timestamp'] = 'yesterday'
+        with pytest.raises(WebhookVerificationError):
+            verify_webhook_signature(TestConfig.CLERK_WEBHOOK_SECRET, headers, b'{}')
+
+
+class TestClerkWebhookEndpoint:
+    def test_role_change_applied(self, app, client, student_user):
+        with app.app_context():
+            response = post_event(client, user_event('clerk_test_student', role='tutor'))
+            assert response.status_code == 202
+
+            user = User.query.filter_by(clerk_user_id='clerk_test_student').first()
+            assert user.role == 'tutor'
+            assert Tutor.query.filter_by(user_id=user.id).first() is not None
+
+    def test_user_created_event_creates_user(self, app, client):
+        with app.app_context():
+            response = post_event(client, user_event('clerk_new', role='student', event_type='user.created'))
+            assert response.status_code == 202
+
+            user = User.query.filter_by(clerk_user_id='clerk_new').first()
+            assert user.name == 'Web Hook'
+            assert user.email == 'webhook@test.com'
+            assert user.role == 'student'
+
+    def test_event_primes_profile_cache(self, app, client, student_user):
+        import auth
+        with app.app_context():
+            post_event(client, user_event('clerk_test_student', role='student'))
+            assert auth.clerk_user_cache.get('clerk_test_student')['first_name'] == 'Web'
+
+    def test_invalid_signature_rejected(self, app, client, student_user):
+        with app.app_context():
+            body = json.dumps(user_event('clerk_test_student', role='tutor')).encode()
+            headers = sign(b'something else')
+            response = client.post('/api/webhooks/clerk', data=body, headers=headers,
+                                   content_type='application/json')
+            assert response.status_code == 400
+            assert User.query.filter_by(clerk_user_id='clerk_test_student').first().role == 'student'
+
+    def test_secret_not_configured(self, app, client):
+        with app.app_context():
+            app.config['CLERK_WEBHOOK_SECRET'] = None
+            response = post_event(client, user_event('clerk_x'))
+            assert response.status_code == 503
+
+    def test_unrelated_event_ignored(self, app, client):
+        with app.app_context():
+            response = post_event(client, {'type': 'session.created', 'data': {'id': 'sess_1'}})
+            assert response.status_code == 202
+            assert User.query.count() == 0
+
+    def test_event_processed_in_background(self, app, client, student_user):
+        with app.app_context():
+            app.config['TASKS_EAGER'] = False
+            with patch('routes.webhooks.task_runner.submit') as mock_submit:
+                response = post_event(client, user_event('clerk_test_student', role='tutor'))
+            assert response.status_code == 202
+            args = mock_submit.call_args[0]
+            assert args[1]['data']['id'] == 'clerk_test_student'
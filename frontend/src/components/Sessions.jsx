@@ -18,6 +18,18 @@ const formatDateKey = (date) => {
   return `${year}-${month}-${day}`
 }
 
+// Sessions the calendar can show for `date`: its month and the week view
+// starting on it, padded by a day on each side for time zone offsets.
+const getCalendarWindow = (date) => {
+  const from = new Date(date.getFullYear(), date.getMonth(), 1)
+  from.setDate(from.getDate() - 1)
+  const weekEnd = new Date(date.getFullYear(), date.getMonth(), date.getDate() + 7)
+  const monthEnd = new Date(date.getFullYear(), date.getMonth() + 1, 1)
+  const to = weekEnd > monthEnd ? weekEnd : monthEnd
+  to.setDate(to.getDate() + 1)
+  return { from: `${formatDateKey(from)}T00:00:00`, to: `${formatDateKey(to)}T00:00:00` }
+}
+
 
 function Sessions({ userData }) {
   const { getToken } = useAuth()
@@ -233,7 +245,7 @@ function Sessions({ userData }) {
         try {
           const [availabilityResponse, sessionsResponse] = await Promise.all([
             api.getAllAvailability(getToken),
-            api.getAllSessions(getToken)
+            api.getAllSessions(getToken, getCalendarWindow(currentDate))
           ])
           
           if (availabilityResponse.ok) {
@@ -266,7 +278,7 @@ function Sessions({ userData }) {
     }, 10000)
     
     return () => clearInterval(intervalId)
-  }, [userData?.role, getToken])
+  }, [userData?.role, getToken, currentDate])
 
   const monthYear = currentDate.toLocaleDateString('en-US', { month: 'long', year: 'numeric' })
   const daySlotsModalDateLabel = daySlotsModalData.date
@@ -803,7 +815,7 @@ function Sessions({ userData }) {
         
         const [availabilityResponse, sessionsResponse] = await Promise.all([
           api.getAllAvailability(getToken),
-          api.getAllSessions(getToken)
+          api.getAllSessions(getToken, getCalendarWindow(currentDate))
         ])
         
         if (availabilityResponse.ok) {
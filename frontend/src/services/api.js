@@ -1,4 +1,5 @@
 const API_URL = import.meta.env.VITE_API_URL
+const IDEMPOTENT_RETRIES = 2
 
 class ApiService {
   async getAuthHeaders(getToken) {
@@ -9,6 +10,24 @@ class ApiService {
     }
   }
 
+  // POST with an Idempotency-Key; network failures are retried with the same
+  // key, so the server runs the action once and replays its response.
+  async idempotentPost(url, headers, data) {
+    const requestHeaders = { ...headers, 'Idempotency-Key': crypto.randomUUID() }
+    for (let attempt = 0; ; attempt++) {
+      try {
+        return await fetch(url, {
+          method: 'POST',
+          headers: requestHeaders,
+          body: JSON.stringify(data)
+        })
+      } catch (error) {
+        if (attempt >= IDEMPOTENT_RETRIES) throw error
+        await new Promise(resolve => setTimeout(resolve, 500 * 2 ** attempt))
+      }
+    }
+  }
+
   async getUser(getToken) {
     const headers = await this.getAuthHeaders(getToken)
     const response = await fetch(`${API_URL}/api/user`, {
@@ -86,9 +105,10 @@ class ApiService {
     return response
   }
 
-  async getAllSessions(getToken) {
+  async getAllSessions(getToken, params = {}) {
     const headers = await this.getAuthHeaders(getToken)
-    const response = await fetch(`${API_URL}/api/sessions/all`, {
+    const queryParams = new URLSearchParams(params).toString()
+    const response = await fetch(`${API_URL}/api/sessions/all${queryParams ? `?${queryParams}` : ''}`, {
       method: 'GET',
       headers
     })
@@ -144,22 +164,12 @@ class ApiService {
 
   async bookSession(getToken, data) {
     const headers = await this.getAuthHeaders(getToken)
-    const response = await fetch(`${API_URL}/api/sessions/book`, {
-      method: 'POST',
-      headers,
-      body: JSON.stringify(data)
-    })
-    return response
+    return this.idempotentPost(`${API_URL}/api/sessions/book`, headers, data)
   }
 
   async createSessionNote(getToken, data) {
     const headers = await this.getAuthHeaders(getToken)
-    const response = await fetch(`${API_URL}/api/session-notes`, {
-      method: 'POST',
-      headers,
-      body: JSON.stringify(data)
-    })
-    return response
+    return this.idempotentPost(`${API_URL}/api/session-notes`, headers, data)
   }
 
   async updateSessionNote(getToken, noteId, data) {
@@ -215,12 +225,7 @@ class ApiService {
 
   async submitFeedback(getToken, data) {
     const headers = await this.getAuthHeaders(getToken)
-    const response = await fetch(`${API_URL}/api/feedback`, {
-      method: 'POST',
-      headers,
-      body: JSON.stringify(data)
-    })
-    return response
+    return this.idempotentPost(`${API_URL}/api/feedback`, headers, data)
   }
 
   async getSessionFeedback(getToken, sessionId) {